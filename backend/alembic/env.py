@@ -7,8 +7,8 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
-from app.database import Base
-from app.models import Goal, Task
+from app.database import Base, UNVERSIONED_SCHEMA_FIX, is_unversioned_schema
+from app.models import Goal, Task, BreakdownCacheEntry, RateLimitBucket
 from app.config import get_settings
 
 config = context.config
@@ -36,6 +36,10 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
+    # Otherwise 001 fails on the existing tables with a less helpful error
+    if is_unversioned_schema(connection):
+        raise RuntimeError(f"Database tables were created without Alembic; run `{UNVERSIONED_SCHEMA_FIX}` once")
+
     context.configure(connection=connection, target_metadata=target_metadata)
 
     with context.begin_transaction():
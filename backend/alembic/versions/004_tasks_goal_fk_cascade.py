@@ -0,0 +1,29 @@
+"""Cascade task deletes from goals in the database
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 001 left the constraint unnamed, so it carries Postgres' default name
+    op.drop_constraint('tasks_goal_id_fkey', 'tasks', type_='foreignkey')
+    op.create_foreign_key(
+        'tasks_goal_id_fkey', 'tasks', 'goals', ['goal_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('tasks_goal_id_fkey', 'tasks', type_='foreignkey')
+    op.create_foreign_key('tasks_goal_id_fkey', 'tasks', 'goals', ['goal_id'], ['id'])
@@ -0,0 +1,25 @@
+"""Index tasks by goal for relationship loads and cascades
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # goals.created_at is already covered by ix_goals_created_at_id (003)
+    op.create_index('ix_tasks_goal_id_step_number', 'tasks', ['goal_id', 'step_number'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_goal_id_step_number', table_name='tasks')
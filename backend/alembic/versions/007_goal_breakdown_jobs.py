@@ -0,0 +1,40 @@
+"""Track asynchronous breakdown jobs on goals
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNFINISHED = sa.text("status IN ('pending', 'running')")
+
+
+def upgrade() -> None:
+    op.add_column('goals', sa.Column('status', sa.String(length=20), nullable=False, server_default='completed'))
+    op.add_column('goals', sa.Column('model', sa.String(length=100), nullable=True))
+    op.add_column('goals', sa.Column('error', sa.Text(), nullable=True))
+    op.add_column('goals', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.alter_column('goals', 'complexity_score', existing_type=sa.Integer(), nullable=True)
+    op.create_index(
+        'ix_goals_unfinished_status', 'goals', ['status'], unique=False,
+        postgresql_where=UNFINISHED, sqlite_where=UNFINISHED,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_goals_unfinished_status', table_name='goals')
+    op.execute("DELETE FROM goals WHERE complexity_score IS NULL")
+    op.alter_column('goals', 'complexity_score', existing_type=sa.Integer(), nullable=False)
+    op.drop_column('goals', 'claimed_at')
+    op.drop_column('goals', 'error')
+    op.drop_column('goals', 'model')
+    op.drop_column('goals', 'status')
@@ -0,0 +1,33 @@
+"""Full-text search over goal titles and task descriptions
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('goals', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    # Same document as app.search.search_document: the title, then each task on its own line
+    op.execute(
+        "UPDATE goals SET search_vector = to_tsvector('english', title || coalesce(E'\\n' || ("
+        "SELECT string_agg(description, E'\\n' ORDER BY step_number) FROM tasks WHERE tasks.goal_id = goals.id"
+        "), ''))"
+    )
+    op.create_index('ix_goals_search_vector', 'goals', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_goals_search_vector', table_name='goals')
+    op.drop_column('goals', 'search_vector')
@@ -0,0 +1,123 @@
+from sqlalchemy import Row, func, insert, literal_column, select, table, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Goal, Task
+from .schemas import GoalResponse, TaskResponse
+from .search import SEARCH_CONFIG, SQLITE_FTS_TABLE, fts5_query, search_document
+from .serialization import task_dict
+
+# What read endpoints return for a goal, selected as plain rows
+GOAL_COLUMNS = (Goal.id, Goal.title, Goal.complexity_score, Goal.created_at, Goal.status)
+
+
+async def insert_tasks(db: AsyncSession, goal_tasks: list[tuple[int, list[str]]]) -> list[list[TaskResponse]]:
+    """Insert the tasks of one or more goals with a multi-row INSERT ... RETURNING."""
+    # Rows are matched back by (goal_id, step_number), so RETURNING order does not
+    # matter; requesting it would make some backends insert row by row.
+    result = await db.execute(
+        insert(Task).returning(Task.id, Task.goal_id, Task.step_number),
+        [
+            {"goal_id": goal_id, "description": task_desc, "step_number": i}
+            for goal_id, tasks in goal_tasks
+            for i, task_desc in enumerate(tasks, 1)
+        ],
+    )
+    task_ids = {(row.goal_id, row.step_number): row.id for row in result}
+
+    return [
+        [
+            TaskResponse(id=task_ids[(goal_id, i)], description=task_desc, step_number=i)
+            for i, task_desc in enumerate(tasks, 1)
+        ]
+        for goal_id, tasks in goal_tasks
+    ]
+
+
+async def load_tasks(db: AsyncSession, goal_ids: list[int]) -> dict[int, list[dict]]:
+    """Tasks of the given goals as response dicts, in step order, keyed by goal id.
+
+    Plain rows in one query; nothing goes through the ORM identity map.
+    """
+    tasks: dict[int, list[dict]] = {goal_id: [] for goal_id in goal_ids}
+    if not goal_ids:
+        return tasks
+    result = await db.execute(
+        select(Task.goal_id, Task.id, Task.step_number, Task.description)
+        .where(Task.goal_id.in_(goal_ids))
+        .order_by(Task.goal_id, Task.step_number)
+    )
+    for row in result:
+        tasks[row.goal_id].append(task_dict(row))
+    return tasks
+
+
+async def insert_goals(db: AsyncSession, breakdowns: list[tuple[str, dict]]) -> list[GoalResponse]:
+    """Insert goals and their tasks with multi-row INSERT ... RETURNING.
+
+    Builds the responses from the returned keys instead of re-reading the rows.
+    The caller owns the transaction.
+    """
+    if not breakdowns:
+        return []
+
+    goal_rows = (await db.execute(
+        insert(Goal).returning(Goal.id, Goal.created_at, sort_by_parameter_order=True),
+        [
+            {
+                "title": title,
+                "complexity_score": ai_result["complexity_score"],
+                "search_vector": search_document(title, ai_result["tasks"]),
+            }
+            for title, ai_result in breakdowns
+        ],
+    )).all()
+
+    task_lists = await insert_tasks(
+        db, [(goal_row.id, ai_result["tasks"]) for goal_row, (_, ai_result) in zip(goal_rows, breakdowns)]
+    )
+
+    return [
+        GoalResponse(
+            id=goal_row.id,
+            title=title,
+            complexity_score=ai_result["complexity_score"],
+            created_at=goal_row.created_at,
+            tasks=tasks,
+        )
+        for goal_row, (title, ai_result), tasks in zip(goal_rows, breakdowns, task_lists)
+    ]
+
+
+async def search_goals(
+    db: AsyncSession, q: str, limit: int, after: tuple[float, int] | None = None
+) -> list[Row]:
+    """Goals whose title or tasks match `q`, best match first.
+
+    Ranked with `ts_rank_cd` over the GIN-indexed tsvector on PostgreSQL and
+    with FTS5's bm25 on SQLite (negated, so higher is better on both).
+    `after` is the (rank, id) of the previous page's last row.
+    """
+    if db.bind.dialect.name == "postgresql":
+        tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q)
+        hits = select(
+            Goal.id.label("id"), func.ts_rank_cd(Goal.search_vector, tsquery).label("rank")
+        ).where(Goal.search_vector.op("@@")(tsquery))
+    else:
+        terms = fts5_query(q)
+        if not terms:
+            return []
+        fts = literal_column(SQLITE_FTS_TABLE)
+        hits = (
+            select(literal_column(f"{SQLITE_FTS_TABLE}.rowid").label("id"), (-func.bm25(fts)).label("rank"))
+            .select_from(table(SQLITE_FTS_TABLE))
+            .where(fts.op("MATCH")(terms))
+        )
+    hits = hits.subquery("hits")
+
+    query = select(
+        Goal.id, Goal.title, Goal.complexity_score, Goal.created_at, Goal.status, hits.c.rank
+    ).join(hits, hits.c.id == Goal.id)
+    if after is not None:
+        query = query.where(tuple_(hits.c.rank, hits.c.id) < tuple_(*after))
+    query = query.order_by(hits.c.rank.desc(), hits.c.id.desc()).limit(limit)
+    return (await db.execute(query)).all()
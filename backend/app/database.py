@@ -1,17 +1,120 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+
+from sqlalchemy import event, exc, inspect, make_url, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .config import Settings, get_settings
+from .telemetry import instrument_engine
 
-from .config import get_settings
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Head of alembic/versions; tests keep the two in sync
+SCHEMA_REVISION = "008"
+
+# Databases built by create_all before Alembic: 001's tables exist, so
+# `alembic upgrade head` fails, and `alembic stamp head` would skip 002 onwards
+UNVERSIONED_SCHEMA_FIX = "alembic stamp 001 && alembic upgrade head"
+
 # Remove unsupported params from Neon connection string for asyncpg
 database_url = settings.DATABASE_URL
 if "channel_binding=require" in database_url:
     database_url = database_url.replace("channel_binding=require", "")
     database_url = database_url.replace("&&", "&").rstrip("&").rstrip("?")
 
-engine = create_async_engine(database_url, echo=False)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def recreate(self):
+        # Keep counters when the engine replaces the pool (e.g. on dispose)
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.timeouts = self.timeouts
+        pool.wait_seconds_total = self.wait_seconds_total
+        pool.wait_seconds_max = self.wait_seconds_max
+        return pool
+
+
+def engine_options(url: str, config: Settings) -> dict:
+    """Pool and driver options for `create_async_engine`, driven by Settings."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return {"url": parsed}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+
+    if parsed.get_driver_name() == "asyncpg":
+        if config.DB_PGBOUNCER_COMPAT:
+            # Transaction-mode poolers cannot keep named prepared statements
+            # across transactions: disable both statement caches and use
+            # unique statement names.
+            parsed = parsed.update_query_dict({"prepared_statement_cache_size": "0"})
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            parsed = parsed.update_query_dict(
+                {"prepared_statement_cache_size": str(config.DB_STATEMENT_CACHE_SIZE)}
+            )
+
+    options["url"] = parsed
+    return options
+
+
+engine = create_async_engine(echo=False, **engine_options(database_url, settings))
+
+
+def enable_sqlite_foreign_keys(target: AsyncEngine):
+    """SQLite ignores foreign keys (and ON DELETE CASCADE) unless asked per connection."""
+    if target.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(target.sync_engine, "connect")
+    def _set_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+enable_sqlite_foreign_keys(engine)
+instrument_engine(engine)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -25,5 +128,114 @@ async def get_db():
 
 
 async def init_db():
+    """Create missing tables from the models (DB_CREATE_SCHEMA, for local SQLite setups)."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+def is_unversioned_schema(connection: Connection) -> bool:
+    """True if the app's tables exist but Alembic never recorded a revision."""
+    inspector = inspect(connection)
+    return inspector.has_table("goals") and not inspector.has_table("alembic_version")
+
+
+async def check_schema_revision(target: AsyncEngine | None = None) -> str:
+    """Read the database's Alembic revision (one query) and compare it with SCHEMA_REVISION.
+
+    Raises if the database was never migrated. Any other mismatch, e.g. a
+    worker starting before or after `alembic upgrade head` during a deploy,
+    is logged rather than stopping the worker. Returns the revision found.
+    """
+    async with (target or engine).connect() as conn:
+        try:
+            revision = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        except exc.DBAPIError:
+            revision = None
+            # Postgres aborts the transaction on the failed query
+            await conn.rollback()
+            if await conn.run_sync(is_unversioned_schema):
+                raise RuntimeError(
+                    f"Database tables were created without Alembic; run `{UNVERSIONED_SCHEMA_FIX}` once"
+                )
+    if revision is None:
+        raise RuntimeError(
+            "Database has no schema revision; run `alembic upgrade head` (or set DB_CREATE_SCHEMA=true)"
+        )
+    if revision != SCHEMA_REVISION:
+        logger.warning(
+            "Database is at schema revision %s but this build expects %s; run `alembic upgrade head`",
+            revision, SCHEMA_REVISION,
+        )
+    return revision
+
+
+async def warm_up_pool(connections: int, target: AsyncEngine | None = None):
+    """Open pooled connections up front so the first requests skip connection setup."""
+    target = target or engine
+    if isinstance(target.pool, QueuePool):
+        connections = min(connections, target.pool.size())
+    if connections <= 0:
+        return
+
+    opened = await asyncio.gather(*(target.connect() for _ in range(connections)))
+    await asyncio.gather(*(conn.close() for conn in opened))
+
+
+def get_pool_status(target: AsyncEngine | None = None) -> dict:
+    """Live connection pool usage and checkout wait times."""
+    pool = (target or engine).pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__, "status": pool.status()}
+
+    status = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "wait_seconds_total": round(pool.wait_seconds_total, 6),
+            "wait_seconds_avg": round(pool.wait_seconds_total / pool.checkouts, 6) if pool.checkouts else 0.0,
+            "wait_seconds_max": round(pool.wait_seconds_max, 6),
+        })
+    return status
+
+
+class StatementCounter:
+    """Records the database round trips (statements and commits) made on an engine."""
+
+    def __init__(self):
+        self.executions: list[tuple[str, object, bool]] = []
+        self.commits = 0
+
+    @property
+    def statements(self) -> list[str]:
+        return [statement for statement, _, _ in self.executions]
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.executions) + self.commits
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.executions.append((statement, parameters, executemany))
+
+    def on_commit(self, conn):
+        self.commits += 1
+
+
+@contextmanager
+def count_statements(target: AsyncEngine | None = None):
+    """Count the round trips made on `target` (the app engine by default) inside the block."""
+    sync_engine = (target or engine).sync_engine
+    counter = StatementCounter()
+    event.listen(sync_engine, "before_cursor_execute", counter.on_execute)
+    event.listen(sync_engine, "commit", counter.on_commit)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", counter.on_execute)
+        event.remove(sync_engine, "commit", counter.on_commit)
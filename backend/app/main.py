@@ -1,17 +1,54 @@
+import asyncio
+import logging
+import time
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
-from .database import init_db, get_db
-from .routes.goals import router as goals_router
+from .database import init_db, check_schema_revision, get_db, warm_up_pool, get_pool_status
+from .routes.goals import router as goals_router, NEXT_CURSOR_HEADER
 from .config import get_settings
+from .services.ai_service import (
+    generation_executor,
+    model_registry,
+    admission_queue,
+    breakdown_cache,
+    breakdown_batcher,
+)
+from .services.jobs import job_runner
+from .telemetry import metrics, traced, TraceExporter, HTTP_REQUEST_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_models():
+    """Import the Gemini SDK and build the model clients in a thread, off the startup path."""
+    try:
+        await asyncio.to_thread(model_registry.warm_up)
+    except Exception:
+        logger.exception("Gemini warm-up failed; clients are built on first use instead")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    get_settings()
-    await init_db()
+    settings = get_settings()
+    if settings.DB_CREATE_SCHEMA:
+        await init_db()
+    else:
+        await check_schema_revision()
+    await warm_up_pool(settings.DB_POOL_WARMUP)
+    job_runner.start()
+    await job_runner.recover()
+    # Ready without the SDK; a breakdown arriving first imports it itself
+    models_warm_up = asyncio.create_task(warm_up_models())
     yield
+    models_warm_up.cancel()
+    await job_runner.stop()
+    generation_executor.shutdown()
+    if trace_exporter is not None:
+        await asyncio.to_thread(trace_exporter.flush)
 
 
 app = FastAPI(
@@ -35,10 +72,79 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(goals_router)
 
+trace_exporter = TraceExporter(settings.TRACE_EXPORT_FILE) if settings.TRACE_EXPORT_FILE else None
+
+
+class RequestTelemetryMiddleware:
+    """Time every request per route template and trace it when exporting is on.
+
+    A plain ASGI middleware rather than `@app.middleware("http")`, which
+    returns as soon as the response starts: here the root span only ends
+    once the body is sent, so streamed responses keep the spans of their body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = None
+
+        def route_path() -> str:
+            # Route templates keep label cardinality bounded
+            route = scope.get("route")
+            return route.path if route is not None else "<unmatched>"
+
+        def observe(status_code: int):
+            HTTP_REQUEST_DURATION.observe((scope["method"], route_path(), str(status_code)), time.perf_counter() - start)
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                observe(status)
+            await send(message)
+
+        with traced("http.request", trace_exporter, **{"http.method": scope["method"]}) as attrs:
+            try:
+                await self.app(scope, receive, send_timed)
+            finally:
+                if status is None:
+                    status = 500
+                    observe(status)
+                attrs["http.route"] = route_path()
+                attrs["http.status_code"] = status
+
+
+app.add_middleware(RequestTelemetryMiddleware)
+
+
+metrics.gauge("gemini_executor_in_flight", "Gemini calls running in the worker pool.",
+              lambda: generation_executor.in_flight)
+metrics.gauge("gemini_executor_queued", "Gemini calls waiting for a worker thread.",
+              lambda: generation_executor.queued)
+metrics.gauge("admission_queue_waiting", "Breakdowns waiting for rate limit quota.",
+              lambda: admission_queue.get_stats()["queued"])
+metrics.gauge("breakdown_jobs_queued", "Async breakdown jobs waiting for a worker.",
+              lambda: job_runner.get_stats()["queued"])
+metrics.gauge("breakdown_cache_entries", "Breakdowns held in the in-process cache.",
+              lambda: breakdown_cache.get_stats()["size"])
+metrics.gauge("breakdown_batch_goals_per_call", "Goals answered per multi-goal Gemini call.",
+              lambda: breakdown_batcher.get_stats()["goals_per_call"])
+metrics.gauge("breakdown_batch_quota_saved", "Rate limit slots saved by micro-batching since startup.",
+              lambda: breakdown_batcher.get_stats()["quota_saved"])
+metrics.gauge("db_pool_checked_out", "Database connections currently checked out.",
+              lambda: get_pool_status().get("checked_out", 0))
+
 
 @app.get("/")
 async def root():
@@ -54,3 +160,15 @@ async def health():
             return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus metrics: per-route, per-model, per-step and DB statement timings."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/health/pool")
+async def pool_status():
+    """Database connection pool usage."""
+    return get_pool_status()
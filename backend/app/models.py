@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index, Float, text, event, DDL
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from .database import Base
+from .search import SearchVector, SQLITE_FTS_DDL, SQLITE_FTS_TABLE
 
 
 class Goal(Base):
@@ -9,18 +10,72 @@ class Goal(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False)
-    complexity_score = Column(Integer, nullable=False)
+    complexity_score = Column(Integer, nullable=True)  # NULL until a breakdown job completes
     created_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(String(20), nullable=False, default="completed", server_default="completed")
+    model = Column(String(100), nullable=True)
+    error = Column(Text, nullable=True)
+    # Lease of the worker running the job, refreshed while it runs
+    claimed_at = Column(DateTime, nullable=True)
+    # Title and task descriptions for full-text search; never loaded with the goal
+    search_vector = deferred(Column(SearchVector, nullable=True))
+
+    tasks = relationship("Task", back_populates="goal", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # Supports keyset pagination over (created_at, id)
+        Index("ix_goals_created_at_id", "created_at", "id"),
+        # Only unfinished jobs are indexed, for recovery at startup
+        Index(
+            "ix_goals_unfinished_status",
+            "status",
+            postgresql_where=text("status IN ('pending', 'running')"),
+            sqlite_where=text("status IN ('pending', 'running')"),
+        ),
+        # SQLite searches through the FTS5 table created below instead
+        Index("ix_goals_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
 
-    tasks = relationship("Task", back_populates="goal", cascade="all, delete-orphan")
+for statement in SQLITE_FTS_DDL:
+    event.listen(Goal.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Goal.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}").execute_if(dialect="sqlite")
+)
 
 
 class Task(Base):
     __tablename__ = "tasks"
 
     id = Column(Integer, primary_key=True, index=True)
-    goal_id = Column(Integer, ForeignKey("goals.id"), nullable=False)
+    goal_id = Column(Integer, ForeignKey("goals.id", ondelete="CASCADE"), nullable=False)
     description = Column(Text, nullable=False)
     step_number = Column(Integer, nullable=False)
 
     goal = relationship("Goal", back_populates="tasks")
+
+    __table_args__ = (
+        # Serves selectinload(Goal.tasks), task replacement and cascade deletes
+        Index("ix_tasks_goal_id_step_number", "goal_id", "step_number"),
+    )
+
+
+class BreakdownCacheEntry(Base):
+    __tablename__ = "breakdown_cache"
+
+    key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    normalized_title = Column(String(500), nullable=False)
+    complexity_score = Column(Integer, nullable=False)
+    tasks = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+
+    name = Column(String(50), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)
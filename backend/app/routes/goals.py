@@ -1,16 +1,120 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import base64
+import binascii
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete, tuple_
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Literal, Union
 
+from ..config import get_settings
+from ..crud import GOAL_COLUMNS, insert_goals, insert_tasks, load_tasks, search_goals
 from ..database import get_db
 from ..models import Goal, Task
-from ..schemas import GoalCreate, GoalResponse
-from ..services.ai_service import break_down_goal, RateLimitExceededError, rate_limiter, get_available_models
+from ..schemas import (
+    GoalCreate,
+    GoalResponse,
+    GoalSummary,
+    GoalSearchResult,
+    GoalBatchCreate,
+    GoalBatchItem,
+    GoalBatchResponse,
+    JobResponse,
+)
+from ..services.ai_service import (
+    break_down_goal,
+    RateLimitExceededError,
+    rate_limiter,
+    generation_executor,
+    breakdown_cache,
+    breakdown_flights,
+    breakdown_batcher,
+    admission_queue,
+    Priority,
+    get_available_models,
+    model_registry,
+    model_health,
+    resolve_model_id,
+    stream_breakdown,
+)
+from ..search import search_document
+from ..serialization import dumps, goal_dict, goal_summary_dict
+from ..services.response_cache import CachedResponse, etag_matches, response_cache
+from ..telemetry import span
+from ..services.jobs import JobRunner, job_runner, PENDING, COMPLETED, FINISHED_STATUSES
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/goals", tags=["goals"])
 
+GOALS_PAGE_SIZE = 50
+GOALS_MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CSV_COLUMNS = ["goal_id", "title", "complexity_score", "created_at", "step_number", "description"]
+
+
+def encode_cursor(created_at: datetime, goal_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{goal_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, goal_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(goal_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_search_cursor(rank: float, goal_id: int) -> str:
+    raw = f"{rank!r}|{goal_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, goal_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return float(rank), int(goal_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def conditional_response(request: Request, entry: CachedResponse) -> Response:
+    """The cached body, or 304 Not Modified if the client already has this ETag."""
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+def get_job_runner() -> JobRunner:
+    return job_runner
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def job_response(goal_id: int, status: str, error: str | None = None) -> JobResponse:
+    return JobResponse(
+        job_id=goal_id,
+        goal_id=goal_id,
+        status=status,
+        error=error,
+        status_url=f"{router.prefix}/jobs/{goal_id}",
+        events_url=f"{router.prefix}/jobs/{goal_id}/events",
+    )
+
 
 @router.get("/models")
 async def get_models():
@@ -18,37 +122,41 @@ async def get_models():
     return get_available_models()
 
 
-@router.post("/", response_model=GoalResponse)
-async def create_goal(goal_data: GoalCreate, db: AsyncSession = Depends(get_db)):
+@router.post("/", response_model=GoalResponse, responses={202: {"model": JobResponse}})
+async def create_goal(
+    goal_data: GoalCreate,
+    mode: Literal["sync", "async"] = "sync",
+    db: AsyncSession = Depends(get_db),
+    runner: JobRunner = Depends(get_job_runner),
+):
+    """Create a goal and its AI breakdown.
+
+    With `mode=async` the goal is stored as a pending job and 202 is returned
+    at once; follow it through `status_url` or the `events_url` SSE stream.
+    """
+    if mode == "async":
+        goal_id = (await db.execute(
+            insert(Goal).returning(Goal.id),
+            {
+                "title": goal_data.title,
+                "status": PENDING,
+                "model": resolve_model_id(goal_data.model),
+                "search_vector": search_document(goal_data.title, []),
+            },
+        )).scalar_one()
+        await db.commit()
+        response_cache.invalidate(goal_id)
+        runner.submit(goal_id)
+        return JSONResponse(status_code=202, content=job_response(goal_id, PENDING).model_dump())
+
     try:
         # Get AI breakdown
         ai_result = await break_down_goal(goal_data.title, model_name=goal_data.model)
 
-        # Create goal
-        goal = Goal(
-            title=goal_data.title,
-            complexity_score=ai_result["complexity_score"]
-        )
-        db.add(goal)
-        await db.flush()
-
-        # Create tasks
-        for i, task_desc in enumerate(ai_result["tasks"], 1):
-            task = Task(
-                goal_id=goal.id,
-                description=task_desc,
-                step_number=i
-            )
-            db.add(task)
-
+        # Insert goal and tasks; the response comes from RETURNING, not a re-read
+        [goal] = await insert_goals(db, [(goal_data.title, ai_result)])
         await db.commit()
-        await db.refresh(goal)
-
-        # Reload with tasks
-        result = await db.execute(
-            select(Goal).options(selectinload(Goal.tasks)).where(Goal.id == goal.id)
-        )
-        goal = result.scalar_one()
+        response_cache.invalidate(goal.id)
 
         return goal
 
@@ -59,69 +167,411 @@ async def create_goal(goal_data: GoalCreate, db: AsyncSession = Depends(get_db))
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/", response_model=List[GoalResponse])
-async def get_goals(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Goal).options(selectinload(Goal.tasks)).order_by(Goal.created_at.desc())
+@router.post("/batch", response_model=GoalBatchResponse)
+async def create_goals_batch(batch: GoalBatchCreate, db: AsyncSession = Depends(get_db)):
+    """Create many goals at once, reporting success or failure per title.
+
+    Breakdowns run concurrently (up to BATCH_MAX_CONCURRENCY) and every
+    successful goal is inserted together in a single transaction.
+    """
+    semaphore = asyncio.Semaphore(get_settings().BATCH_MAX_CONCURRENCY)
+
+    async def breakdown(title: str) -> dict:
+        async with semaphore:
+            return await break_down_goal(title, model_name=batch.model, priority=Priority.BATCH)
+
+    outcomes = await asyncio.gather(
+        *(breakdown(title) for title in batch.titles), return_exceptions=True
     )
-    goals = result.scalars().all()
-    return goals
 
+    results: list[GoalBatchItem | None] = [None] * len(batch.titles)
+    succeeded = []
+    for index, (title, outcome) in enumerate(zip(batch.titles, outcomes)):
+        if isinstance(outcome, Exception):
+            results[index] = GoalBatchItem(index=index, title=title, status="failed", error=str(outcome))
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            succeeded.append((index, title, outcome))
 
-@router.get("/{goal_id}", response_model=GoalResponse)
-async def get_goal(goal_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Goal).options(selectinload(Goal.tasks)).where(Goal.id == goal_id)
+    try:
+        goals = await insert_goals(db, [(title, ai_result) for _, title, ai_result in succeeded])
+        await db.commit()
+        response_cache.invalidate(*(goal.id for goal in goals))
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    for (index, title, _), goal in zip(succeeded, goals):
+        results[index] = GoalBatchItem(index=index, title=title, status="created", goal=goal)
+
+    return GoalBatchResponse(created=len(goals), failed=len(results) - len(goals), results=results)
+
+
+async def _stream_goal_events(db: AsyncSession, title: str, first: tuple, events):
+    event = first
+    try:
+        while True:
+            name, data = event
+            if name == "result":
+                [goal] = await insert_goals(db, [(title, data)])
+                await db.commit()
+                response_cache.invalidate(goal.id)
+                yield _sse("goal", goal.model_dump(mode="json"))
+                return
+            yield _sse(name, data)
+            event = await anext(events)
+    except Exception as e:
+        await db.rollback()
+        yield _sse("error", {"detail": str(e)})
+    finally:
+        await events.aclose()
+
+
+@router.post("/stream")
+async def create_goal_streaming(goal_data: GoalCreate, db: AsyncSession = Depends(get_db)):
+    """Create a goal, streaming its breakdown as server-sent events.
+
+    Emits `complexity_score` and then one `task` event per step as soon as
+    Gemini has written it, and finally the saved `goal` (or an `error`).
+    Rows are only written once the whole response has been validated. If
+    validation changed the streamed score or steps (e.g. a sixth step was
+    merged), a `replace` event with the final ones comes before `goal`;
+    clients must treat `replace` and `goal` as the source of truth.
+    """
+    events = stream_breakdown(goal_data.title, model_name=goal_data.model)
+    # Wait for the first event so quota and Gemini errors still get a status code
+    try:
+        first = await anext(events)
+    except RateLimitExceededError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        _stream_goal_events(db, goal_data.title, first, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/", response_model=List[Union[GoalResponse, GoalSummary]])
+async def get_goals(
+    request: Request,
+    limit: int = Query(GOALS_PAGE_SIZE, ge=1, le=GOALS_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    min_complexity: int | None = Query(None, ge=1, le=10),
+    max_complexity: int | None = Query(None, ge=1, le=10),
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    view: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(get_db),
+):
+    """List goals newest first, one page at a time.
+
+    The cursor for the next page is returned in the `X-Next-Cursor` header.
+    `view=summary` skips loading tasks entirely. Pages carry an ETag; repeat
+    reads are served from memory until a goal is written.
+    """
+    key = f"goals?{request.url.query}"
+    version = response_cache.version()
+    cached = response_cache.get(key, version)
+    if cached is not None:
+        return conditional_response(request, cached)
+
+    query = select(*GOAL_COLUMNS)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(tuple_(Goal.created_at, Goal.id) < tuple_(cursor_created_at, cursor_id))
+    if min_complexity is not None:
+        query = query.where(Goal.complexity_score >= min_complexity)
+    if max_complexity is not None:
+        query = query.where(Goal.complexity_score <= max_complexity)
+    if created_after is not None:
+        query = query.where(Goal.created_at >= created_after)
+    if created_before is not None:
+        query = query.where(Goal.created_at < created_before)
+
+    # Fetch one extra row to learn whether another page exists
+    query = query.order_by(Goal.created_at.desc(), Goal.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    tasks = await load_tasks(db, [row.id for row in rows]) if view == "full" else None
+
+    # Plain rows straight to JSON: no ORM objects or per-goal model validation
+    with span("serialize", view=view, rows=len(rows)):
+        if view == "summary":
+            body = dumps([goal_summary_dict(row) for row in rows])
+        else:
+            body = dumps([goal_dict(row, tasks[row.id]) for row in rows])
+    return conditional_response(request, response_cache.set(key, version, body, headers))
+
+
+@router.get("/search", response_model=List[GoalSearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(GOALS_PAGE_SIZE, ge=1, le=GOALS_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Full-text search over goal titles and task descriptions, best match first.
+
+    The cursor for the next page is returned in the `X-Next-Cursor` header.
+    """
+    after = decode_search_cursor(cursor) if cursor else None
+    # Fetch one extra row to learn whether another page exists
+    rows = await search_goals(db, q, limit + 1, after)
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_search_cursor(rows[-1].rank, rows[-1].id)
+
+    with span("serialize", view="search", rows=len(rows)):
+        return [GoalSearchResult.model_validate(row) for row in rows]
+
+
+async def _stream_export_rows(db: AsyncSession, since: datetime | None):
+    """Yield goal/task join rows oldest first through a server-side cursor.
+
+    Runs inside the response body with the request's `get_db` session, which
+    FastAPI (0.118+) closes only after the body has been sent.
+    """
+    query = (
+        select(
+            Goal.id,
+            Goal.title,
+            Goal.complexity_score,
+            Goal.created_at,
+            Task.step_number,
+            Task.description,
+        )
+        .outerjoin(Task, Task.goal_id == Goal.id)
+        .order_by(Goal.created_at, Goal.id, Task.step_number)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if since is not None:
+        query = query.where(Goal.created_at > since)
+
+    result = await db.stream(query)
+    try:
+        async for row in result:
+            yield row
+    finally:
+        await result.close()
+
+
+async def _export_ndjson(db: AsyncSession, since: datetime | None):
+    lines = []
+    current = None
+    async for row in _stream_export_rows(db, since):
+        if current is None or current["id"] != row.id:
+            if current is not None:
+                lines.append(json.dumps(current))
+            current = {
+                "id": row.id,
+                "title": row.title,
+                "complexity_score": row.complexity_score,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "tasks": [],
+            }
+        if row.step_number is not None:
+            current["tasks"].append({"step_number": row.step_number, "description": row.description})
+
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if current is not None:
+        lines.append(json.dumps(current))
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def _export_csv(db: AsyncSession, since: datetime | None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    rows = 0
+    async for row in _stream_export_rows(db, since):
+        writer.writerow([
+            row.id,
+            row.title,
+            row.complexity_score,
+            row.created_at.isoformat() if row.created_at else "",
+            row.step_number if row.step_number is not None else "",
+            row.description or "",
+        ])
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get("/export")
+async def export_goals(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: datetime | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream every goal with its tasks, oldest first, in constant memory.
+
+    NDJSON emits one goal per line; CSV emits one row per task. Pass the
+    last exported `created_at` as `since` to export only newer goals.
+    """
+    if format == "csv":
+        return StreamingResponse(
+            _export_csv(db, since),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="goals.csv"'},
+        )
+    return StreamingResponse(
+        _export_ndjson(db, since),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="goals.ndjson"'},
+    )
+
+
+@router.get("/jobs/stats")
+async def get_job_stats(runner: JobRunner = Depends(get_job_runner)):
+    """Get breakdown job worker usage and outcomes."""
+    return runner.get_stats()
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Poll the status of a breakdown job."""
+    job = (await db.execute(select(Goal.status, Goal.error).where(Goal.id == job_id))).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_response(job_id, job.status, job.error)
+
+
+async def _job_events(job_id: int, db: AsyncSession, runner: JobRunner):
+    poll_seconds = get_settings().JOB_POLL_SECONDS
+    last_status = None
+    while True:
+        # Watch before reading so a change between the two is not missed
+        changed = runner.watch(job_id)
+        job = (await db.execute(select(Goal.status, Goal.error).where(Goal.id == job_id))).first()
+        # Give the connection back to the pool while waiting
+        await db.rollback()
+
+        if not job:
+            yield _sse("error", {"detail": "Job not found"})
+            return
+
+        if job.status != last_status:
+            last_status = job.status
+            yield _sse("status", job_response(job_id, job.status, job.error).model_dump())
+
+        if job.status in FINISHED_STATUSES:
+            if job.status == COMPLETED:
+                result = await db.execute(
+                    select(Goal).options(selectinload(Goal.tasks)).where(Goal.id == job_id)
+                )
+                goal = result.scalar_one_or_none()
+                if goal is not None:
+                    yield _sse("goal", GoalResponse.model_validate(goal).model_dump(mode="json"))
+            return
+
+        # Jobs run by other processes are only seen by polling
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=poll_seconds)
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    runner: JobRunner = Depends(get_job_runner),
+):
+    """Server-sent events for a breakdown job.
+
+    Emits a `status` event on every change and, once the job completes, a
+    `goal` event with the tasks. The stream ends when the job finishes.
+    """
+    exists = (await db.execute(select(Goal.id).where(Goal.id == job_id))).first()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return StreamingResponse(
+        _job_events(job_id, db, runner),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    goal = result.scalar_one_or_none()
+
+
+@router.get("/{goal_id}", response_model=GoalResponse)
+async def get_goal(goal_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    key = f"goal/{goal_id}"
+    version = response_cache.version(goal_id)
+    cached = response_cache.get(key, version)
+    if cached is not None:
+        return conditional_response(request, cached)
+
+    goal = (await db.execute(select(*GOAL_COLUMNS).where(Goal.id == goal_id))).first()
 
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
-    return goal
+    tasks = await load_tasks(db, [goal_id])
+    with span("serialize", view="full", rows=1):
+        body = dumps(goal_dict(goal, tasks[goal_id]))
+    return conditional_response(request, response_cache.set(key, version, body))
 
 
 @router.put("/{goal_id}", response_model=GoalResponse)
 async def update_goal(goal_id: int, goal_data: GoalCreate, db: AsyncSession = Depends(get_db)):
     try:
         # Find existing goal
-        result = await db.execute(
-            select(Goal).options(selectinload(Goal.tasks)).where(Goal.id == goal_id)
-        )
-        goal = result.scalar_one_or_none()
+        result = await db.execute(select(Goal.created_at).where(Goal.id == goal_id))
+        existing = result.first()
 
-        if not goal:
+        if not existing:
             raise HTTPException(status_code=404, detail="Goal not found")
 
-        # Get new AI breakdown
-        ai_result = await break_down_goal(goal_data.title, model_name=goal_data.model)
-
-        # Update goal
-        goal.title = goal_data.title
-        goal.complexity_score = ai_result["complexity_score"]
-
-        # Delete old tasks
-        for task in goal.tasks:
-            await db.delete(task)
+        # Get new AI breakdown; regenerating must not return the cached steps
+        ai_result = await break_down_goal(
+            goal_data.title, model_name=goal_data.model, priority=Priority.REGENERATE, use_cache=False
+        )
 
-        # Create new tasks
-        for i, task_desc in enumerate(ai_result["tasks"], 1):
-            task = Task(
-                goal_id=goal.id,
-                description=task_desc,
-                step_number=i
+        # Update goal and replace its tasks with set-based statements
+        await db.execute(
+            update(Goal)
+            .where(Goal.id == goal_id)
+            .values(
+                title=goal_data.title,
+                complexity_score=ai_result["complexity_score"],
+                status=COMPLETED,
+                error=None,
+                search_vector=search_document(goal_data.title, ai_result["tasks"]),
             )
-            db.add(task)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            delete(Task).where(Task.goal_id == goal_id).execution_options(synchronize_session=False)
+        )
+        [tasks] = await insert_tasks(db, [(goal_id, ai_result["tasks"])])
 
         await db.commit()
+        response_cache.invalidate(goal_id)
 
-        # Reload with new tasks
-        result = await db.execute(
-            select(Goal).options(selectinload(Goal.tasks)).where(Goal.id == goal.id)
+        return GoalResponse(
+            id=goal_id,
+            title=goal_data.title,
+            complexity_score=ai_result["complexity_score"],
+            created_at=existing.created_at,
+            tasks=tasks,
         )
-        goal = result.scalar_one()
-
-        return goal
 
     except HTTPException:
         raise
@@ -134,34 +584,106 @@ async def update_goal(goal_id: int, goal_data: GoalCreate, db: AsyncSession = De
 
 @router.delete("/{goal_id}")
 async def delete_goal(goal_id: int, db: AsyncSession = Depends(get_db)):
+    # Tasks go with it through ON DELETE CASCADE
     result = await db.execute(
-        select(Goal).where(Goal.id == goal_id)
+        delete(Goal).where(Goal.id == goal_id).execution_options(synchronize_session=False)
     )
-    goal = result.scalar_one_or_none()
 
-    if not goal:
+    if result.rowcount == 0:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Goal not found")
 
-    await db.delete(goal)
     await db.commit()
+    response_cache.invalidate(goal_id)
 
     return {"message": "Goal deleted successfully"}
 
 
 @router.delete("/")
-async def delete_all_goals(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Goal))
-    goals = result.scalars().all()
+async def delete_all_goals(
+    chunk_size: int | None = Query(None, ge=1, le=100_000),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delete every goal (tasks cascade in the database).
+
+    With `chunk_size`, rows are deleted and committed in chunks so locks
+    stay short on huge tables; progress is logged after each chunk.
+    """
+    if chunk_size is None:
+        result = await db.execute(delete(Goal).execution_options(synchronize_session=False))
+        await db.commit()
+        response_cache.invalidate_all()
+        return {"message": f"Deleted {result.rowcount} goals successfully", "deleted": result.rowcount, "chunks": 1}
+
+    deleted = 0
+    chunks = 0
+    while True:
+        chunk_ids = select(Goal.id).order_by(Goal.id).limit(chunk_size).scalar_subquery()
+        result = await db.execute(
+            delete(Goal).where(Goal.id.in_(chunk_ids)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        response_cache.invalidate_all()
 
-    for goal in goals:
-        await db.delete(goal)
+        deleted += result.rowcount
+        chunks += 1
+        logger.info("Deleted %d goals in %d chunks", deleted, chunks)
 
-    await db.commit()
+        if result.rowcount < chunk_size:
+            break
 
-    return {"message": f"Deleted {len(goals)} goals successfully"}
+    return {"message": f"Deleted {deleted} goals successfully", "deleted": deleted, "chunks": chunks}
 
 
 @router.get("/rate-limit/status")
 async def get_rate_limit_status():
-    """Get current rate limit usage."""
-    return rate_limiter.get_usage()
+    """Get current rate limit usage (cluster-wide with the database backend)."""
+    return await rate_limiter.get_usage()
+
+
+@router.get("/executor/status")
+async def get_executor_status():
+    """Get Gemini worker pool usage."""
+    return generation_executor.get_stats()
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get breakdown cache hit/miss/eviction counters."""
+    return breakdown_cache.get_stats()
+
+
+@router.get("/response-cache/stats")
+async def get_response_cache_stats():
+    """Get goal read cache hits, 304 responses and invalidations."""
+    return response_cache.get_stats()
+
+
+@router.get("/coalescing/stats")
+async def get_coalescing_stats():
+    """Get counts of originated vs. coalesced breakdown calls."""
+    return breakdown_flights.get_stats()
+
+
+@router.get("/models/registry")
+async def get_model_registry_stats():
+    """Get configured models and the shared clients built for them."""
+    return model_registry.get_stats()
+
+
+@router.get("/models/health")
+async def get_model_health():
+    """Get per-model latency histograms, hedge delays and circuit breaker states."""
+    return model_health.get_stats()
+
+
+@router.get("/batching/stats")
+async def get_batching_stats():
+    """Get goals answered per LLM call and rate limit slots saved by micro-batching."""
+    return breakdown_batcher.get_stats()
+
+
+@router.get("/queue/status")
+async def get_queue_status():
+    """Get admission queue length, wait times and rejections."""
+    return admission_queue.get_stats()
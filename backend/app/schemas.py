@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import List
+from typing import List, Literal
+
+MAX_BATCH_GOALS = 500
 
 
 class TaskBase(BaseModel):
@@ -20,17 +22,57 @@ class GoalCreate(BaseModel):
     model: str | None = None
 
 
-class GoalResponse(BaseModel):
+class GoalSummary(BaseModel):
     id: int
     title: str
-    complexity_score: int
+    complexity_score: int | None
     created_at: datetime
-    tasks: List[TaskResponse]
+    status: str = "completed"
 
     class Config:
         from_attributes = True
 
 
+class GoalResponse(GoalSummary):
+    tasks: List[TaskResponse]
+
+
+class GoalSearchResult(GoalSummary):
+    rank: float
+
+
+class GoalBatchCreate(BaseModel):
+    titles: List[str] = Field(min_length=1, max_length=MAX_BATCH_GOALS)
+    model: str | None = None
+
+
+class GoalBatchItem(BaseModel):
+    index: int
+    title: str
+    status: Literal["created", "failed"]
+    goal: GoalResponse | None = None
+    error: str | None = None
+
+
+class GoalBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[GoalBatchItem]
+
+
+class JobResponse(BaseModel):
+    job_id: int
+    goal_id: int
+    status: str
+    error: str | None = None
+    status_url: str
+    events_url: str
+
+
 class AIBreakdownResponse(BaseModel):
     complexity_score: int
     tasks: List[str]
+
+
+class AIBatchBreakdownItem(AIBreakdownResponse):
+    goal: int
@@ -0,0 +1,78 @@
+import re
+
+from sqlalchemy import Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+# Text search configuration used for both documents and queries on PostgreSQL
+SEARCH_CONFIG = "english"
+
+# SQLite fallback: an external-content FTS5 index over goals.search_vector,
+# kept in sync by triggers so every write path (and cascade) is covered
+SQLITE_FTS_TABLE = "goals_fts"
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    "search_vector, content='goals', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS goals_fts_insert AFTER INSERT ON goals BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_vector) VALUES (new.id, new.search_vector); END",
+    f"CREATE TRIGGER IF NOT EXISTS goals_fts_delete AFTER DELETE ON goals BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, search_vector) "
+    f"VALUES ('delete', old.id, old.search_vector); END",
+    f"CREATE TRIGGER IF NOT EXISTS goals_fts_update AFTER UPDATE OF search_vector ON goals BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, search_vector) "
+    f"VALUES ('delete', old.id, old.search_vector); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, search_vector) VALUES (new.id, new.search_vector); END",
+]
+
+_WORD = re.compile(r"\w+")
+
+
+class to_search_vector(FunctionElement):
+    """`to_tsvector` on PostgreSQL; the document text itself elsewhere."""
+
+    name = "to_search_vector"
+    type = Text()
+    inherit_cache = True
+
+
+@compiles(to_search_vector)
+def _compile_plain(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(to_search_vector, "postgresql")
+def _compile_tsvector(element, compiler, **kw):
+    # The cast keeps untyped parameters off the json/jsonb overloads
+    return f"to_tsvector('{SEARCH_CONFIG}', CAST({compiler.process(element.clauses, **kw)} AS TEXT))"
+
+
+class SearchVector(TypeDecorator):
+    """A goal's search document: tsvector on PostgreSQL, plain text on SQLite.
+
+    Values are bound as document text (see `search_document`) and converted
+    in the INSERT/UPDATE itself, so keeping the index current costs no
+    extra statement.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(TSVECTOR())
+        return dialect.type_descriptor(Text())
+
+    def bind_expression(self, bindvalue):
+        return to_search_vector(bindvalue)
+
+
+def search_document(title: str, tasks: list[str]) -> str:
+    """The text a goal is found by: its title and task descriptions."""
+    return "\n".join([title, *tasks])
+
+
+def fts5_query(q: str) -> str:
+    """Turn free text into an FTS5 query matching every word, with no operators."""
+    return " ".join(f'"{word}"' for word in _WORD.findall(q))
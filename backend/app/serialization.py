@@ -0,0 +1,53 @@
+import json
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # in requirements.txt; stdlib json if it cannot be installed
+    orjson = None
+
+
+def loads(text: str | bytes):
+    """json.loads, backed by orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    """Compact JSON bytes, backed by orjson when it is installed.
+
+    Both backends write datetimes as ISO 8601, like Pydantic does.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=_default).encode()
+
+
+# The builders below mirror schemas.GoalSummary / GoalResponse / TaskResponse
+# field for field, for reads that skip per-object Pydantic validation.
+
+def task_dict(row) -> dict:
+    return {"description": row.description, "step_number": row.step_number, "id": row.id}
+
+
+def goal_summary_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "complexity_score": row.complexity_score,
+        "created_at": row.created_at,
+        "status": row.status,
+    }
+
+
+def goal_dict(row, tasks: list[dict]) -> dict:
+    goal = goal_summary_dict(row)
+    goal["tasks"] = tasks
+    return goal
@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+
+from ..config import get_settings
+from .rate_limiter import RateLimiter, RateLimitExceededError, Reservation
+
+# Upper bounds (seconds) of the wait-time histogram buckets
+WAIT_TIME_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# How often the dispatcher re-checks the limiter while waiters are queued
+MAX_DISPATCH_INTERVAL = 1.0
+
+
+class Priority(IntEnum):
+    """Lower values are admitted first."""
+    INTERACTIVE = 0
+    REGENERATE = 1
+    BATCH = 2
+
+
+class AdmissionQueueFullError(RateLimitExceededError):
+    """Raised when too many breakdowns are already waiting for quota."""
+    pass
+
+
+class AdmissionQueue:
+    """Holds breakdown requests until the rate limiter has quota for them.
+
+    Instead of rejecting as soon as the limiter is empty, callers wait (up to
+    a deadline) and are admitted in priority order as quota frees up. When
+    the queue is full, new callers are shed with AdmissionQueueFullError.
+    """
+
+    def __init__(self, limiter: RateLimiter, max_depth: int | None = None, max_wait: float | None = None):
+        if max_depth is None or max_wait is None:
+            settings = get_settings()
+            max_depth = settings.ADMISSION_QUEUE_MAX_DEPTH if max_depth is None else max_depth
+            max_wait = settings.ADMISSION_MAX_WAIT_SECONDS if max_wait is None else max_wait
+        self.limiter = limiter
+        self.max_depth = max_depth
+        self.max_wait = max_wait
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+        self.reset()
+
+    async def admit(self, priority: Priority = Priority.INTERACTIVE, max_wait: float | None = None) -> Reservation:
+        """Wait for a rate limit reservation, raising if none is granted in time."""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        start = time.monotonic()
+
+        if not self._pending():
+            try:
+                reservation = await self.limiter.reserve()
+            except RateLimitExceededError as e:
+                if e.retry_after is not None and e.retry_after > max_wait:
+                    # Quota will not free up before the deadline (e.g. daily limit)
+                    self.rejected_deadline += 1
+                    raise
+            else:
+                self._observe_wait(0.0)
+                return reservation
+
+        if self._pending() >= self.max_depth:
+            self.rejected_full += 1
+            raise AdmissionQueueFullError(
+                "Too many goals are waiting for AI capacity. Please try again shortly."
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._ensure_dispatcher()
+
+        try:
+            await asyncio.wait({future}, timeout=max_wait)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                await self.limiter.refund(future.result())
+            future.cancel()
+            raise
+
+        if not future.done():
+            future.cancel()
+            self.rejected_deadline += 1
+            raise RateLimitExceededError(
+                f"Rate limit exceeded. Waited {max_wait:g} seconds without free capacity; please try again."
+            )
+
+        self._observe_wait(time.monotonic() - start)
+        return future.result()
+
+    def _pending(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    def _next_waiter(self) -> asyncio.Future | None:
+        while self._waiters:
+            _, _, future = self._waiters[0]
+            if not future.done():
+                return future
+            heapq.heappop(self._waiters)
+        return None
+
+    async def _dispatch(self):
+        while self._next_waiter() is not None:
+            try:
+                reservation = await self.limiter.reserve()
+            except RateLimitExceededError as e:
+                delay = e.retry_after if e.retry_after is not None else MAX_DISPATCH_INTERVAL
+                await asyncio.sleep(min(max(delay, 0.01), MAX_DISPATCH_INTERVAL))
+                continue
+
+            # Waiters may have changed while reserving; grant to the best one left
+            future = self._next_waiter()
+            if future is None:
+                await self.limiter.refund(reservation)
+                return
+            heapq.heappop(self._waiters)
+            future.set_result(reservation)
+
+    def _observe_wait(self, seconds: float):
+        self.admitted += 1
+        self.wait_seconds_total += seconds
+        for i, bound in enumerate(WAIT_TIME_BUCKETS):
+            if seconds <= bound:
+                self.wait_buckets[i] += 1
+
+    def get_stats(self) -> dict:
+        """Queue length, wait-time histogram (cumulative, like Prometheus) and rejections."""
+        by_priority = {p.name.lower(): 0 for p in Priority}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                by_priority[Priority(priority).name.lower()] += 1
+        return {
+            "queued": sum(by_priority.values()),
+            "queued_by_priority": by_priority,
+            "max_depth": self.max_depth,
+            "max_wait_seconds": self.max_wait,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_full,
+            "rejected_deadline": self.rejected_deadline,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_buckets": {
+                **{f"{bound:g}": count for bound, count in zip(WAIT_TIME_BUCKETS, self.wait_buckets)},
+                "+Inf": self.admitted,
+            },
+        }
+
+    def reset(self):
+        """Reset counters; queued waiters are left alone."""
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_deadline = 0
+        self.wait_seconds_total = 0.0
+        self.wait_buckets = [0] * len(WAIT_TIME_BUCKETS)
@@ -1,72 +1,136 @@
-import google.generativeai as genai
-import json
-import re
 import asyncio
+import copy
+import json
+import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from collections import deque
 
 from ..config import get_settings
+from ..schemas import AIBreakdownResponse, AIBatchBreakdownItem
+from ..telemetry import span, LLM_CALL_DURATION
+from .breakdown_cache import BreakdownCache, normalize_title, make_cache_key
+from .breakdown_parser import IncrementalBreakdownParser, parse_breakdown, parse_batch_breakdowns
+from .rate_limiter import RateLimitExceededError, create_rate_limiter
+from .admission import AdmissionQueue, AdmissionQueueFullError, Priority
+from .model_registry import ModelRegistry, DEFAULT_MODEL
+from .model_health import ModelHealth, is_unavailable_error
+from .micro_batch import MicroBatcher, BatchItem
+
+logger = logging.getLogger(__name__)
+
+
+# Global rate limiter instance (backend chosen by RATE_LIMIT_BACKEND)
+rate_limiter = create_rate_limiter()
+
+# Requests wait here for rate limit quota instead of failing immediately
+admission_queue = AdmissionQueue(rate_limiter)
 
 
-class RateLimiter:
-    """Simple rate limiter to prevent API quota exhaustion."""
+class GenerationExecutor:
+    """Bounded thread pool for blocking Gemini SDK calls.
     
-    def __init__(self, max_requests_per_minute: int = 10, max_requests_per_day: int = 500):
-        self.max_per_minute = max_requests_per_minute
-        self.max_per_day = max_requests_per_day
-        self.minute_requests: deque = deque()
-        self.daily_requests: deque = deque()
+    `generate_content` is synchronous, so it runs here instead of on the
+    event loop; other requests keep being served while breakdowns are pending.
+    """
+    
+    def __init__(self, max_workers: int | None = None):
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+    
+    @property
+    def max_workers(self) -> int:
+        if self._max_workers is None:
+            self._max_workers = get_settings().GEMINI_MAX_WORKERS
+        return self._max_workers
     
-    def _clean_old_requests(self):
-        """Remove requests older than their time window."""
-        now = time.time()
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="gemini"
+            )
+        return self._executor
+    
+    async def run(self, func, *args, **kwargs):
+        """Run `func` in the pool and await its result without blocking the loop."""
+        def call():
+            with self._lock:
+                self.queued -= 1
+                self.in_flight += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
         
-        # Clean requests older than 1 minute
-        while self.minute_requests and now - self.minute_requests[0] > 60:
-            self.minute_requests.popleft()
+        with self._lock:
+            self.queued += 1
+        future = self._get_executor().submit(call)
+        try:
+            result = await asyncio.wrap_future(future)
+        except BaseException:
+            with self._lock:
+                if future.cancelled():
+                    # Never started, so `call` did not take it off the queue
+                    self.queued -= 1
+                self.failed += 1
+            raise
         
-        # Clean requests older than 24 hours
-        while self.daily_requests and now - self.daily_requests[0] > 86400:
-            self.daily_requests.popleft()
+        with self._lock:
+            self.completed += 1
+        return result
     
-    def can_make_request(self) -> tuple[bool, str]:
-        """Check if a request can be made. Returns (allowed, error_message)."""
-        self._clean_old_requests()
-        
-        if len(self.minute_requests) >= self.max_per_minute:
-            wait_time = 60 - (time.time() - self.minute_requests[0])
-            return False, f"Rate limit exceeded. Please wait {int(wait_time)} seconds."
+    async def stream(self, func, *args, **kwargs):
+        """Iterate the iterable returned by `func` in the pool, yielding its items as they arrive."""
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+        end = object()
         
-        if len(self.daily_requests) >= self.max_per_day:
-            return False, "Daily limit reached. Please try again tomorrow."
+        def produce():
+            for item in func(*args, **kwargs):
+                if stopped.is_set():
+                    break
+                loop.call_soon_threadsafe(items.put_nowait, item)
         
-        return True, ""
-    
-    def record_request(self):
-        """Record a successful request."""
-        now = time.time()
-        self.minute_requests.append(now)
-        self.daily_requests.append(now)
+        producer = asyncio.ensure_future(self.run(produce))
+        # Scheduled after every item the thread queued, so it always comes last
+        producer.add_done_callback(lambda f: items.put_nowait(end))
+        try:
+            while (item := await items.get()) is not end:
+                yield item
+            producer.result()
+        finally:
+            # Tell the thread to stop early if the consumer went away
+            stopped.set()
+            if not producer.done():
+                producer.add_done_callback(lambda f: f.cancelled() or f.exception())
     
-    def get_usage(self) -> dict:
-        """Get current usage stats."""
-        self._clean_old_requests()
+    def get_stats(self) -> dict:
+        """Get current pool usage."""
         return {
-            "requests_this_minute": len(self.minute_requests),
-            "requests_today": len(self.daily_requests),
-            "max_per_minute": self.max_per_minute,
-            "max_per_day": self.max_per_day,
+            "max_workers": self.max_workers,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
         }
+    
+    def shutdown(self):
+        """Stop the worker threads; a new pool is created on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
 
-# Global rate limiter instance
-rate_limiter = RateLimiter(max_requests_per_minute=10, max_requests_per_day=500)
-
-
-class RateLimitExceededError(Exception):
-    """Raised when rate limit is exceeded."""
-    pass
+# Global executor for Gemini calls
+generation_executor = GenerationExecutor()
 
 
 def simplify_error_message(error: Exception) -> str:
@@ -137,42 +201,95 @@ def simplify_error_message(error: Exception) -> str:
     return error_str
 
 
-AVAILABLE_MODELS = [
-    {"id": "gemini-2.0-flash", "name": "Gemini 2.0 Flash", "description": "Fast, latest stable"},
-    {"id": "gemini-2.5-flash", "name": "Gemini 2.5 Flash", "description": "Newest, experimental"},
-    {"id": "gemini-1.5-flash", "name": "Gemini 1.5 Flash", "description": "Previous gen, stable"},
-    {"id": "gemini-1.5-pro", "name": "Gemini 1.5 Pro", "description": "Higher quality, slower"},
-]
+# Global registry of shared, pre-configured Gemini model clients
+model_registry = ModelRegistry(
+    api_key=get_settings().GEMINI_API_KEY,
+    api_endpoint=get_settings().GEMINI_API_ENDPOINT or None,
+    models_file=get_settings().GEMINI_MODELS_FILE or None,
+)
+
 
-DEFAULT_MODEL = "gemini-2.5-flash"
+# Global per-model latency histograms and circuit breakers
+model_health = ModelHealth()
 
 
 def get_available_models() -> list:
     """Return list of available AI models."""
-    return AVAILABLE_MODELS
+    return model_registry.list_models()
+
+
+def resolve_model_id(model_name: str | None) -> str:
+    """Map a requested model onto a supported model id."""
+    return model_registry.resolve(model_name)
 
 
 def get_model(model_name: str = DEFAULT_MODEL):
-    """Get a GenerativeModel instance for the specified model."""
-    settings = get_settings()
-    genai.configure(api_key=settings.GEMINI_API_KEY)
+    """Get the shared GenerativeModel instance for the specified model."""
+    return model_registry.get(model_name)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one shared execution.
+    
+    The first caller originates the call; callers arriving while it is in
+    flight await the same future and receive its result or its exception.
+    """
     
-    valid_ids = [m["id"] for m in AVAILABLE_MODELS]
-    if model_name not in valid_ids:
-        model_name = DEFAULT_MODEL
+    def __init__(self):
+        self._calls: dict[str, asyncio.Future] = {}
+        self.originated = 0
+        self.coalesced = 0
     
-    return genai.GenerativeModel(model_name)
+    async def do(self, key: str, func):
+        """Await `func()` unless an identical call is already running."""
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Waiters share one result, so each gets its own copy
+            return copy.deepcopy(await asyncio.shield(future))
+        
+        self.originated += 1
+        future = asyncio.ensure_future(func())
+        self._calls[key] = future
+        future.add_done_callback(lambda f: self._finish(key, f))
+        # Shielded so a disconnecting originator does not cancel the call for everyone
+        return await asyncio.shield(future)
+    
+    def _finish(self, key: str, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            future.exception()  # Mark retrieved even if every waiter went away
+    
+    def get_stats(self) -> dict:
+        """Get coalesced vs. originated call counts."""
+        return {
+            "originated": self.originated,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+    
+    def reset(self):
+        """Reset counters; in-flight calls are left alone."""
+        self.originated = 0
+        self.coalesced = 0
 
 
-async def break_down_goal(goal: str, model_name: str | None = None, max_retries: int = 3) -> dict:
-    # Check rate limit before making request
-    can_request, error_msg = rate_limiter.can_make_request()
-    if not can_request:
-        raise RateLimitExceededError(error_msg)
-    
-    model = get_model(model_name or DEFAULT_MODEL)
+# Global in-flight deduplication for breakdowns
+breakdown_flights = SingleFlight()
+
+# Errors from Gemini that retrying will not fix
+QUOTA_ERROR_KEYWORDS = ["quota", "rate limit", "429", "404", "resource exhausted", "api key"]
+
+# Bump whenever the prompt changes so cached breakdowns are not reused
+PROMPT_VERSION = "1"
 
-    prompt = f"""
+# Global breakdown cache instance
+breakdown_cache = BreakdownCache()
+
+
+def build_prompt(goal: str) -> str:
+    return f"""
     You are a goal-breaking assistant. Given a vague goal, break it down into exactly 5 actionable, specific steps.
     Also provide a complexity score from 1-10 (1 = very simple, 10 = extremely complex).
 
@@ -182,47 +299,369 @@ async def break_down_goal(goal: str, model_name: str | None = None, max_retries:
     {{"complexity_score": <number 1-10>, "tasks": ["step 1", "step 2", "step 3", "step 4", "step 5"]}}
     """
 
-    last_error = None
-    
-    for attempt in range(max_retries):
-        try:
-            response = model.generate_content(prompt)
-            text = response.text.strip()
 
-            # Clean up response - remove markdown code blocks if present
-            if text.startswith("```"):
-                text = re.sub(r"```json?\n?", "", text)
-                text = re.sub(r"```\n?", "", text)
-                text = text.strip()
+def build_batch_prompt(goals: list[str]) -> str:
+    numbered = "\n".join(f"    {i}. {json.dumps(goal)}" for i, goal in enumerate(goals, 1))
+    return f"""
+    You are a goal-breaking assistant. For EACH goal below, break it down into exactly 5 actionable, specific steps.
+    Also provide a complexity score from 1-10 (1 = very simple, 10 = extremely complex).
 
-            result = json.loads(text)
+    Goals:
+{numbered}
 
-            # Validate response structure
-            if "complexity_score" not in result or "tasks" not in result:
-                raise ValueError("Invalid AI response structure")
+    Respond ONLY with a valid JSON array containing one object per goal, in the same order (no markdown, no code blocks):
+    [{{"goal": <goal number>, "complexity_score": <number 1-10>, "tasks": ["step 1", "step 2", "step 3", "step 4", "step 5"]}}]
+    """
 
-            if len(result["tasks"]) != 5:
-                raise ValueError("AI must return exactly 5 tasks")
 
-            # Ensure complexity score is in range
-            result["complexity_score"] = max(1, min(10, int(result["complexity_score"])))
+def generation_kwargs(schema) -> dict:
+    """Extra `generate_content` arguments constraining the response to `schema`.
 
-            # Record successful request
-            rate_limiter.record_request()
-            
-            return result
+    Empty unless GEMINI_STRUCTURED_OUTPUT is on; then Gemini is asked for
+    JSON matching the schema rather than relying on the prompt alone.
+    """
+    if not get_settings().GEMINI_STRUCTURED_OUTPUT:
+        return {}
+    return {"generation_config": {"response_mime_type": "application/json", "response_schema": schema}}
+
+
+async def break_down_goal(
+    goal: str,
+    model_name: str | None = None,
+    max_retries: int = 3,
+    priority: Priority = Priority.INTERACTIVE,
+    use_cache: bool = True,
+) -> dict:
+    """Break down a goal, from the cache when possible.
+
+    With `use_cache=False` (regenerating a goal's steps) Gemini is always
+    asked; the new breakdown still replaces the cached one.
+    """
+    model_id = resolve_model_id(model_name)
+    normalized_title = normalize_title(goal)
+    cache_key = make_cache_key(normalized_title, model_id, PROMPT_VERSION)
+
+    # Cache hits cost neither a Gemini call nor a rate limit slot
+    if use_cache:
+        with span("breakdown.cache_lookup", model=model_id) as attrs:
+            cached = await breakdown_cache.get(cache_key)
+            attrs["cache_hit"] = cached is not None
+        if cached is not None:
+            return cached
+
+    async def generate_and_cache() -> dict:
+        if breakdown_batcher.enabled:
+            result, answered_by = await breakdown_batcher.submit(model_id, goal, priority, max_retries)
+        else:
+            result, answered_by = await _generate_breakdown(goal, model_id, max_retries, priority)
+        await _cache_breakdown(normalized_title, answered_by, result)
+        return result
+
+    return await breakdown_flights.do(cache_key, generate_and_cache)
+
+
+async def _cache_breakdown(normalized_title: str, model_id: str, result: dict):
+    # Keyed by the model that answered: a fallback's or hedge's answer must not
+    # be served later as the requested model's
+    await breakdown_cache.set(
+        make_cache_key(normalized_title, model_id, PROMPT_VERSION),
+        result,
+        model_id=model_id,
+        normalized_title=normalized_title,
+        prompt_version=PROMPT_VERSION,
+    )
+
+
+async def _generate_breakdown(
+    goal: str, model_id: str, max_retries: int, priority: Priority
+) -> tuple[dict, str]:
+    """Breakdown of `goal` and the id of the model that answered it."""
+    # Wait for quota up front; it is given back if the breakdown fails
+    with span("breakdown.admission_wait", priority=priority.name.lower()):
+        reservation = await admission_queue.admit(priority)
+    try:
+        with span("breakdown.generate", model=model_id):
+            result, answered_by = await _call_with_retries(goal, model_id, max_retries)
+    except BaseException:
+        await rate_limiter.refund(reservation)
+        raise
+    await rate_limiter.commit(reservation)
+    return result, answered_by
+
+
+def _is_quota_error(error: Exception) -> bool:
+    error_str = str(error).lower()
+    return any(keyword in error_str for keyword in QUOTA_ERROR_KEYWORDS)
+
+
+async def _call_with_retries(goal: str, model_id: str, max_retries: int) -> tuple[dict, str]:
+    prompt = build_prompt(goal)
+
+    last_error = None
+    unavailable: set[str] = set()
+    
+    for attempt in range(max_retries):
+        if attempt:
+            model_health.record_retry(model_id)
+        # Route around models whose circuit breaker is open or that just failed
+        target = model_health.route(model_id, model_registry.model_ids, exclude=unavailable)
+        try:
+            with span("llm.attempt", model=target, attempt=attempt + 1):
+                return await _hedged_call(target, prompt)
             
         except Exception as e:
             last_error = e
             
+            # An unavailable model is skipped straight away if there is a fallback
+            if is_unavailable_error(e):
+                unavailable.add(target)
+                if attempt < max_retries - 1 and model_health.fallback_for(
+                    model_id, model_registry.model_ids, exclude=unavailable
+                ):
+                    continue
+            
             # Check if it's a Google API quota/rate limit error
-            error_str = str(e).lower()
-            if any(keyword in error_str for keyword in ["quota", "rate limit", "429", "404", "resource exhausted", "api key"]):
+            if _is_quota_error(e):
                 # Don't retry on quota errors, use simplified message
                 friendly_message = simplify_error_message(e)
                 raise RateLimitExceededError(friendly_message)
             
             if attempt < max_retries - 1:
-                await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
+                with span("llm.retry_backoff", attempt=attempt + 1):
+                    await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
     
     raise last_error
+
+
+async def _generate_with(model_id: str, prompt: str) -> dict:
+    """One Gemini call, recorded in the model's latency histogram and circuit breaker."""
+    model = get_model(model_id)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with span("llm.call", model=model_id):
+            response = await generation_executor.run(
+                model.generate_content, prompt, **generation_kwargs(AIBreakdownResponse)
+            )
+        outcome = "invalid"
+        with span("llm.parse", model=model_id):
+            result = parse_breakdown(response.text)
+        outcome = "ok"
+    except Exception as e:
+        model_health.record_failure(model_id, e)
+        if outcome == "invalid":
+            model_health.record_response(model_id, valid=False)
+        raise
+    finally:
+        LLM_CALL_DURATION.observe((model_id, outcome), time.perf_counter() - start)
+    model_health.record_response(model_id, valid=True)
+    model_health.record_success(model_id, time.perf_counter() - start)
+    return result
+
+
+async def _hedged_call(model_id: str, prompt: str) -> tuple[dict, str]:
+    """Call `model_id`; if it is slower than its hedge delay, race a fallback model.
+
+    Returns the result and the id of the model that gave it. The first
+    valid result wins and the other call is abandoned (its worker
+    thread finishes in the background, since blocking SDK calls cannot be
+    interrupted). The hedge takes its own rate limit slot and is skipped
+    when none is free.
+    """
+    primary = asyncio.ensure_future(_generate_with(model_id, prompt))
+    calls = {primary}
+    hedge = None
+    reservation = None
+    try:
+        if not get_settings().HEDGE_ENABLED:
+            return await primary, model_id
+        
+        done, _ = await asyncio.wait(calls, timeout=model_health.hedge_delay(model_id))
+        fallback_id = None if done else model_health.fallback_for(model_id, model_registry.model_ids)
+        if fallback_id is not None:
+            try:
+                reservation = await rate_limiter.reserve()
+            except RateLimitExceededError:
+                pass
+        if reservation is None:
+            return await primary, model_id
+        
+        model_health.hedges_fired += 1
+        hedge = asyncio.ensure_future(_generate_with(fallback_id, prompt))
+        calls.add(hedge)
+        
+        last_error = None
+        while calls:
+            done, calls = await asyncio.wait(calls, return_when=asyncio.FIRST_COMPLETED)
+            for call in done:
+                if call.exception() is None:
+                    if call is hedge:
+                        model_health.hedges_won += 1
+                        return call.result(), fallback_id
+                    return call.result(), model_id
+                last_error = call.exception()
+        raise last_error
+    finally:
+        for call in calls:
+            call.cancel()
+        # The losing call may still fail later; nobody awaits it
+        for call in (primary, hedge):
+            if call is not None:
+                call.add_done_callback(lambda f: f.cancelled() or f.exception())
+        if reservation is not None:
+            if hedge.done() and not hedge.cancelled() and hedge.exception() is not None:
+                await rate_limiter.refund(reservation)
+            else:
+                await rate_limiter.commit(reservation)
+
+
+async def _generate_batch(model_id: str, items: list[BatchItem]):
+    """Answer several goals with one Gemini call and one rate limit slot.
+
+    Goals the batch response does not answer validly (or all of them, if
+    the call fails) fall back to individual breakdowns. A quota error fails
+    every goal instead, since the individual calls would only hit it again.
+    """
+    if len(items) == 1:
+        await _settle(items[0], model_id)
+        return
+
+    with span("breakdown.admission_wait", priority=min(item.priority for item in items).name.lower()):
+        reservation = await admission_queue.admit(min(item.priority for item in items))
+
+    target = model_health.route(model_id, model_registry.model_ids)
+    results: list[dict | None] = [None] * len(items)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with span("llm.batch_call", model=target, goals=len(items)):
+            response = await generation_executor.run(
+                get_model(target).generate_content,
+                build_batch_prompt([item.goal for item in items]),
+                **generation_kwargs(list[AIBatchBreakdownItem]),
+            )
+        outcome = "invalid"
+        with span("llm.parse", model=target):
+            results = parse_batch_breakdowns(response.text, len(items))
+        outcome = "ok"
+    except Exception as e:
+        model_health.record_failure(target, e)
+        if outcome == "invalid":
+            model_health.record_response(target, valid=False)
+        await rate_limiter.refund(reservation)
+        if _is_quota_error(e):
+            error = RateLimitExceededError(simplify_error_message(e))
+            for item in items:
+                item.fail(error)
+            return
+        logger.warning("Batch of %d breakdowns failed, retrying individually: %s", len(items), e)
+    else:
+        model_health.record_response(target, valid=True)
+        model_health.record_success(target, time.perf_counter() - start)
+        await rate_limiter.commit(reservation)
+        breakdown_batcher.record_batch(len(items), sum(result is not None for result in results))
+    finally:
+        LLM_CALL_DURATION.observe((target, outcome), time.perf_counter() - start)
+
+    fallbacks = []
+    for item, result in zip(items, results):
+        if result is not None:
+            item.resolve((result, target))
+        else:
+            fallbacks.append(item)
+    breakdown_batcher.fallbacks += len(fallbacks)
+    await asyncio.gather(*(_settle(item, model_id) for item in fallbacks))
+
+
+async def _settle(item: BatchItem, model_id: str):
+    try:
+        item.resolve(await _generate_breakdown(item.goal, model_id, item.max_retries, item.priority))
+    except Exception as e:
+        item.fail(e)
+
+
+# Groups concurrent breakdowns into multi-goal prompts when MICRO_BATCH_ENABLED
+breakdown_batcher = MicroBatcher(
+    _generate_batch,
+    window=get_settings().MICRO_BATCH_WINDOW_MS / 1000,
+    max_size=get_settings().MICRO_BATCH_MAX_SIZE,
+    enabled=get_settings().MICRO_BATCH_ENABLED,
+)
+
+
+def _stream_text(model, prompt: str):
+    for chunk in model.generate_content(prompt, stream=True, **generation_kwargs(AIBreakdownResponse)):
+        yield chunk.text
+
+
+async def stream_breakdown(
+    goal: str,
+    model_name: str | None = None,
+    max_retries: int = 3,
+    priority: Priority = Priority.INTERACTIVE,
+):
+    """Break down a goal, yielding each field as soon as Gemini has written it.
+
+    Yields ("complexity_score", {...}) and one ("task", {...}) per step
+    while the response streams in, then ("result", breakdown) once the full
+    response is validated. Validation may repair the response (e.g. merge a
+    sixth step), so if the result differs from what was streamed a
+    ("replace", {...}) event with the final score and steps comes first.
+    Attempts are only retried if nothing was yielded yet. Concurrent
+    identical streams are not coalesced.
+    """
+    model_id = resolve_model_id(model_name)
+    normalized_title = normalize_title(goal)
+    cache_key = make_cache_key(normalized_title, model_id, PROMPT_VERSION)
+
+    cached = await breakdown_cache.get(cache_key)
+    if cached is not None:
+        yield "complexity_score", {"complexity_score": cached["complexity_score"]}
+        for step, task in enumerate(cached["tasks"], 1):
+            yield "task", {"step_number": step, "description": task}
+        yield "result", cached
+        return
+
+    reservation = await admission_queue.admit(priority)
+    try:
+        target = model_health.route(model_id, model_registry.model_ids)
+        model = get_model(target)
+        prompt = build_prompt(goal)
+        for attempt in range(max_retries):
+            if attempt:
+                model_health.record_retry(model_id)
+            parser = IncrementalBreakdownParser()
+            streamed = False
+            start = time.perf_counter()
+            try:
+                async for chunk in generation_executor.stream(_stream_text, model, prompt):
+                    for event in parser.feed(chunk):
+                        yield event
+                streamed = True
+                result = parse_breakdown(parser.text)
+                model_health.record_response(target, valid=True)
+                model_health.record_success(target, time.perf_counter() - start)
+                LLM_CALL_DURATION.observe((target, "ok"), time.perf_counter() - start)
+                break
+            except Exception as e:
+                model_health.record_failure(target, e)
+                LLM_CALL_DURATION.observe((target, "invalid" if streamed else "error"), time.perf_counter() - start)
+                if streamed:
+                    model_health.record_response(target, valid=False)
+                if _is_quota_error(e):
+                    raise RateLimitExceededError(simplify_error_message(e))
+                if parser.emitted or attempt == max_retries - 1:
+                    raise
+                await asyncio.sleep(1 * (attempt + 1))
+    except BaseException:
+        await rate_limiter.refund(reservation)
+        raise
+    await rate_limiter.commit(reservation)
+
+    await _cache_breakdown(normalized_title, target, result)
+    if (parser.complexity_score, parser.tasks) != (result["complexity_score"], result["tasks"]):
+        yield "replace", {
+            "complexity_score": result["complexity_score"],
+            "tasks": [{"step_number": step, "description": task} for step, task in enumerate(result["tasks"], 1)],
+        }
+    yield "result", result
@@ -0,0 +1,161 @@
+import copy
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..config import get_settings
+from ..database import async_session
+from ..models import BreakdownCacheEntry
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " .,!?;:'\"`"
+
+
+def normalize_title(title: str) -> str:
+    """Collapse case, whitespace and edge punctuation so near-identical titles match."""
+    text = unicodedata.normalize("NFKC", title).casefold()
+    text = _WHITESPACE.sub(" ", text)
+    return text.strip(_EDGE_PUNCTUATION)
+
+
+def make_cache_key(normalized_title: str, model_id: str, prompt_version: str) -> str:
+    """Content-address a breakdown by everything that influences the AI output."""
+    raw = f"{prompt_version}\0{model_id}\0{normalized_title}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class BreakdownCache:
+    """Two-tier cache of AI breakdowns.
+
+    The in-process tier is an LRU bounded by entry count with a TTL per entry.
+    The optional persistent tier lives in the `breakdown_cache` table so that
+    every worker (and restarts) can reuse breakdowns.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: int | None = None,
+        persistent: bool | None = None,
+        session_factory=async_session,
+    ):
+        settings = None
+        if max_entries is None or ttl_seconds is None or persistent is None:
+            settings = get_settings()
+        self.max_entries = max_entries if max_entries is not None else settings.BREAKDOWN_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.BREAKDOWN_CACHE_TTL_SECONDS
+        self.persistent = persistent if persistent is not None else settings.BREAKDOWN_CACHE_PERSISTENT
+        self.session_factory = session_factory
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.persistent_errors = 0
+
+    async def get(self, key: str) -> dict | None:
+        """Return a copy of the cached breakdown, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(value)
+            del self._entries[key]
+            self.expirations += 1
+
+        if self.persistent:
+            value = await self._get_persistent(key)
+            if value is not None:
+                self.persistent_hits += 1
+                self._set_memory(key, value)
+                return copy.deepcopy(value)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict, *, model_id: str, normalized_title: str, prompt_version: str):
+        """Store a breakdown in every enabled tier."""
+        value = {"complexity_score": value["complexity_score"], "tasks": list(value["tasks"])}
+        self._set_memory(key, value)
+        if self.persistent:
+            await self._set_persistent(key, value, model_id, normalized_title, prompt_version)
+
+    def _set_memory(self, key: str, value: dict):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _get_persistent(self, key: str) -> dict | None:
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(BreakdownCacheEntry.complexity_score, BreakdownCacheEntry.tasks).where(
+                        BreakdownCacheEntry.key == key,
+                        BreakdownCacheEntry.expires_at > datetime.utcnow(),
+                    )
+                )
+                row = result.first()
+        except SQLAlchemyError:
+            self.persistent_errors += 1
+            return None
+
+        if row is None:
+            return None
+        return {"complexity_score": row.complexity_score, "tasks": list(row.tasks)}
+
+    async def _set_persistent(self, key: str, value: dict, model_id: str, normalized_title: str, prompt_version: str):
+        now = datetime.utcnow()
+        try:
+            async with self.session_factory() as session:
+                await session.merge(BreakdownCacheEntry(
+                    key=key,
+                    model=model_id,
+                    prompt_version=prompt_version,
+                    normalized_title=normalized_title[:500],
+                    complexity_score=value["complexity_score"],
+                    tasks=value["tasks"],
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=self.ttl_seconds),
+                ))
+                await session.commit()
+        except SQLAlchemyError:
+            # Another worker may have stored the same key concurrently
+            self.persistent_errors += 1
+
+    def clear(self):
+        """Drop the in-process tier and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.persistent_errors = 0
+
+    def get_stats(self) -> dict:
+        """Get hit/miss/eviction counters."""
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.persistent_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "persistent_errors": self.persistent_errors,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self.persistent,
+        }
@@ -0,0 +1,269 @@
+import json
+import re
+
+from ..serialization import loads
+
+TASK_COUNT = 5
+
+# How many embedded JSON values to try before giving up on a response
+MAX_JSON_CANDIDATES = 3
+
+CLOSERS = {"{": "}", "[": "]"}
+
+# Used only when the fast path fails
+_TRAILING_COMMA = re.compile(r",(\s*[\]}])")
+_FIRST_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_TASK_SPLIT = re.compile(r";\s+|\s+and then\s+|\.\s+(?=[A-Z])")
+
+
+def extract_json(text: str, opener: str = "{", start: int = 0) -> tuple[str, int]:
+    """Return the first complete JSON object (or array) at or after `start`, and its offset.
+
+    Surrounding prose and markdown fences are skipped in a single pass that
+    tracks strings, so braces inside task text do not confuse it. If the
+    value never closes, everything from its start is returned.
+    """
+    start = text.find(opener, start)
+    if start < 0:
+        raise ValueError("No JSON found in AI response")
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1], start
+    return text[start:], start
+
+
+def _loads_repaired(candidate: str):
+    try:
+        return loads(candidate)
+    except ValueError:
+        pass
+    # Repair: trailing commas before a closing bracket
+    return loads(_TRAILING_COMMA.sub(r"\1", candidate))
+
+
+def _load_json(text: str, opener: str = "{"):
+    # Fast path: the whole response is one JSON value (checked by the caller)
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        try:
+            return loads(stripped)
+        except ValueError:
+            pass
+
+    # Fenced or chatty output around a single value: slice from the first
+    # opener to the last closer, which needs no scan in the common case
+    first, last = text.find(opener), text.rfind(CLOSERS[opener])
+    if 0 <= first < last:
+        try:
+            return _loads_repaired(text[first:last + 1])
+        except ValueError:
+            pass
+
+    # Otherwise try each embedded value in turn, e.g. past "{name}" in prose
+    start = 0
+    error = None
+    for _ in range(MAX_JSON_CANDIDATES):
+        try:
+            candidate, start = extract_json(text, opener, start)
+        except ValueError as e:
+            error = error or e
+            break
+        try:
+            return _loads_repaired(candidate)
+        except ValueError as e:
+            error = e
+        start += 1
+    raise ValueError(f"AI returned invalid JSON: {error}")
+
+
+def _repair_tasks(tasks: list[str]) -> list[str]:
+    """Fix responses that are one step off: merge a sixth step, split a fourth."""
+    if len(tasks) == TASK_COUNT + 1:
+        return tasks[:TASK_COUNT - 1] + [f"{tasks[-2].rstrip('.')}; then {tasks[-1][:1].lower()}{tasks[-1][1:]}"]
+    if len(tasks) == TASK_COUNT - 1:
+        # Split the longest step that reads as two
+        for i in sorted(range(len(tasks)), key=lambda i: -len(tasks[i])):
+            parts = _TASK_SPLIT.split(tasks[i], maxsplit=1)
+            if len(parts) == 2 and all(p.strip() for p in parts):
+                first, second = (p.strip() for p in parts)
+                return tasks[:i] + [first, second[:1].upper() + second[1:]] + tasks[i + 1:]
+    return tasks
+
+
+def _score(value) -> int:
+    if isinstance(value, bool):
+        raise ValueError("Invalid complexity score")
+    if isinstance(value, (int, float)):
+        return int(value)
+    # e.g. "7" or "7/10"
+    match = _FIRST_NUMBER.search(str(value))
+    if match is None:
+        raise ValueError("Invalid complexity score")
+    return int(float(match.group()))
+
+
+def validate_breakdown(result) -> dict:
+    """Check one breakdown object, repairing near misses, and clamp its complexity score."""
+    # Validate response structure
+    if not isinstance(result, dict) or "complexity_score" not in result or "tasks" not in result:
+        raise ValueError("Invalid AI response structure")
+
+    tasks = result["tasks"]
+    if not isinstance(tasks, list) or not all(isinstance(t, str) and t.strip() for t in tasks):
+        raise ValueError("Invalid AI response structure")
+    tasks = _repair_tasks([t.strip() for t in tasks])
+
+    if len(tasks) != TASK_COUNT:
+        raise ValueError("AI must return exactly 5 tasks")
+
+    # Ensure complexity score is in range
+    return {"complexity_score": max(1, min(10, _score(result["complexity_score"]))), "tasks": tasks}
+
+
+def parse_breakdown(text: str) -> dict:
+    """Parse and validate a complete breakdown response from Gemini."""
+    return validate_breakdown(_load_json(text))
+
+
+def parse_batch_breakdowns(text: str, count: int) -> list[dict | None]:
+    """Parse a JSON array answering `count` numbered goals.
+
+    Items are matched by their `goal` number (falling back to position);
+    a goal whose item is missing or invalid gets None so it can be retried
+    on its own. Raises if the response is not a JSON array at all.
+    """
+    items = _load_json(text, opener="[")
+    if not isinstance(items, list):
+        raise ValueError("AI batch response must be a JSON array")
+
+    results: list[dict | None] = [None] * count
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        number = item.get("goal", position + 1)
+        if not isinstance(number, int) or not 1 <= number <= count or results[number - 1] is not None:
+            continue
+        try:
+            results[number - 1] = validate_breakdown(item)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return results
+
+
+class IncrementalBreakdownParser:
+    """Scans a breakdown JSON object as it streams in, chunk by chunk.
+
+    `feed` returns the fields that became complete in that chunk:
+    ("complexity_score", {...}) once the score's value ends and
+    ("task", {...}) for each string closed inside the top-level `tasks`
+    array. Text outside the outermost object (e.g. markdown fences) is
+    skipped. The whole text is kept in `text` for `parse_breakdown`.
+    """
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._depth = 0
+        self._finished = False
+        self._in_string = False
+        self._escaped = False
+        self._literal: list[str] = []
+        self._scalar: list[str] = []
+        self._key: str | None = None
+        self._expect_key = False
+        self._in_tasks = False
+        self.complexity_score: int | None = None
+        self.tasks: list[str] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    @property
+    def emitted(self) -> bool:
+        return self.complexity_score is not None or bool(self.tasks)
+
+    def feed(self, chunk: str) -> list[tuple[str, dict]]:
+        self._chunks.append(chunk)
+        events = []
+        for ch in chunk:
+            if self._finished:
+                break
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if self._in_string:
+                self._literal.append(ch)
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._on_string(json.loads("".join(self._literal)), events)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._literal = [ch]
+            elif ch == ":" and self._depth == 1:
+                self._expect_key = False
+            elif ch == "," and self._depth == 1:
+                self._flush_scalar(events)
+                self._key = None
+                self._expect_key = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 2 and ch == "[" and self._key == "tasks":
+                    self._in_tasks = True
+            elif ch in "}]":
+                if self._depth == 1:
+                    self._flush_scalar(events)
+                self._depth -= 1
+                if self._depth == 1:
+                    self._in_tasks = False
+                elif self._depth == 0:
+                    self._finished = True
+            elif not ch.isspace() and self._depth == 1 and not self._expect_key:
+                self._scalar.append(ch)
+        return events
+
+    def _on_string(self, value: str, events: list):
+        if self._depth == 1 and self._expect_key:
+            self._key = value
+        elif self._depth == 1 and self._key == "complexity_score":
+            self._scalar = [value]
+        elif self._in_tasks and self._depth == 2:
+            self.tasks.append(value)
+            events.append(("task", {"step_number": len(self.tasks), "description": value}))
+
+    def _flush_scalar(self, events: list):
+        scalar, self._scalar = "".join(self._scalar), []
+        if self._key != "complexity_score" or not scalar or self.complexity_score is not None:
+            return
+        try:
+            score = int(float(scalar))
+        except ValueError:
+            return
+        self.complexity_score = max(1, min(10, score))
+        events.append(("complexity_score", {"complexity_score": self.complexity_score}))
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, select, update
+
+from ..config import get_settings
+from ..crud import insert_tasks
+from ..database import async_session
+from ..models import Goal
+from ..search import search_document
+from .ai_service import break_down_goal
+from .response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+FINISHED_STATUSES = (COMPLETED, FAILED)
+
+
+class JobRunner:
+    """Background workers that fill in the breakdown of goals created in job mode.
+
+    A job is a `Goal` row with status `pending`; its id doubles as the job id.
+    Workers claim a job by flipping it to `running` and stamping `claimed_at`,
+    call Gemini without holding a database connection (renewing `claimed_at`
+    every third of the lease meanwhile), then store the score and tasks and
+    mark it `completed` (or `failed` with the error) in one transaction.
+    """
+
+    def __init__(
+        self, session_factory=async_session, workers: int | None = None, lease_seconds: float | None = None
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.workers = settings.JOB_WORKERS if workers is None else workers
+        self.lease_seconds = settings.JOB_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        self._queue: asyncio.Queue[int] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._watchers: dict[int, asyncio.Event] = {}
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.recovered = 0
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self):
+        """Start the worker tasks on the running event loop (no-op if started)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; unfinished jobs stay in the database for `recover`."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+
+    def submit(self, goal_id: int):
+        """Queue a pending goal for breakdown."""
+        self.start()
+        self.submitted += 1
+        self._queue.put_nowait(goal_id)
+
+    async def recover(self) -> int:
+        """Re-queue jobs left unfinished by a previous run of the app.
+
+        Jobs marked `running` whose lease ran out lost their worker, so they
+        go back to `pending` before being queued again. Jobs with a fresh
+        lease belong to a live worker, possibly in another process, and are
+        left alone.
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Goal)
+                .where(Goal.status == RUNNING, or_(Goal.claimed_at.is_(None), Goal.claimed_at < stale_before))
+                .values(status=PENDING, claimed_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(select(Goal.id).where(Goal.status == PENDING).order_by(Goal.id))
+            goal_ids = result.scalars().all()
+            await db.commit()
+
+        for goal_id in goal_ids:
+            self.submit(goal_id)
+        self.recovered += len(goal_ids)
+        if goal_ids:
+            logger.info("Recovered %d unfinished breakdown jobs", len(goal_ids))
+        return len(goal_ids)
+
+    def watch(self, goal_id: int) -> asyncio.Event:
+        """Event set on the next status change of a job in this process."""
+        return self._watchers.setdefault(goal_id, asyncio.Event())
+
+    def _notify(self, goal_id: int):
+        event = self._watchers.pop(goal_id, None)
+        if event is not None:
+            event.set()
+
+    async def _work(self):
+        while True:
+            goal_id = await self._queue.get()
+            try:
+                await self._run(goal_id)
+            except Exception:
+                logger.exception("Breakdown job %d crashed", goal_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, goal_id: int):
+        # Claiming with a conditional UPDATE keeps two workers off the same job
+        async with self.session_factory() as db:
+            claimed = (await db.execute(
+                update(Goal)
+                .where(Goal.id == goal_id, Goal.status == PENDING)
+                .values(status=RUNNING, claimed_at=datetime.utcnow())
+                .returning(Goal.title, Goal.model)
+            )).first()
+            await db.commit()
+
+        if claimed is None:
+            return
+        response_cache.invalidate(goal_id)
+        self._notify(goal_id)
+
+        heartbeat = asyncio.create_task(self._renew_lease(goal_id))
+        try:
+            ai_result = await break_down_goal(claimed.title, model_name=claimed.model)
+        except Exception as e:
+            await self._finish(goal_id, status=FAILED, error=str(e))
+            self.failed += 1
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self._finish(
+            goal_id,
+            status=COMPLETED,
+            complexity_score=ai_result["complexity_score"],
+            tasks=ai_result["tasks"],
+            search_vector=search_document(claimed.title, ai_result["tasks"]),
+        )
+        self.completed += 1
+
+    async def _renew_lease(self, goal_id: int):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(Goal)
+                        .where(Goal.id == goal_id, Goal.status == RUNNING)
+                        .values(claimed_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+            except Exception:
+                # Try again next beat; the lease only runs out after three misses
+                logger.exception("Could not renew the lease of breakdown job %d", goal_id)
+
+    async def _finish(self, goal_id: int, tasks: list[str] | None = None, **values):
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(Goal)
+                .where(Goal.id == goal_id, Goal.status == RUNNING)
+                .values(claimed_at=None, **values)
+                .execution_options(synchronize_session=False)
+            )
+            # No row matches if the goal was deleted or rewritten while the job ran
+            if result.rowcount and tasks:
+                await insert_tasks(db, [(goal_id, tasks)])
+            await db.commit()
+        response_cache.invalidate(goal_id)
+        self._notify(goal_id)
+
+    def get_stats(self) -> dict:
+        """Worker count, queue length and job outcomes since startup."""
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "recovered": self.recovered,
+        }
+
+
+job_runner = JobRunner()
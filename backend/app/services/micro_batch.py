@@ -0,0 +1,103 @@
+import asyncio
+from dataclasses import dataclass
+
+from .admission import Priority
+
+
+@dataclass
+class BatchItem:
+    goal: str
+    priority: Priority
+    max_retries: int
+    future: asyncio.Future
+
+    def resolve(self, result: tuple[dict, str]):
+        # The caller may have gone away (and cancelled its future) meanwhile
+        if not self.future.done():
+            self.future.set_result(result)
+
+    def fail(self, error: BaseException):
+        if not self.future.done():
+            self.future.set_exception(error)
+
+
+class MicroBatcher:
+    """Collects breakdown requests per model for a short window and flushes them together.
+
+    A group is flushed when `max_size` requests are waiting or `window`
+    seconds after its first request, whichever comes first. `flush(key,
+    items)` must resolve every item with (breakdown, id of the model that
+    answered) or fail it; anything it leaves pending fails with the
+    exception it raised.
+    """
+
+    def __init__(self, flush, window: float, max_size: int, enabled: bool = True):
+        self._flush = flush
+        self.window = window
+        self.max_size = max_size
+        self.enabled = enabled
+        self._pending: dict[str, list[BatchItem]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._flushes: set[asyncio.Task] = set()
+        self.reset()
+
+    async def submit(self, key: str, goal: str, priority: Priority, max_retries: int) -> tuple[dict, str]:
+        loop = asyncio.get_running_loop()
+        item = BatchItem(goal, priority, max_retries, loop.create_future())
+        items = self._pending.setdefault(key, [])
+        items.append(item)
+
+        if len(items) >= self.max_size:
+            self._dispatch(key)
+        elif len(items) == 1:
+            self._timers[key] = loop.call_later(self.window, self._dispatch, key)
+        return await item.future
+
+    def _dispatch(self, key: str):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = [item for item in self._pending.pop(key, []) if not item.future.done()]
+        if not items:
+            return
+        task = asyncio.ensure_future(self._run(key, items))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, key: str, items: list[BatchItem]):
+        try:
+            await self._flush(key, items)
+        except BaseException as e:
+            for item in items:
+                item.fail(e)
+            if not isinstance(e, Exception):
+                raise
+
+    def record_batch(self, goals: int, answered: int):
+        """Count one multi-goal LLM call and how many of its goals it answered."""
+        self.batch_calls += 1
+        self.batched_goals += goals
+        self.answered_goals += answered
+
+    def get_stats(self) -> dict:
+        """Goals answered per LLM call and rate limit slots saved by batching."""
+        return {
+            "enabled": self.enabled,
+            "window_ms": round(self.window * 1000, 3),
+            "max_size": self.max_size,
+            "batch_calls": self.batch_calls,
+            "batched_goals": self.batched_goals,
+            "answered_goals": self.answered_goals,
+            "fallbacks": self.fallbacks,
+            "goals_per_call": round(self.answered_goals / self.batch_calls, 3) if self.batch_calls else 0.0,
+            # Each answered goal would otherwise have cost its own call
+            "quota_saved": max(0, self.answered_goals - self.batch_calls),
+            "pending": sum(len(items) for items in self._pending.values()),
+        }
+
+    def reset(self):
+        """Reset counters; pending requests are left alone."""
+        self.batch_calls = 0
+        self.batched_goals = 0
+        self.answered_goals = 0
+        self.fallbacks = 0
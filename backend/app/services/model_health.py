@@ -0,0 +1,221 @@
+import time
+
+from ..config import get_settings
+
+# Upper bounds (seconds) of the per-model latency histogram buckets
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60)
+
+# Below this many samples the configured default hedge delay is used
+HEDGE_MIN_SAMPLES = 20
+
+# Errors meaning the model itself is unavailable, which trip its breaker
+UNAVAILABLE_ERROR_KEYWORDS = ["503", "404", "unavailable", "overloaded", "not found"]
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram with percentile estimates."""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.reset()
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                return
+        self.overflow += 1
+
+    def percentile(self, q: float) -> float | None:
+        """Estimate the q-th percentile (0-100), interpolating inside the bucket."""
+        if not self.count:
+            return None
+        rank = self.count * q / 100
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.buckets[-1]
+
+    def get_stats(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[f"{bound:g}"] = cumulative
+        buckets["+Inf"] = self.count
+        return {"count": self.count, "sum": round(self.sum, 6), "buckets": buckets}
+
+    def reset(self):
+        self.counts = [0] * len(self.buckets)
+        self.overflow = 0
+        self.count = 0
+        self.sum = 0.0
+
+
+class CircuitBreaker:
+    """Stops sending requests to a model after repeated availability errors.
+
+    After `failure_threshold` consecutive failures the breaker opens for
+    `reset_seconds`; then requests are let through again (half-open) and the
+    first outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        if self.state == OPEN and self.clock() - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+        return self.state != OPEN
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.trips += 1
+            self.state = OPEN
+            self.opened_at = self.clock()
+
+
+def is_unavailable_error(error: Exception) -> bool:
+    error_str = str(error).lower()
+    return any(keyword in error_str for keyword in UNAVAILABLE_ERROR_KEYWORDS)
+
+
+class ModelHealth:
+    """Per-model latency and availability, used to pick models and hedge delays."""
+
+    def __init__(
+        self,
+        fallback_models: list[str] | None = None,
+        hedge_percentile: float | None = None,
+        default_hedge_delay: float | None = None,
+        failure_threshold: int | None = None,
+        reset_seconds: float | None = None,
+        clock=time.monotonic,
+    ):
+        settings = get_settings()
+        self.fallback_models = settings.GEMINI_FALLBACK_MODELS if fallback_models is None else fallback_models
+        self.hedge_percentile = settings.HEDGE_PERCENTILE if hedge_percentile is None else hedge_percentile
+        self.default_hedge_delay = (
+            settings.HEDGE_DEFAULT_DELAY_SECONDS if default_hedge_delay is None else default_hedge_delay
+        )
+        self.failure_threshold = settings.CIRCUIT_FAILURE_THRESHOLD if failure_threshold is None else failure_threshold
+        self.reset_seconds = settings.CIRCUIT_RESET_SECONDS if reset_seconds is None else reset_seconds
+        self.clock = clock
+        self.reset()
+
+    def histogram(self, model_id: str) -> LatencyHistogram:
+        if model_id not in self._histograms:
+            self._histograms[model_id] = LatencyHistogram()
+        return self._histograms[model_id]
+
+    def breaker(self, model_id: str) -> CircuitBreaker:
+        if model_id not in self._breakers:
+            self._breakers[model_id] = CircuitBreaker(self.failure_threshold, self.reset_seconds, self.clock)
+        return self._breakers[model_id]
+
+    def route(self, model_id: str, known_models=None, exclude=()) -> str:
+        """The requested model if its breaker allows it, else the first healthy fallback.
+
+        Models in `exclude` are skipped; with no alternative left the
+        requested model is returned anyway.
+        """
+        if model_id not in exclude and self.breaker(model_id).allow():
+            return model_id
+        fallback = self.fallback_for(model_id, known_models, exclude)
+        if fallback is None:
+            return model_id
+        self.rerouted += 1
+        return fallback
+
+    def fallback_for(self, model_id: str, known_models=None, exclude=()) -> str | None:
+        """The first fallback model other than `model_id` whose breaker allows a call."""
+        for candidate in self.fallback_models:
+            if candidate == model_id or candidate in exclude:
+                continue
+            if known_models is not None and candidate not in known_models:
+                continue
+            if self.breaker(candidate).allow():
+                return candidate
+        return None
+
+    def hedge_delay(self, model_id: str) -> float:
+        """How long to wait for `model_id` before hedging, from its latency percentile."""
+        histogram = self.histogram(model_id)
+        if histogram.count < HEDGE_MIN_SAMPLES:
+            return self.default_hedge_delay
+        return histogram.percentile(self.hedge_percentile)
+
+    def record_success(self, model_id: str, seconds: float):
+        self.histogram(model_id).observe(seconds)
+        self.breaker(model_id).record_success()
+
+    def record_failure(self, model_id: str, error: Exception):
+        if is_unavailable_error(error):
+            self.breaker(model_id).record_failure()
+
+    def record_response(self, model_id: str, valid: bool):
+        """Count a response from `model_id` and whether it parsed into a valid breakdown."""
+        self._responses[model_id] = self._responses.get(model_id, 0) + 1
+        if not valid:
+            self._invalid[model_id] = self._invalid.get(model_id, 0) + 1
+
+    def record_retry(self, model_id: str):
+        """Count a breakdown requested from `model_id` that needed another attempt."""
+        self._retries[model_id] = self._retries.get(model_id, 0) + 1
+
+    def get_stats(self) -> dict:
+        """Latency histograms, breaker states, response validity and hedging counters per model."""
+        model_ids = sorted(set(self._histograms) | set(self._breakers) | set(self._responses) | set(self._retries))
+        return {
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "rerouted": self.rerouted,
+            "models": {
+                model_id: {
+                    "latency_seconds": self.histogram(model_id).get_stats(),
+                    "hedge_delay_seconds": round(self.hedge_delay(model_id), 6),
+                    "circuit": self.breaker(model_id).state,
+                    "circuit_trips": self.breaker(model_id).trips,
+                    "responses": self._responses.get(model_id, 0),
+                    "invalid_responses": self._invalid.get(model_id, 0),
+                    "invalid_rate": (
+                        round(self._invalid.get(model_id, 0) / self._responses[model_id], 4)
+                        if self._responses.get(model_id) else 0.0
+                    ),
+                    "retries": self._retries.get(model_id, 0),
+                }
+                for model_id in model_ids
+            },
+        }
+
+    def reset(self):
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._responses: dict[str, int] = {}
+        self._invalid: dict[str, int] = {}
+        self._retries: dict[str, int] = {}
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.rerouted = 0
@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS = [
+    {"id": "gemini-2.0-flash", "name": "Gemini 2.0 Flash", "description": "Fast, latest stable"},
+    {"id": "gemini-2.5-flash", "name": "Gemini 2.5 Flash", "description": "Newest, experimental"},
+    {"id": "gemini-1.5-flash", "name": "Gemini 1.5 Flash", "description": "Previous gen, stable"},
+    {"id": "gemini-1.5-pro", "name": "Gemini 1.5 Pro", "description": "Higher quality, slower"},
+]
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# How often GEMINI_MODELS_FILE is checked for changes
+MODELS_FILE_CHECK_SECONDS = 5.0
+
+
+def import_sdk():
+    """Import the Gemini SDK, which takes most of the app's import time (gRPC, protobuf).
+
+    Deferred to the first breakdown (or `ModelRegistry.warm_up`) so workers
+    start serving without it.
+    """
+    import google.generativeai as genai
+
+    return genai
+
+
+class ModelRegistry:
+    """Gemini model clients built once and shared by every request.
+
+    `genai.configure` runs once, so the SDK keeps its transport (and the
+    connections behind it) instead of replacing it on every breakdown, and
+    each model id maps to one reusable GenerativeModel. Lookups are dict hits.
+    The SDK itself is only imported by `configure`.
+
+    With `api_endpoint` (e.g. a local stand-in used for load tests) the SDK
+    talks REST to that base URL instead of gRPC to Google.
+
+    The model list comes from `models_file` (a JSON list of
+    {"id", "name", "description"}) when given, and is reloaded when the file
+    changes; `reload` swaps it programmatically.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        api_endpoint: str | None = None,
+        models: list[dict] | None = None,
+        models_file: str | None = None,
+        model_factory=None,
+        clock=time.monotonic,
+    ):
+        self.api_key = api_key
+        self.api_endpoint = api_endpoint
+        self.models_file = models_file
+        self.model_factory = model_factory
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._configured = False
+        self._clients: dict = {}
+        self._file_mtime: float | None = None
+        self._next_file_check = 0.0
+        self.client_builds = 0
+        self.reloads = 0
+        self._set_models(models or DEFAULT_MODELS)
+
+    def _set_models(self, models: list[dict]):
+        if not models:
+            raise ValueError("At least one model must be configured")
+        self._models = [dict(m) for m in models]
+        self._by_id = {m["id"]: m for m in self._models}
+        self.default_model = DEFAULT_MODEL if DEFAULT_MODEL in self._by_id else self._models[0]["id"]
+
+    def configure(self):
+        """Configure the SDK once; later calls are no-ops."""
+        if self._configured:
+            return
+        with self._lock:
+            if not self._configured:
+                genai = import_sdk()
+                if self.model_factory is None:
+                    self.model_factory = genai.GenerativeModel
+                if self.api_endpoint:
+                    genai.configure(
+                        api_key=self.api_key, transport="rest", client_options={"api_endpoint": self.api_endpoint}
+                    )
+                else:
+                    genai.configure(api_key=self.api_key)
+                self._configured = True
+
+    def warm_up(self):
+        """Configure the SDK and build every model client ahead of the first request."""
+        self.configure()
+        from google.generativeai import client as genai_client
+
+        # Creates the shared transport now instead of on the first breakdown
+        genai_client.get_default_generative_client()
+        for model_id in list(self._by_id):
+            self.get(model_id)
+
+    @property
+    def model_ids(self):
+        """Ids of the configured models (supports O(1) `in` checks)."""
+        return self._by_id.keys()
+
+    def list_models(self) -> list[dict]:
+        self._check_models_file()
+        return self._models
+
+    def resolve(self, model_name: str | None) -> str:
+        """Map a requested model onto a supported model id."""
+        self._check_models_file()
+        return model_name if model_name in self._by_id else self.default_model
+
+    def get(self, model_name: str | None = None):
+        """Get the shared GenerativeModel for `model_name` (or the default model)."""
+        model_id = self.resolve(model_name)
+        model = self._clients.get(model_id)
+        if model is not None:
+            return model
+
+        self.configure()
+        with self._lock:
+            model = self._clients.get(model_id)
+            if model is None:
+                model = self.model_factory(model_id)
+                self._clients[model_id] = model
+                self.client_builds += 1
+        return model
+
+    def reload(self, models: list[dict] | None = None):
+        """Replace the model list, keeping the clients of models that are still listed."""
+        if models is None:
+            models = self._read_models_file()
+        with self._lock:
+            self._set_models(models)
+            self._clients = {
+                model_id: model for model_id, model in self._clients.items() if model_id in self._by_id
+            }
+            self.reloads += 1
+        logger.info("Loaded %d Gemini models", len(self._models))
+
+    def _read_models_file(self) -> list[dict]:
+        with open(self.models_file) as f:
+            return json.load(f)
+
+    def _check_models_file(self):
+        if not self.models_file:
+            return
+        now = self.clock()
+        if now < self._next_file_check:
+            return
+        self._next_file_check = now + MODELS_FILE_CHECK_SECONDS
+
+        try:
+            mtime = os.stat(self.models_file).st_mtime
+        except OSError:
+            logger.warning("Model list %s is not readable; keeping the current models", self.models_file)
+            return
+        if mtime == self._file_mtime:
+            return
+        self._file_mtime = mtime
+        try:
+            self.reload()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring invalid model list %s: %s", self.models_file, e)
+
+    def get_stats(self) -> dict:
+        """Configured models, built clients and reload count."""
+        return {
+            "models": list(self._by_id),
+            "default_model": self.default_model,
+            "clients": sorted(self._clients),
+            "client_builds": self.client_builds,
+            "reloads": self.reloads,
+            "models_file": self.models_file,
+            "api_endpoint": self.api_endpoint,
+        }
@@ -0,0 +1,317 @@
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..config import get_settings
+from ..database import async_session
+from ..models import RateLimitBucket
+
+MINUTE_BUCKET = "minute"
+# Holds a request count per quota day (the old "day" bucket held tokens)
+DAY_BUCKET = "day_count"
+
+# Gemini's per-day quotas reset at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+class RateLimitExceededError(Exception):
+    """Raised when rate limit is exceeded."""
+
+    def __init__(self, message: str = "", retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class Reservation:
+    """One request's worth of quota taken from every bucket."""
+    settled: bool = False
+    # Start of the quota day the request was counted in
+    day_start: float = 0.0
+
+
+def default_burst(max_per_minute: int) -> int:
+    return (max_per_minute + 1) // 2
+
+
+class TokenBucket:
+    """Bucket of up to `burst` tokens, refilling `limit - burst + 1` tokens per `period`.
+
+    Whatever is left in the bucket plus what refills before a window ends
+    never exceeds `limit`, so no `period`-long window admits more than
+    `limit` requests. (A bucket holding `limit` that also refilled `limit`
+    per period would admit almost twice that.) Refill is computed from the
+    elapsed time, so every check is O(1).
+    """
+
+    def __init__(self, limit: int, period: float, burst: int, tokens: float | None = None, updated_at: float = 0.0):
+        self.capacity = min(burst, limit)
+        self.rate = (limit - self.capacity + 1) / period
+        self.tokens = self.capacity if tokens is None else min(tokens, self.capacity)
+        self.updated_at = updated_at
+
+    def refill(self, now: float):
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def seconds_until_available(self) -> float:
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+def quota_day(now: float) -> tuple[float, float]:
+    """Start and end (epoch seconds) of the quota day containing `now`."""
+    today = datetime.fromtimestamp(now, QUOTA_TIMEZONE).date()
+    start = datetime.combine(today, dt_time(), QUOTA_TIMEZONE)
+    end = datetime.combine(today + timedelta(days=1), dt_time(), QUOTA_TIMEZONE)
+    return start.timestamp(), end.timestamp()
+
+
+class DayCounter:
+    """Requests counted per quota day; the count resets at each day boundary."""
+
+    def __init__(self, limit: int, count: float = 0, day_start: float = 0.0):
+        self.limit = limit
+        self.count = count
+        self.day_start = day_start
+        self.day_end = day_start
+
+    def roll(self, now: float):
+        start, self.day_end = quota_day(now)
+        if start != self.day_start:
+            self.day_start = start
+            self.count = 0
+
+
+def _take(minute: TokenBucket, day: DayCounter, now: float) -> Reservation:
+    """Take one token and count one request for the day, or raise without taking either."""
+    minute.refill(now)
+    day.roll(now)
+
+    if minute.tokens < 1:
+        wait_time = minute.seconds_until_available()
+        raise RateLimitExceededError(
+            f"Rate limit exceeded. Please wait {max(1, int(wait_time))} seconds.", retry_after=wait_time
+        )
+
+    if day.count >= day.limit:
+        raise RateLimitExceededError(
+            "Daily limit reached. Please try again tomorrow.", retry_after=day.day_end - now
+        )
+
+    minute.tokens -= 1
+    day.count += 1
+    return Reservation(day_start=day.day_start)
+
+
+def _give_back(minute: TokenBucket, day: DayCounter, reservation: Reservation):
+    minute.tokens = min(minute.capacity, minute.tokens + 1)
+    # A request from an earlier day no longer counts against today
+    if day.day_start == reservation.day_start:
+        day.count = max(0, day.count - 1)
+
+
+def _usage(minute: TokenBucket, day: DayCounter, max_per_minute: int) -> dict:
+    return {
+        # Quota of the rolling minute still in use: the burst not yet refilled
+        "requests_this_minute": round(minute.capacity - minute.tokens),
+        "requests_today": int(day.count),
+        "max_per_minute": max_per_minute,
+        "max_per_day": day.limit,
+    }
+
+
+class RateLimiter(ABC):
+    """Per-minute and per-day quota with reserve/commit/refund semantics.
+
+    `reserve` atomically takes quota before a Gemini call (raising
+    RateLimitExceededError when none is left); `commit` keeps it once the
+    call succeeded and `refund` returns it when the call failed.
+
+    At most `max_requests_per_minute` requests pass in any 60 seconds, up to
+    `burst` of them back to back. The daily count resets at midnight
+    Pacific time, when Gemini's daily quotas do.
+    """
+
+    backend = "abstract"
+
+    def __init__(self, max_requests_per_minute: int = 10, max_requests_per_day: int = 500, burst: int | None = None):
+        self.max_per_minute = max_requests_per_minute
+        self.max_per_day = max_requests_per_day
+        self.burst = min(burst or default_burst(max_requests_per_minute), max_requests_per_minute)
+
+    @abstractmethod
+    async def reserve(self) -> Reservation:
+        """Take quota for one request or raise RateLimitExceededError."""
+
+    async def commit(self, reservation: Reservation):
+        reservation.settled = True
+
+    async def refund(self, reservation: Reservation):
+        if reservation.settled:
+            return
+        reservation.settled = True
+        await self._give_back(reservation)
+
+    @abstractmethod
+    async def _give_back(self, reservation: Reservation):
+        """Return the quota taken by `reservation`."""
+
+    @abstractmethod
+    async def get_usage(self) -> dict:
+        """Quota in use and the configured limits."""
+
+    @abstractmethod
+    async def reset(self):
+        """Forget all usage."""
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """Quota tracked in this process only; each worker gets the full quota."""
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        max_requests_per_minute: int = 10,
+        max_requests_per_day: int = 500,
+        burst: int | None = None,
+        clock=time.time,
+    ):
+        super().__init__(max_requests_per_minute, max_requests_per_day, burst)
+        self.clock = clock
+        self.reset_buckets()
+
+    def reset_buckets(self):
+        self.minute = TokenBucket(self.max_per_minute, 60, self.burst, updated_at=self.clock())
+        self.day = DayCounter(self.max_per_day)
+
+    async def reserve(self) -> Reservation:
+        # No await between check and take, so concurrent coroutines cannot interleave
+        return _take(self.minute, self.day, self.clock())
+
+    async def _give_back(self, reservation: Reservation):
+        _give_back(self.minute, self.day, reservation)
+
+    async def get_usage(self) -> dict:
+        now = self.clock()
+        self.minute.refill(now)
+        self.day.roll(now)
+        return {**_usage(self.minute, self.day, self.max_per_minute), "backend": self.backend}
+
+    async def reset(self):
+        self.reset_buckets()
+
+
+class DatabaseRateLimiter(RateLimiter):
+    """Quota stored in the `rate_limit_buckets` table and shared by every worker.
+
+    The minute row holds the bucket's tokens and the day row the day's
+    request count (`tokens`) and the day's start (`updated_at`). Each
+    reservation locks both rows (SELECT ... FOR UPDATE), so
+    concurrent workers cannot overspend the cluster-wide quota.
+    """
+
+    backend = "database"
+
+    def __init__(
+        self,
+        max_requests_per_minute: int = 10,
+        max_requests_per_day: int = 500,
+        burst: int | None = None,
+        session_factory=async_session,
+        clock=time.time,
+    ):
+        super().__init__(max_requests_per_minute, max_requests_per_day, burst)
+        self.session_factory = session_factory
+        self.clock = clock
+
+    def _new_buckets(self, rows: dict[str, RateLimitBucket]) -> tuple[TokenBucket, DayCounter]:
+        minute_row, day_row = rows[MINUTE_BUCKET], rows[DAY_BUCKET]
+        return (
+            TokenBucket(self.max_per_minute, 60, self.burst, minute_row.tokens, minute_row.updated_at),
+            DayCounter(self.max_per_day, day_row.tokens, day_row.updated_at),
+        )
+
+    async def _ensure_rows(self, session):
+        dialect = session.bind.dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        now = self.clock()
+        await session.execute(
+            insert(RateLimitBucket)
+            .values([
+                {"name": MINUTE_BUCKET, "tokens": self.burst, "updated_at": now},
+                {"name": DAY_BUCKET, "tokens": 0, "updated_at": quota_day(now)[0]},
+            ])
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+
+    async def _locked_rows(self, session) -> dict[str, RateLimitBucket]:
+        result = await session.execute(
+            select(RateLimitBucket)
+            .where(RateLimitBucket.name.in_([DAY_BUCKET, MINUTE_BUCKET]))
+            .order_by(RateLimitBucket.name)
+            .with_for_update()
+        )
+        return {row.name: row for row in result.scalars()}
+
+    async def reserve(self) -> Reservation:
+        async with self.session_factory() as session:
+            async with session.begin():
+                await self._ensure_rows(session)
+                rows = await self._locked_rows(session)
+                minute, day = self._new_buckets(rows)
+                reservation = _take(minute, day, self.clock())
+                self._store(rows, minute, day)
+        return reservation
+
+    async def _give_back(self, reservation: Reservation):
+        async with self.session_factory() as session:
+            async with session.begin():
+                await self._ensure_rows(session)
+                rows = await self._locked_rows(session)
+                minute, day = self._new_buckets(rows)
+                now = self.clock()
+                minute.refill(now)
+                day.roll(now)
+                _give_back(minute, day, reservation)
+                self._store(rows, minute, day)
+
+    @staticmethod
+    def _store(rows: dict[str, RateLimitBucket], minute: TokenBucket, day: DayCounter):
+        rows[MINUTE_BUCKET].tokens = minute.tokens
+        rows[MINUTE_BUCKET].updated_at = minute.updated_at
+        rows[DAY_BUCKET].tokens = day.count
+        rows[DAY_BUCKET].updated_at = day.day_start
+
+    async def get_usage(self) -> dict:
+        async with self.session_factory() as session:
+            async with session.begin():
+                await self._ensure_rows(session)
+                result = await session.execute(select(RateLimitBucket))
+                minute, day = self._new_buckets({row.name: row for row in result.scalars()})
+        now = self.clock()
+        minute.refill(now)
+        day.roll(now)
+        return {**_usage(minute, day, self.max_per_minute), "backend": self.backend}
+
+    async def reset(self):
+        async with self.session_factory() as session:
+            await session.execute(delete(RateLimitBucket))
+            await session.commit()
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the limiter selected by RATE_LIMIT_BACKEND."""
+    settings = get_settings()
+    limiter_class = DatabaseRateLimiter if settings.RATE_LIMIT_BACKEND == "database" else InMemoryRateLimiter
+    return limiter_class(
+        max_requests_per_minute=settings.RATE_LIMIT_PER_MINUTE,
+        max_requests_per_day=settings.RATE_LIMIT_PER_DAY,
+        burst=settings.RATE_LIMIT_BURST or None,
+    )
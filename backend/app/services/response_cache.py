@@ -0,0 +1,130 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from ..config import get_settings
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body; equal bodies get equal tags in every process."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an `If-None-Match` header matches `etag` (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: dict[str, str] = field(default_factory=dict)
+    version: tuple = ()
+    expires_at: float = 0.0
+
+
+class ResponseCache:
+    """In-process cache of serialized goal reads, invalidated by version counters.
+
+    Every write path bumps the collection version, and the goal's own
+    version when a single goal changed. A read notes the version before
+    querying and the entry it stores is only served while that version is
+    current, so a write racing the read never leaves a stale entry behind.
+    Writes made by other processes are only seen once the TTL expires.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl_seconds: float | None = None,
+                 enabled: bool | None = None, clock=time.monotonic):
+        settings = get_settings()
+        self.max_entries = settings.RESPONSE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.ttl_seconds = settings.RESPONSE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.enabled = settings.RESPONSE_CACHE_ENABLED if enabled is None else enabled
+        self.clock = clock
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._goal_versions: dict[int, int] = {}
+        self._epoch = 0
+        self.collection_version = 0
+        self.reset()
+
+    def version(self, goal_id: int | None = None) -> tuple:
+        """Current version of the goal collection, or of one goal."""
+        if goal_id is None:
+            return (self._epoch, self.collection_version)
+        return (self._epoch, self._goal_versions.get(goal_id, 0))
+
+    def get(self, key: str, version: tuple) -> CachedResponse | None:
+        """The cached response for `key` if it was stored at `version` and has not expired."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version and entry.expires_at > self.clock():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, version: tuple, body: bytes, headers: dict[str, str] | None = None) -> CachedResponse:
+        """Cache a serialized body read at `version`; returns the entry (with its ETag) either way."""
+        entry = CachedResponse(body, make_etag(body), headers or {}, version, self.clock() + self.ttl_seconds)
+        if not self.enabled:
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self, *goal_ids: int):
+        """Record a write: the collection changed, and so did these goals."""
+        self.collection_version += 1
+        for goal_id in goal_ids:
+            self._goal_versions[goal_id] = self._goal_versions.get(goal_id, 0) + 1
+        self.invalidations += 1
+
+    def invalidate_all(self):
+        """Record a write that may have touched every goal."""
+        self._epoch += 1
+        self._goal_versions.clear()
+        self._entries.clear()
+        self.invalidations += 1
+
+    def reset(self):
+        """Drop every entry and reset counters."""
+        self._epoch += 1
+        self._goal_versions.clear()
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters, 304 responses served and invalidations."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# Shared by the goal routes and the breakdown job runner
+response_cache = ResponseCache()
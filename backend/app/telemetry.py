@@ -0,0 +1,294 @@
+import json
+import logging
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of every timing histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+SERVICE_NAME = "smart-goal-breaker"
+
+# Traces waiting for the export thread; more are dropped rather than held in memory
+MAX_QUEUED_TRACES = 10_000
+
+
+class Histogram:
+    """Prometheus histogram with one series per label combination."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...], buckets: tuple = DURATION_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts, then sum and count
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for labels, values in series:
+            pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)]
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_labels(pairs + [le])} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(pairs + [le])} {values[-1]}")
+            label_text = _labels(pairs) if pairs else ""
+            lines.append(f"{self.name}_sum{label_text} {values[-2]}")
+            lines.append(f"{self.name}_count{label_text} {values[-1]}")
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+
+def _labels(pairs: list[str]) -> str:
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Histograms plus gauges read from callbacks at scrape time."""
+
+    def __init__(self):
+        self._histograms: list[Histogram] = []
+        self._gauges: list[tuple[str, str, object]] = []
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...]) -> Histogram:
+        histogram = Histogram(name, help, labelnames)
+        self._histograms.append(histogram)
+        return histogram
+
+    def gauge(self, name: str, help: str, callback):
+        """Expose `callback()` as a gauge; it must be cheap and non-blocking."""
+        self._gauges.append((name, help, callback))
+
+    def render(self) -> str:
+        lines = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for name, help, callback in self._gauges:
+            try:
+                value = callback()
+            except Exception:
+                logger.exception("Metric %s failed", name)
+                continue
+            lines.extend([f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value}"])
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for histogram in self._histograms:
+            histogram.reset()
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "Time to the start of the response, per route.", ("method", "route", "status")
+)
+SPAN_DURATION = metrics.histogram(
+    "span_duration_seconds", "Time spent in instrumented steps of a request.", ("span",)
+)
+LLM_CALL_DURATION = metrics.histogram(
+    "llm_call_duration_seconds", "Gemini call latency per model and outcome (ok, invalid response, error).", ("model", "outcome")
+)
+DB_STATEMENT_DURATION = metrics.histogram(
+    "db_statement_duration_seconds", "Database statement latency per statement type.", ("operation",)
+)
+
+
+class Trace:
+    """Spans collected for one request."""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[dict] = []
+
+
+_trace: ContextVar[Trace | None] = ContextVar("trace", default=None)
+_span_id: ContextVar[str | None] = ContextVar("span_id", default=None)
+
+
+def _record_span(trace: Trace, span_id: str, parent_id: str | None, name: str,
+                 start_ns: int, end_ns: int, attributes: dict, error: bool):
+    trace.spans.append({
+        "traceId": trace.trace_id,
+        "spanId": span_id,
+        "parentSpanId": parent_id or "",
+        "name": name,
+        "kind": 1,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": [
+            {"key": key, "value": _attribute_value(value)} for key, value in attributes.items()
+        ],
+        "status": {"code": 2 if error else 1},
+    })
+
+
+def _attribute_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block into `span_duration_seconds{span=...}`.
+
+    Inside a traced request the block is also recorded as a child span.
+    Yields the attribute dict so callers can add to it.
+    """
+    trace = _trace.get()
+    parent_id = _span_id.get()
+    span_id = secrets.token_hex(8)
+    token = _span_id.set(span_id) if trace is not None else None
+    start_ns = time.time_ns()
+    start = time.perf_counter()
+    error = False
+    try:
+        yield attributes
+    except BaseException:
+        error = True
+        raise
+    finally:
+        SPAN_DURATION.observe((name,), time.perf_counter() - start)
+        if trace is not None:
+            _span_id.reset(token)
+            _record_span(trace, span_id, parent_id, name, start_ns, time.time_ns(), attributes, error)
+
+
+class TraceExporter:
+    """Appends finished traces to a file, one OTLP/JSON line per request.
+
+    This is the format written by the OpenTelemetry Collector file exporter,
+    so the file can be replayed into any OTLP-compatible backend. `export`
+    only queues the trace; a background thread encodes and writes whatever
+    has queued up, so requests never wait on the file.
+    """
+
+    def __init__(self, path: str, max_queued: int = MAX_QUEUED_TRACES):
+        self.path = path
+        self._queue: queue.Queue[Trace] = queue.Queue(max_queued)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+
+    def export(self, trace: Trace):
+        self._start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Block until every queued trace has been written."""
+        self._queue.join()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_batches, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _write_batches(self):
+        while True:
+            traces = [self._queue.get()]
+            while True:
+                try:
+                    traces.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                lines = "".join(_encode_trace(trace) + "\n" for trace in traces)
+                with open(self.path, "a") as f:
+                    f.write(lines)
+            except Exception:
+                logger.exception("Could not export %d traces to %s", len(traces), self.path)
+            finally:
+                for _ in traces:
+                    self._queue.task_done()
+
+
+def _encode_trace(trace: Trace) -> str:
+    return json.dumps({
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": trace.spans}],
+        }]
+    })
+
+
+@contextmanager
+def traced(name: str, exporter: TraceExporter | None, **attributes):
+    """Root span of a request; the trace is exported when the block ends."""
+    if exporter is None:
+        with span(name, **attributes) as attrs:
+            yield attrs
+        return
+
+    trace = Trace()
+    token = _trace.set(trace)
+    try:
+        with span(name, **attributes) as attrs:
+            yield attrs
+    finally:
+        _trace.reset(token)
+        exporter.export(trace)
+
+
+def instrument_engine(target: AsyncEngine):
+    """Time every statement on `target` and record it as a `db.<operation>` span."""
+
+    @event.listens_for(target.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._telemetry_start = (time.perf_counter(), time.time_ns())
+
+    @event.listens_for(target.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_telemetry_start", None)
+        if started is None:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        DB_STATEMENT_DURATION.observe((operation,), time.perf_counter() - started[0])
+
+        trace = _trace.get()
+        if trace is not None:
+            _record_span(
+                trace, secrets.token_hex(8), _span_id.get(), f"db.{operation.lower()}",
+                started[1], time.time_ns(), {"db.statement": statement[:1000], "db.executemany": executemany},
+                error=False,
+            )
@@ -0,0 +1,31 @@
+"""Shared handling of the database the benchmarks seed.
+
+Seeding drops every table in DATABASE_URL, which is the development
+database unless overridden, so it only happens with --drop-existing.
+"""
+import argparse
+
+from app.database import Base, engine
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the goals already in DATABASE_URL")
+    parser.add_argument(
+        "--drop-existing", action="store_true", help="allow seeding to drop every table in DATABASE_URL"
+    )
+
+
+def confirm_drop(
+    parser: argparse.ArgumentParser, skipped: bool, drop_existing: bool,
+    action: str = "seeding", skip_option: str = "--skip-seed",
+):
+    """Exit with a usage error unless `action` is skipped or --drop-existing was given."""
+    if not skipped and not drop_existing:
+        url = engine.url.render_as_string(hide_password=True)
+        parser.error(f"{action} drops existing tables in {url}; pass --drop-existing to confirm, or {skip_option}")
+
+
+async def recreate_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,105 @@
+"""Compare peak memory of materializing every goal vs. the streaming export.
+
+Seeds DATABASE_URL with synthetic goals (5 tasks each), dropping its tables
+(so --drop-existing is required), unless --skip-seed is given, then measures Python heap peaks with tracemalloc for:
+
+* list: loading every Goal with selectinload(Goal.tasks) and validating a
+  List[GoalResponse], i.e. what GET /api/goals/ did before pagination
+* export: draining the generator behind GET /api/goals/export?format=ndjson
+  (driven directly, since httpx's ASGI transport buffers whole bodies)
+
+Usage (from backend/):
+    python -m benchmarks.export_memory --goals 1000000 --drop-existing
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from app.database import engine, async_session
+from app.models import Goal, Task
+from app.routes.goals import _export_ndjson
+from app.schemas import GoalResponse
+from benchmarks.database import add_seed_arguments, confirm_drop, recreate_tables
+
+SEED_BATCH = 10_000
+
+
+async def seed(goals: int):
+    await recreate_tables()
+
+    start = datetime(2024, 1, 1)
+    async with async_session() as db:
+        for offset in range(0, goals, SEED_BATCH):
+            count = min(SEED_BATCH, goals - offset)
+            result = await db.execute(
+                insert(Goal).returning(Goal.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "title": f"Benchmark goal {offset + i}",
+                        "complexity_score": (offset + i) % 10 + 1,
+                        "created_at": start + timedelta(seconds=offset + i),
+                    }
+                    for i in range(count)
+                ],
+            )
+            goal_ids = result.scalars().all()
+            await db.execute(
+                insert(Task),
+                [
+                    {"goal_id": goal_id, "description": f"Step {step} of goal {goal_id}", "step_number": step}
+                    for goal_id in goal_ids
+                    for step in range(1, 6)
+                ],
+            )
+            await db.commit()
+
+
+async def measure_list() -> int:
+    async with async_session() as db:
+        result = await db.execute(
+            select(Goal).options(selectinload(Goal.tasks)).order_by(Goal.created_at.desc())
+        )
+        goals = [GoalResponse.model_validate(goal) for goal in result.scalars().all()]
+        return len(goals)
+
+
+async def measure_export() -> int:
+    lines = 0
+    async with async_session() as db:
+        async for chunk in _export_ndjson(db, since=None):
+            lines += chunk.count("\n")
+    return lines
+
+
+async def run(label: str, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = await func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>6}: {count} goals in {elapsed:.2f}s, peak {peak / 1024 / 1024:.1f} MiB")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--goals", type=int, default=1_000_000)
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+    confirm_drop(parser, args.skip_seed, args.drop_existing)
+
+    if not args.skip_seed:
+        await seed(args.goals)
+
+    await run("list", measure_list)
+    await run("export", measure_export)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""Local stand-in for the Gemini REST API, for load tests without an API key.
+
+Answers `generateContent` and `streamGenerateContent` for any model with a
+breakdown shaped like the prompt asks for (one object, or an array for
+multi-goal prompts), after a lognormal delay. A share of calls fails with
+503 UNAVAILABLE or 429 RESOURCE_EXHAUSTED, and a share returns malformed
+JSON. GET /stats reports what was served.
+
+Point the app at it with GEMINI_API_ENDPOINT=http://127.0.0.1:<port>
+(the SDK then uses its REST transport instead of gRPC).
+
+Usage (from backend/):
+    python -m benchmarks.fake_gemini --port 8090 --latency-ms 800 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Streamed responses are split into this many chunks
+STREAM_CHUNKS = 6
+
+# Numbered goal lines of a multi-goal prompt: `    1. "Learn Go"`
+BATCH_GOAL = re.compile(r'^\s*(\d+)\. "', re.MULTILINE)
+
+ERRORS = {
+    503: {"code": 503, "message": "The model is overloaded. Please try again later.", "status": "UNAVAILABLE"},
+    429: {"code": 429, "message": "Resource has been exhausted (e.g. check quota).", "status": "RESOURCE_EXHAUSTED"},
+}
+
+
+def breakdown(rng: random.Random, goal: int | None = None) -> dict:
+    result = {
+        "complexity_score": rng.randint(1, 10),
+        "tasks": [f"Step {step}: {rng.choice(['plan', 'practice', 'review', 'measure', 'share'])} the next part"
+                  for step in range(1, 6)],
+    }
+    return result if goal is None else {"goal": goal, **result}
+
+
+def candidate(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}]}
+
+
+def create_app(
+    latency_ms: float = 500,
+    latency_sigma: float = 0.5,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    malformed_rate: float = 0.0,
+    seed: int = 0,
+) -> FastAPI:
+    """Fake Gemini app; delays are lognormal with median `latency_ms`."""
+    app = FastAPI()
+    rng = random.Random(seed)
+    stats = {"requests": 0, "streamed": 0, "errors": 0, "rate_limited": 0, "malformed": 0, "goals": 0}
+
+    def delay() -> float:
+        if latency_ms <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(latency_ms / 1000), latency_sigma)
+
+    def answer(prompt: str) -> str:
+        goals = [int(n) for n in BATCH_GOAL.findall(prompt)]
+        stats["goals"] += len(goals) or 1
+        text = json.dumps([breakdown(rng, n) for n in goals] if goals else breakdown(rng))
+        if rng.random() < malformed_rate:
+            stats["malformed"] += 1
+            # Cut off mid-answer, after some chatter: not repairable
+            return "Sure! Here is the breakdown:\n" + text[: len(text) // 2]
+        return text
+
+    @app.post("/v1beta/models/{model_method}")
+    async def generate(model_method: str, request: Request):
+        _, _, method = model_method.partition(":")
+        body = await request.json()
+        prompt = "".join(part.get("text", "") for content in body.get("contents", []) for part in content["parts"])
+        stats["requests"] += 1
+        wait = delay()
+
+        roll = rng.random()
+        if roll < error_rate + rate_limit_rate:
+            status = 503 if roll < error_rate else 429
+            stats["errors" if status == 503 else "rate_limited"] += 1
+            await asyncio.sleep(wait / 4)
+            return JSONResponse(status_code=status, content={"error": ERRORS[status]})
+
+        text = answer(prompt)
+        if method != "streamGenerateContent":
+            await asyncio.sleep(wait)
+            return candidate(text)
+
+        stats["streamed"] += 1
+        size = math.ceil(len(text) / STREAM_CHUNKS)
+
+        async def chunks():
+            # The REST transport reads a JSON array of responses as it arrives
+            for i in range(0, len(text), size):
+                await asyncio.sleep(wait / STREAM_CHUNKS)
+                yield ("[" if i == 0 else ",") + json.dumps(candidate(text[i:i + size]))
+            yield "]"
+
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=500, help="median Gemini latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="spread of the lognormal latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls failing with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of calls failing with 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of answers that are not valid JSON")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Load test every goal route against a local Gemini stand-in.
+
+Seeds DATABASE_URL with searchable synthetic goals (5 tasks each), dropping
+its tables (so --drop-existing is required), unless --skip-seed is given.
+Then starts `benchmarks.fake_gemini` and the app (uvicorn) as subprocesses
+and drives each route of app/routes/goals.py in turn with --concurrency
+clients. Breakdowns go to the fake, with its latency, error
+and malformed-JSON settings; the app gets rate limits high enough that
+quota never throttles the run.
+
+The JSON report has, per scenario: throughput, p50/p95/p99 latency, status
+codes, and the DB statements (by type) and Gemini calls (by model and
+outcome) the app recorded in /metrics while it ran. Reports from two
+releases can be diffed as they are, or compared with --baseline.
+
+Usage (from backend/):
+    python -m benchmarks.load_suite --concurrency 16 --requests 200 --drop-existing --output load.json
+    python -m benchmarks.load_suite --drop-existing --baseline load.json --output load-new.json
+"""
+import os
+
+# The app only talks to the fake, so any key will do
+os.environ.setdefault("GEMINI_API_KEY", "load-suite")
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import select
+
+from app.database import engine, async_session
+from app.models import Goal
+from benchmarks import fake_gemini
+from benchmarks.database import add_seed_arguments, confirm_drop
+from benchmarks.search_latency import TOPICS, phrase, seed
+
+# Overrides for the app process, unless already set in the environment
+APP_ENV = {
+    "RATE_LIMIT_BACKEND": "memory",
+    "RATE_LIMIT_PER_MINUTE": "1000000000",
+    "RATE_LIMIT_PER_DAY": "1000000000",
+    "ADMISSION_QUEUE_MAX_DEPTH": "100000",
+    # The seed creates tables from the models, without Alembic
+    "DB_CREATE_SCHEMA": "true",
+}
+STARTUP_TIMEOUT_SECONDS = 60
+
+# Arguments passed through to benchmarks.fake_gemini
+FAKE_GEMINI_OPTIONS = ("latency_ms", "latency_sigma", "error_rate", "rate_limit_rate", "malformed_rate", "seed")
+
+COUNT_LINE = re.compile(r"^(db_statement_duration_seconds|llm_call_duration_seconds)_count\{(.*)\} (\S+)$", re.MULTILINE)
+LABEL = re.compile(r'\w+="((?:[^"\\]|\\.)*)"')
+
+STATUS_ROUTES = [
+    "/api/goals/models",
+    "/api/goals/jobs/stats",
+    "/api/goals/rate-limit/status",
+    "/api/goals/executor/status",
+    "/api/goals/cache/stats",
+    "/api/goals/response-cache/stats",
+    "/api/goals/coalescing/stats",
+    "/api/goals/models/registry",
+    "/api/goals/models/health",
+    "/api/goals/batching/stats",
+    "/api/goals/queue/status",
+]
+
+
+class Workload:
+    """What the scenarios share: seeded ids, the jobs created so far and unique titles."""
+
+    def __init__(self, goal_ids: list[int], rng: random.Random):
+        self.goal_ids = goal_ids
+        self.rng = rng
+        self.job_ids: list[int] = []
+        self._titles = 0
+
+    def title(self) -> str:
+        # Unique, so the breakdown cache never answers for Gemini
+        self._titles += 1
+        return f"{phrase(self.rng)} #{self._titles}"
+
+    def goal_id(self) -> int:
+        return self.rng.choice(self.goal_ids)
+
+    def take_goal_id(self) -> int:
+        return self.goal_ids.pop()
+
+
+def scenarios(requests: int) -> list[tuple[str, int, object]]:
+    """(name, request count, coroutine making one request) for every route, in run order."""
+
+    async def read_body(client, method, url, **kwargs) -> int:
+        # Streams are only done once the last byte arrives
+        async with client.stream(method, url, **kwargs) as response:
+            await response.aread()
+        return response.status_code
+
+    async def create_async(client, work):
+        response = await client.post("/api/goals/", params={"mode": "async"}, json={"title": work.title()})
+        if response.status_code == 202:
+            work.job_ids.append(response.json()["job_id"])
+        return response.status_code
+
+    plan = [
+        ("list", requests, lambda c, w: c.get("/api/goals/", params={"limit": 50})),
+        ("list_summary", requests, lambda c, w: c.get("/api/goals/", params={"limit": 50, "view": "summary"})),
+        ("get", requests, lambda c, w: c.get(f"/api/goals/{w.goal_id()}")),
+        ("search", requests, lambda c, w: c.get("/api/goals/search", params={"q": w.rng.choice(TOPICS)})),
+        ("export", max(1, requests // 20), lambda c, w: read_body(c, "GET", "/api/goals/export")),
+        ("create", requests, lambda c, w: c.post("/api/goals/", json={"title": w.title()})),
+        ("create_stream", requests, lambda c, w: read_body(c, "POST", "/api/goals/stream", json={"title": w.title()})),
+        ("create_batch", max(1, requests // 5),
+         lambda c, w: c.post("/api/goals/batch", json={"titles": [w.title() for _ in range(5)]})),
+        ("create_async", requests, create_async),
+        ("job", requests, lambda c, w: c.get(f"/api/goals/jobs/{w.rng.choice(w.job_ids)}")),
+        ("job_events", requests, lambda c, w: read_body(c, "GET", f"/api/goals/jobs/{w.job_ids.pop()}/events")),
+        ("update", requests, lambda c, w: c.put(f"/api/goals/{w.goal_id()}", json={"title": w.title()})),
+        ("delete", requests, lambda c, w: c.delete(f"/api/goals/{w.take_goal_id()}")),
+    ]
+    for route in STATUS_ROUTES:
+        plan.append((route.removeprefix("/api/goals/").replace("/", "_").replace("-", "_"), requests,
+                     lambda c, w, route=route: c.get(route)))
+    # Empties the table, so it goes last
+    plan.append(("delete_all", 1, lambda c, w: c.delete("/api/goals/", params={"chunk_size": 10_000})))
+    return plan
+
+
+async def scrape(client: httpx.AsyncClient) -> Counter:
+    """DB statement and Gemini call counts from the app's /metrics."""
+    counts = Counter()
+    for name, labels, value in COUNT_LINE.findall((await client.get("/metrics")).text):
+        prefix = "db" if name.startswith("db_") else "gemini"
+        counts[(prefix, "/".join(LABEL.findall(labels)))] += float(value)
+    return counts
+
+
+async def settle(client: httpx.AsyncClient):
+    """Wait until background jobs are done, so their work counts towards the scenario that queued them."""
+    while True:
+        stats = (await client.get("/api/goals/jobs/stats")).json()
+        if stats["completed"] + stats["failed"] >= stats["submitted"]:
+            return
+        await asyncio.sleep(0.1)
+
+
+def percentile(latencies: list[float], p: int) -> float:
+    if len(latencies) == 1:
+        return latencies[0]
+    return statistics.quantiles(latencies, n=100, method="inclusive")[p - 1]
+
+
+async def run_scenario(client, work, name, count, request, concurrency) -> dict:
+    latencies = []
+    statuses = Counter()
+    remaining = iter(range(count))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                result = await request(client, work)
+                statuses[str(result if isinstance(result, int) else result.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    before = await scrape(client)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+    elapsed = time.perf_counter() - start
+    await settle(client)
+    delta = await scrape(client) - before
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    db = {key: int(value) for (prefix, key), value in sorted(delta.items()) if prefix == "db"}
+    return {
+        "requests": count,
+        "status_codes": dict(sorted(statuses.items())),
+        "throughput_rps": round(count / elapsed, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies_ms, 50), 2),
+            "p95": round(percentile(latencies_ms, 95), 2),
+            "p99": round(percentile(latencies_ms, 99), 2),
+            "max": round(latencies_ms[-1], 2),
+        },
+        "db_statements": {"total": sum(db.values()), "per_request": round(sum(db.values()) / count, 2), **db},
+        "gemini_calls": {key: int(value) for (prefix, key), value in sorted(delta.items()) if prefix == "gemini"},
+    }
+
+
+async def wait_until_up(client: httpx.AsyncClient, url: str, process: subprocess.Popen):
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with {process.returncode}")
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url} did not answer within {STARTUP_TIMEOUT_SECONDS}s")
+        await asyncio.sleep(0.2)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict):
+    print(f"\n{'scenario':<24}{'rps':>10}{'was':>10}{'p95 ms':>10}{'was':>10}{'stmts/req':>11}{'was':>8}")
+    for name, result in report["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        print(f"{name:<24}{result['throughput_rps']:>10}{old['throughput_rps']:>10}"
+              f"{result['latency_ms']['p95']:>10}{old['latency_ms']['p95']:>10}"
+              f"{result['db_statements']['per_request']:>11}{old['db_statements']['per_request']:>8}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--goals", type=int, default=10_000, help="goals to seed")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", nargs="*", help="run just these scenarios")
+    add_seed_arguments(parser)
+    parser.add_argument("--output", default="load-report.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    fake_gemini.add_arguments(parser)
+    args = parser.parse_args()
+    confirm_drop(parser, args.skip_seed, args.drop_existing)
+
+    plan = [s for s in scenarios(args.requests) if not args.only or s[0] in args.only]
+    # Every delete request consumes a seeded goal
+    needed = sum(count for name, count, _ in plan if name == "delete")
+    if not args.skip_seed:
+        await seed(max(args.goals, needed), random.Random(args.seed))
+    async with async_session() as db:
+        goal_ids = list((await db.execute(select(Goal.id).order_by(Goal.id))).scalars())
+    await engine.dispose()
+    if len(goal_ids) < max(needed, 1):
+        parser.error(f"DATABASE_URL holds {len(goal_ids)} goals, {max(needed, 1)} needed; run without --skip-seed")
+
+    gemini_port, app_port = free_port(), free_port()
+    fake_options = {option: getattr(args, option) for option in FAKE_GEMINI_OPTIONS}
+    fake_args = [f"--{option.replace('_', '-')}={value}" for option, value in fake_options.items()]
+    env = {**APP_ENV, **os.environ, "GEMINI_API_ENDPOINT": f"http://127.0.0.1:{gemini_port}"}
+    processes = [
+        subprocess.Popen([sys.executable, "-m", "benchmarks.fake_gemini", f"--port={gemini_port}", *fake_args]),
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(app_port), "--log-level", "warning"],
+            env=env,
+        ),
+    ]
+    limits = httpx.Limits(max_connections=args.concurrency + 2)
+    report = {
+        "revision": revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "database": engine.url.get_backend_name(),
+            "goals": len(goal_ids),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "fake_gemini": fake_options,
+        },
+        "scenarios": {},
+    }
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{app_port}", timeout=300, limits=limits) as client:
+            await wait_until_up(client, f"http://127.0.0.1:{gemini_port}/stats", processes[0])
+            await wait_until_up(client, "/health", processes[1])
+            # The app imports the Gemini SDK after it is ready; keep that out of the first scenario
+            while not (await client.get("/api/goals/models/registry")).json()["clients"]:
+                await asyncio.sleep(0.1)
+
+            work = Workload(goal_ids, random.Random(args.seed))
+            for name, count, request in plan:
+                if name in ("job", "job_events") and not work.job_ids:
+                    continue
+                if name == "job_events":
+                    count = min(count, len(work.job_ids))
+                result = await run_scenario(client, work, name, count, request, args.concurrency)
+                report["scenarios"][name] = result
+                print(f"{name:<24}{result['throughput_rps']:>9} req/s  p50 {result['latency_ms']['p50']:>8} ms  "
+                      f"p95 {result['latency_ms']['p95']:>8} ms  {result['db_statements']['per_request']:>6} stmts/req  "
+                      f"{result['status_codes']}")
+            report["fake_gemini_stats"] = (await client.get(f"http://127.0.0.1:{gemini_port}/stats")).json()
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""Per-call overhead of getting a Gemini model client, before and after the registry.
+
+* rebuild: what `get_model` did on every breakdown before, i.e.
+  `genai.configure`, a linear scan of the model list and a new
+  `GenerativeModel` (whose SDK client is then created again on first use)
+* registry: `ModelRegistry.get`, a dict lookup returning the shared client
+
+No network calls are made; only client construction is measured.
+
+Usage (from backend/):
+    python -m benchmarks.model_lookup --calls 10000
+"""
+import argparse
+import time
+
+import google.generativeai as genai
+from google.generativeai import client as genai_client
+
+from app.services.model_registry import DEFAULT_MODELS, DEFAULT_MODEL, ModelRegistry
+
+API_KEY = "benchmark-key"
+
+
+def rebuild(model_name: str):
+    genai.configure(api_key=API_KEY)
+    valid_ids = [m["id"] for m in DEFAULT_MODELS]
+    model = genai.GenerativeModel(model_name if model_name in valid_ids else DEFAULT_MODEL)
+    # The SDK client (and its transport) is built lazily on the first call
+    genai_client.get_default_generative_client()
+    return model
+
+
+def run(label: str, func, calls: int):
+    model_ids = [m["id"] for m in DEFAULT_MODELS]
+    start = time.perf_counter()
+    for i in range(calls):
+        func(model_ids[i % len(model_ids)])
+    elapsed = time.perf_counter() - start
+    print(f"{label:>8}: {elapsed / calls * 1e6:9.2f} µs per call ({calls} calls)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=10_000)
+    args = parser.parse_args()
+
+    registry = ModelRegistry(api_key=API_KEY)
+    registry.warm_up()
+
+    run("rebuild", rebuild, args.calls)
+    run("registry", registry.get, args.calls)
+
+
+if __name__ == "__main__":
+    main()
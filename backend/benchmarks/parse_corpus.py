@@ -0,0 +1,127 @@
+"""Throughput and re-generation rate of the breakdown parser, before and after.
+
+* legacy: the previous parser, which only stripped a leading markdown fence
+  before `json.loads` and rejected anything but exactly five tasks
+* current: `parse_breakdown`, which finds the JSON in one pass, repairs
+  trailing commas and one-off task counts, and uses orjson when installed
+
+The corpus mimics what Gemini actually sends back: mostly clean JSON, some
+fenced or chatty answers and a few near misses. Every rejected response
+would cost another Gemini call, so the rejection rate is the share of
+calls spent on re-generation.
+
+Usage (from backend/):
+    python -m benchmarks.parse_corpus --responses 20000 --rounds 5
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from app.serialization import orjson
+from app.services.breakdown_parser import parse_breakdown
+
+TASKS = [
+    "Research beginner resources and pick one structured course",
+    "Set up the development environment and run a hello world",
+    "Complete the first three modules, taking notes on {key} ideas",
+    "Build a small project that uses what you have learned",
+    "Share the project, collect feedback and plan the next goal",
+]
+
+# (weight, shape) of responses in the corpus
+SHAPES = [
+    (60, "clean"),
+    (15, "fenced"),
+    (10, "chatty"),
+    (5, "trailing_comma"),
+    (4, "six_tasks"),
+    (3, "four_tasks"),
+    (3, "score_string"),
+]
+
+
+def make_response(shape: str, rng: random.Random) -> str:
+    tasks = list(TASKS)
+    score = rng.randint(1, 10)
+    if shape == "six_tasks":
+        tasks.append("Celebrate the milestone")
+    elif shape == "four_tasks":
+        tasks[0:2] = [f"{TASKS[0]} and then {TASKS[1][:1].lower()}{TASKS[1][1:]}"]
+    body = json.dumps({"complexity_score": f"{score}/10" if shape == "score_string" else score, "tasks": tasks}, indent=2)
+
+    if shape == "fenced":
+        return f"```json\n{body}\n```"
+    if shape == "chatty":
+        return f"Here is a plan for your goal:\n\n{body}\n\nGood luck with it!"
+    if shape == "trailing_comma":
+        return body.replace('"\n  ]', '",\n  ]')
+    return body
+
+
+def legacy_parse(text: str) -> dict:
+    text = text.strip()
+    if text.startswith("```"):
+        text = re.sub(r"```json?\n?", "", text)
+        text = re.sub(r"```\n?", "", text)
+        text = text.strip()
+    result = json.loads(text)
+    if not isinstance(result, dict) or "complexity_score" not in result or "tasks" not in result:
+        raise ValueError("Invalid AI response structure")
+    if len(result["tasks"]) != 5:
+        raise ValueError("AI must return exactly 5 tasks")
+    result["complexity_score"] = max(1, min(10, int(result["complexity_score"])))
+    return result
+
+
+def run(label: str, parse, corpus: list[str], rounds: int):
+    rejected = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in corpus:
+            try:
+                parse(text)
+            except ValueError:
+                rejected += 1
+    elapsed = time.perf_counter() - start
+    total = len(corpus) * rounds
+    print(
+        f"{label:>8}: {total / elapsed:10,.0f} responses/s, "
+        f"{elapsed / total * 1e6:6.2f} µs each, re-generation rate {rejected / total:6.2%}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    weights, shapes = zip(*SHAPES)
+    corpus = [make_response(shape, rng) for shape in rng.choices(shapes, weights, k=args.responses)]
+
+    # Responses both parsers accept, for a like-for-like throughput comparison
+    well_formed = [text for text in corpus if _accepts(legacy_parse, text)]
+
+    print(f"JSON backend: {'orjson' if orjson is not None else 'json'}")
+    print(f"Full corpus ({len(corpus)} responses):")
+    run("legacy", legacy_parse, corpus, args.rounds)
+    run("current", parse_breakdown, corpus, args.rounds)
+    print(f"Well-formed responses only ({len(well_formed)}):")
+    run("legacy", legacy_parse, well_formed, args.rounds)
+    run("current", parse_breakdown, well_formed, args.rounds)
+
+
+def _accepts(parse, text: str) -> bool:
+    try:
+        parse(text)
+    except ValueError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    main()
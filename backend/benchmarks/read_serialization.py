@@ -0,0 +1,114 @@
+"""CPU cost of GET /api/goals/ per 10k goals, before and after the plain-row read path.
+
+Seeds DATABASE_URL with synthetic goals (5 tasks each), dropping its tables
+(so --drop-existing is required), unless --skip-seed is given, then pages through every goal (`limit` per page) with:
+
+* orm: what `get_goals` did before, i.e. `select(Goal)` with
+  `selectinload(Goal.tasks)`, `GoalResponse.model_validate` per goal, then
+  FastAPI's response handling (validate against the response model again,
+  dump to JSON-compatible Python, stdlib `json.dumps`)
+* rows: the current route, called directly with the response cache off
+  (plain rows, dicts built directly, orjson when installed)
+
+CPU time is process time, so it includes the database driver but not
+time spent waiting on the database.
+
+Usage (from backend/):
+    python -m benchmarks.read_serialization --goals 10000 --rounds 5 --drop-existing
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import selectinload
+from starlette.requests import Request
+
+from app.database import engine, async_session
+from app.models import Goal
+from app.routes.goals import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, get_goals
+from app.schemas import GoalResponse
+from app.serialization import orjson
+from app.services.response_cache import response_cache
+from benchmarks.database import add_seed_arguments, confirm_drop
+from benchmarks.export_memory import seed
+
+RESPONSE_MODEL = TypeAdapter(List[GoalResponse])
+
+
+async def orm_page(db, limit: int, cursor: str | None) -> tuple[bytes, str | None]:
+    query = select(Goal).options(selectinload(Goal.tasks))
+    if cursor:
+        query = query.where(tuple_(Goal.created_at, Goal.id) < tuple_(*decode_cursor(cursor)))
+    query = query.order_by(Goal.created_at.desc(), Goal.id.desc()).limit(limit + 1)
+    goals = (await db.execute(query)).scalars().all()
+
+    next_cursor = None
+    if len(goals) > limit:
+        goals = goals[:limit]
+        next_cursor = encode_cursor(goals[-1].created_at, goals[-1].id)
+    models = [GoalResponse.model_validate(goal) for goal in goals]
+    content = RESPONSE_MODEL.dump_python(RESPONSE_MODEL.validate_python(models), mode="json")
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+    return body, next_cursor
+
+
+async def rows_page(db, limit: int, cursor: str | None) -> tuple[bytes, str | None]:
+    query_string = f"limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+    request = Request({
+        "type": "http", "method": "GET", "path": "/api/goals/", "query_string": query_string.encode(), "headers": []
+    })
+    response = await get_goals(
+        request,
+        limit=limit,
+        cursor=cursor,
+        min_complexity=None,
+        max_complexity=None,
+        created_after=None,
+        created_before=None,
+        view="full",
+        db=db,
+    )
+    return response.body, response.headers.get(NEXT_CURSOR_HEADER)
+
+
+async def run(label: str, page, limit: int, rounds: int):
+    cpu = 0.0
+    goals = 0
+    for _ in range(rounds):
+        async with async_session() as db:
+            cursor = None
+            start = time.process_time()
+            while True:
+                body, cursor = await page(db, limit, cursor)
+                goals += body.count(b'"title"')
+                if cursor is None:
+                    break
+            cpu += time.process_time() - start
+    print(f"{label:>5}: {cpu / goals * 10_000 * 1000:8.1f} ms CPU per 10k goals ({goals // rounds} goals x {rounds})")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--goals", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+    confirm_drop(parser, args.skip_seed, args.drop_existing)
+
+    if not args.skip_seed:
+        await seed(args.goals)
+    response_cache.enabled = False
+
+    print(f"JSON backend: {'orjson' if orjson is not None else 'json'}")
+    await run("orm", orm_page, args.limit, args.rounds)
+    await run("rows", rows_page, args.limit, args.rounds)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""Latency of finding goals by keyword: LIKE scan vs. the full-text index.
+
+Seeds DATABASE_URL with synthetic goals (5 tasks each, so --goals 500000
+is 2.5M tasks), dropping its tables (so --drop-existing is required),
+unless --skip-seed is given, then times the first page of
+results for a set of query words with:
+
+* scan: `ILIKE '%word%'` over titles joined to task descriptions, the
+  closest server-side equivalent of filtering GET /api/goals/ client-side
+* search: `crud.search_goals`, i.e. GET /api/goals/search (tsvector + GIN
+  on PostgreSQL, FTS5 on SQLite)
+
+Usage (from backend/):
+    python -m benchmarks.search_latency --goals 500000 --queries 20 --drop-existing
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, or_, select
+
+from app.crud import search_goals
+from app.database import engine, async_session
+from app.models import Goal, Task
+from app.search import search_document
+from benchmarks.database import add_seed_arguments, confirm_drop, recreate_tables
+
+SEED_BATCH = 10_000
+PAGE_SIZE = 50
+
+VERBS = ["learn", "build", "practice", "read", "write", "plan", "train", "save", "cook", "paint",
+         "record", "organize", "study", "design", "publish", "repair", "visit", "teach", "measure", "sketch"]
+TOPICS = ["guitar", "spanish", "marathon", "budget", "garden", "python", "novel", "podcast", "kitchen",
+          "photography", "chess", "piano", "mandarin", "woodworking", "pottery", "calculus", "sourdough",
+          "kayaking", "astronomy", "origami", "climbing", "beekeeping", "calligraphy", "robotics", "sailing"]
+
+
+def phrase(rng: random.Random) -> str:
+    return f"{rng.choice(VERBS).capitalize()} {rng.choice(TOPICS)} {rng.choice(TOPICS)}"
+
+
+async def seed(goals: int, rng: random.Random):
+    await recreate_tables()
+
+    start = datetime(2024, 1, 1)
+    async with async_session() as db:
+        for offset in range(0, goals, SEED_BATCH):
+            count = min(SEED_BATCH, goals - offset)
+            breakdowns = [(phrase(rng), [phrase(rng) for _ in range(5)]) for _ in range(count)]
+            result = await db.execute(
+                insert(Goal).returning(Goal.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "title": title,
+                        "complexity_score": (offset + i) % 10 + 1,
+                        "created_at": start + timedelta(seconds=offset + i),
+                        "search_vector": search_document(title, tasks),
+                    }
+                    for i, (title, tasks) in enumerate(breakdowns)
+                ],
+            )
+            await db.execute(
+                insert(Task),
+                [
+                    {"goal_id": goal_id, "description": description, "step_number": step}
+                    for goal_id, (_, tasks) in zip(result.scalars().all(), breakdowns)
+                    for step, description in enumerate(tasks, 1)
+                ],
+            )
+            await db.commit()
+
+
+async def scan(word: str) -> int:
+    pattern = f"%{word}%"
+    async with async_session() as db:
+        result = await db.execute(
+            select(Goal.id)
+            .outerjoin(Task, Task.goal_id == Goal.id)
+            .where(or_(Goal.title.ilike(pattern), Task.description.ilike(pattern)))
+            .group_by(Goal.id, Goal.created_at)
+            .order_by(Goal.created_at.desc())
+            .limit(PAGE_SIZE)
+        )
+        return len(result.all())
+
+
+async def search(word: str) -> int:
+    async with async_session() as db:
+        return len(await search_goals(db, word, PAGE_SIZE))
+
+
+async def run(label: str, func, words: list[str]):
+    timings = []
+    for word in words:
+        start = time.perf_counter()
+        await func(word)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{label:>6}: p50 {statistics.median(timings) * 1000:9.1f} ms, p95 {p95 * 1000:9.1f} ms ({len(words)} queries)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--goals", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+    confirm_drop(parser, args.skip_seed, args.drop_existing)
+
+    rng = random.Random(args.seed)
+    if not args.skip_seed:
+        await seed(args.goals, rng)
+
+    words = [rng.choice(TOPICS) for _ in range(args.queries)]
+    await run("scan", scan, words)
+    await run("search", search, words)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""Cold start of a worker: import time and time to first ready.
+
+Prepares DATABASE_URL like a migrated database (tables plus an
+`alembic_version` row at SCHEMA_REVISION, replacing the existing one, so
+--drop-existing is required) unless --skip-prepare is given, then runs --runs fresh interpreters for each measurement:
+
+* import: `import app.main`, timed inside the child, and whether the Gemini
+  SDK got imported along the way
+* ready: seconds from spawning uvicorn until /health reports the database
+  as connected, with the Alembic revision check (the default) and with
+  DB_CREATE_SCHEMA=true (`create_all`, how the app started before)
+
+Medians are printed. --max-import-seconds / --max-ready-seconds make the
+script exit non-zero when exceeded, so CI can catch regressions.
+
+Usage (from backend/):
+    python -m benchmarks.startup_time --runs 5 --max-import-seconds 1.5 --drop-existing
+"""
+import os
+
+# The app never calls Gemini here, so any key will do
+os.environ.setdefault("GEMINI_API_KEY", "startup-benchmark")
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import text
+
+import app.models  # registers the tables on Base.metadata
+from app.database import Base, SCHEMA_REVISION, engine
+from benchmarks.database import confirm_drop
+
+IMPORT_PROBE = (
+    "import json, sys, time; start = time.perf_counter(); import app.main; "
+    "print(json.dumps({'seconds': time.perf_counter() - start, 'sdk': 'google.generativeai' in sys.modules}))"
+)
+READY_TIMEOUT_SECONDS = 60
+
+
+async def prepare():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": SCHEMA_REVISION})
+    await engine.dispose()
+
+
+def measure_import() -> dict:
+    result = subprocess.run([sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_ready(create_schema: bool) -> float:
+    port = free_port()
+    env = {**os.environ, "DB_CREATE_SCHEMA": "true" if create_schema else "false"}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"], env=env
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with {process.returncode}")
+                try:
+                    if client.get("/health").json().get("database") == "connected":
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                if time.perf_counter() - start > READY_TIMEOUT_SECONDS:
+                    raise RuntimeError(f"not ready within {READY_TIMEOUT_SECONDS}s")
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-prepare", action="store_true")
+    parser.add_argument("--drop-existing", action="store_true", help="allow replacing the alembic_version table")
+    parser.add_argument("--max-import-seconds", type=float)
+    parser.add_argument("--max-ready-seconds", type=float)
+    args = parser.parse_args()
+    confirm_drop(parser, args.skip_prepare, args.drop_existing, action="preparing", skip_option="--skip-prepare")
+
+    if not args.skip_prepare:
+        asyncio.run(prepare())
+
+    imports = [measure_import() for _ in range(args.runs)]
+    import_seconds = statistics.median(result["seconds"] for result in imports)
+    sdk = any(result["sdk"] for result in imports)
+    print(f"import app.main: {import_seconds:.3f}s (Gemini SDK imported: {'yes' if sdk else 'no'})")
+
+    ready = {}
+    for label, create_schema in (("revision check", False), ("create_all", True)):
+        ready[label] = statistics.median(measure_ready(create_schema) for _ in range(args.runs))
+        print(f"ready ({label}): {ready[label]:.3f}s")
+
+    failures = []
+    if args.max_import_seconds is not None and import_seconds > args.max_import_seconds:
+        failures.append(f"import took {import_seconds:.3f}s, limit {args.max_import_seconds}s")
+    if args.max_ready_seconds is not None and ready["revision check"] > args.max_ready_seconds:
+        failures.append(f"ready took {ready['revision check']:.3f}s, limit {args.max_ready_seconds}s")
+    if failures:
+        sys.exit("Startup regression: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare time-to-first-task of streamed vs. full-response breakdowns.
+
+Uses a fake Gemini model that writes a realistic breakdown a few characters
+at a time (no API key or network needed) and reports, per mode:
+
+* full: `break_down_goal`, where nothing is usable until the whole response
+  has arrived and been parsed
+* stream: `stream_breakdown`, timing the first `task` event and the end of
+  the stream
+
+Usage (from backend/):
+    python -m benchmarks.stream_latency --chars-per-second 400 --runs 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services.ai_service import break_down_goal, breakdown_cache, stream_breakdown
+
+BREAKDOWN = {
+    "complexity_score": 7,
+    "tasks": [
+        "Choose a 16-week beginner marathon training plan and block out the running days",
+        "Get fitted for running shoes and replace them every 500 kilometres",
+        "Build a base of three easy runs per week until 10k feels comfortable",
+        "Add one long run per week, growing it by 10% until you reach 30k",
+        "Taper for the final two weeks, then run the race at your practised pace",
+    ],
+}
+CHUNK_SIZE = 16
+
+
+class PacedModel:
+    """Fake GenerativeModel emitting its text at a fixed rate."""
+
+    def __init__(self, chars_per_second: float):
+        self.text = json.dumps(BREAKDOWN)
+        self.delay = CHUNK_SIZE / chars_per_second
+
+    def _chunks(self):
+        for i in range(0, len(self.text), CHUNK_SIZE):
+            time.sleep(self.delay)
+            yield SimpleNamespace(text=self.text[i:i + CHUNK_SIZE])
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        if stream:
+            return self._chunks()
+        list(self._chunks())
+        return SimpleNamespace(text=self.text)
+
+
+async def measure_full(run: int) -> float:
+    start = time.perf_counter()
+    await break_down_goal(f"Run a marathon #{run}")
+    return time.perf_counter() - start
+
+
+async def measure_stream(run: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    first_task = None
+    async for name, _ in stream_breakdown(f"Run a marathon #{run}"):
+        if name == "task" and first_task is None:
+            first_task = time.perf_counter() - start
+    return first_task, time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars-per-second", type=float, default=400)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with patch("app.services.ai_service.get_model", return_value=PacedModel(args.chars_per_second)):
+        full, first, total = [], [], []
+        for run in range(args.runs):
+            breakdown_cache.clear()
+            full.append(await measure_full(run))
+            breakdown_cache.clear()
+            first_task, stream_total = await measure_stream(run)
+            first.append(first_task)
+            total.append(stream_total)
+
+    print(f"  full: first task after {statistics.median(full) * 1000:.0f} ms (median of {args.runs})")
+    print(f"stream: first task after {statistics.median(first) * 1000:.0f} ms, "
+          f"complete after {statistics.median(total) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
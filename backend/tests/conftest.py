@@ -5,12 +5,27 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, enable_sqlite_foreign_keys
+from app.telemetry import instrument_engine
+from app.routes.goals import get_job_runner
+from app.services.ai_service import (
+    rate_limiter,
+    breakdown_cache,
+    breakdown_flights,
+    admission_queue,
+    model_health,
+    breakdown_batcher,
+)
+from app.services.jobs import JobRunner
+from app.services.response_cache import response_cache
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+enable_sqlite_foreign_keys(engine)
+instrument_engine(engine)
 TestingSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+test_job_runner = JobRunner(session_factory=TestingSessionLocal, workers=2)
 
 
 @pytest.fixture(scope="session")
@@ -27,6 +42,28 @@ async def setup_database():
     yield
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # Pooled connections keep FTS5 state for the dropped tables; start fresh
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+async def reset_ai_state():
+    await rate_limiter.reset()
+    breakdown_cache.clear()
+    breakdown_flights.reset()
+    admission_queue.reset()
+    model_health.reset()
+    breakdown_batcher.reset()
+    response_cache.reset()
+    yield
+    await test_job_runner.stop()
+    await rate_limiter.reset()
+    breakdown_cache.clear()
+    breakdown_flights.reset()
+    admission_queue.reset()
+    model_health.reset()
+    breakdown_batcher.reset()
+    response_cache.reset()
 
 
 async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -35,6 +72,7 @@ async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_job_runner] = lambda: test_job_runner
 
 
 @pytest.fixture
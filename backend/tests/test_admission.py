@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.admission import AdmissionQueue, AdmissionQueueFullError, Priority
+from app.services.rate_limiter import RateLimiter, RateLimitExceededError, Reservation
+
+
+class ManualLimiter(RateLimiter):
+    """Limiter whose quota only changes when the test grants tokens."""
+
+    backend = "manual"
+
+    def __init__(self, tokens: int = 0, retry_after: float = 0.01):
+        super().__init__()
+        self.tokens = tokens
+        self.retry_after = retry_after
+
+    async def reserve(self) -> Reservation:
+        if self.tokens < 1:
+            raise RateLimitExceededError("Rate limit exceeded.", retry_after=self.retry_after)
+        self.tokens -= 1
+        return Reservation()
+
+    async def _give_back(self, reservation: Reservation):
+        self.tokens += 1
+
+    async def get_usage(self) -> dict:
+        return {"tokens": self.tokens, "backend": self.backend}
+
+    async def reset(self):
+        self.tokens = 0
+
+
+@pytest.mark.asyncio
+async def test_waits_for_quota_instead_of_rejecting():
+    limiter = ManualLimiter()
+    queue = AdmissionQueue(limiter, max_depth=10, max_wait=2)
+
+    waiter = asyncio.create_task(queue.admit())
+    await asyncio.sleep(0.05)
+    assert queue.get_stats()["queued"] == 1
+
+    limiter.tokens = 1
+    assert isinstance(await waiter, Reservation)
+    stats = queue.get_stats()
+    assert stats["queued"] == 0
+    assert stats["admitted"] == 1
+    assert stats["wait_seconds_buckets"]["0.01"] == 0
+    assert stats["wait_seconds_buckets"]["+Inf"] == 1
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_jump_ahead_of_batch():
+    limiter = ManualLimiter()
+    queue = AdmissionQueue(limiter, max_depth=10, max_wait=2)
+    admitted = []
+
+    async def admit(name: str, priority: Priority):
+        await queue.admit(priority)
+        admitted.append(name)
+
+    tasks = [
+        asyncio.create_task(admit("batch", Priority.BATCH)),
+        asyncio.create_task(admit("regenerate", Priority.REGENERATE)),
+        asyncio.create_task(admit("interactive", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0.05)
+    assert queue.get_stats()["queued_by_priority"] == {"interactive": 1, "regenerate": 1, "batch": 1}
+
+    limiter.tokens = 3
+    await asyncio.gather(*tasks)
+    assert admitted == ["interactive", "regenerate", "batch"]
+
+
+@pytest.mark.asyncio
+async def test_sheds_load_when_queue_is_full():
+    queue = AdmissionQueue(ManualLimiter(), max_depth=1, max_wait=2)
+    waiter = asyncio.create_task(queue.admit())
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(AdmissionQueueFullError):
+        await queue.admit()
+    assert queue.get_stats()["rejected_queue_full"] == 1
+    waiter.cancel()
+
+
+@pytest.mark.asyncio
+async def test_gives_up_at_deadline():
+    queue = AdmissionQueue(ManualLimiter(), max_depth=10, max_wait=0.05)
+
+    with pytest.raises(RateLimitExceededError, match="Waited 0.05 seconds"):
+        await queue.admit()
+    assert queue.get_stats()["rejected_deadline"] == 1
+    assert queue.get_stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_immediately_when_quota_frees_after_deadline():
+    queue = AdmissionQueue(ManualLimiter(retry_after=3600), max_depth=10, max_wait=5)
+
+    with pytest.raises(RateLimitExceededError, match="Rate limit exceeded."):
+        await queue.admit()
+    assert queue.get_stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_status_endpoint(client: AsyncClient):
+    response = await client.get("/api/goals/queue/status")
+    assert response.status_code == 200
+    assert response.json()["queued"] == 0
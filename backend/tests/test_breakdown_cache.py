@@ -0,0 +1,110 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.ai_service import break_down_goal, rate_limiter, admission_queue, RateLimitExceededError
+from app.services.breakdown_cache import BreakdownCache, normalize_title, make_cache_key
+from tests.conftest import TestingSessionLocal
+
+BREAKDOWN = {"complexity_score": 6, "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"]}
+
+
+def fake_model():
+    model = MagicMock()
+    model.generate_content.return_value = SimpleNamespace(text=json.dumps(BREAKDOWN))
+    return model
+
+
+def test_normalize_title_matches_near_identical_titles():
+    assert normalize_title("  Learn   Spanish! ") == normalize_title("learn spanish")
+    assert normalize_title("Run a marathon.") == "run a marathon"
+    assert make_cache_key("learn spanish", "gemini-2.0-flash", "1") != make_cache_key(
+        "learn spanish", "gemini-2.5-flash", "1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache = BreakdownCache(max_entries=2, ttl_seconds=60, persistent=False)
+    for key in ("a", "b"):
+        await cache.set(key, BREAKDOWN, model_id="m", normalized_title=key, prompt_version="1")
+    assert await cache.get("a") is not None  # "b" is now least recently used
+    await cache.set("c", BREAKDOWN, model_id="m", normalized_title="c", prompt_version="1")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    cache = BreakdownCache(max_entries=10, ttl_seconds=60, persistent=False)
+    with patch("app.services.breakdown_cache.time.monotonic", return_value=1000.0):
+        await cache.set("a", BREAKDOWN, model_id="m", normalized_title="a", prompt_version="1")
+    with patch("app.services.breakdown_cache.time.monotonic", return_value=1061.0):
+        assert await cache.get("a") is None
+    assert cache.get_stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_survives_memory_clear():
+    cache = BreakdownCache(max_entries=10, ttl_seconds=60, persistent=True, session_factory=TestingSessionLocal)
+    await cache.set("a", BREAKDOWN, model_id="m", normalized_title="a", prompt_version="1")
+    cache.clear()
+
+    assert await cache.get("a") == BREAKDOWN
+    assert cache.get_stats()["persistent_hits"] == 1
+    assert await cache.get("a") == BREAKDOWN
+    assert cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_bypasses_rate_limiter(monkeypatch):
+    # Fail fast instead of queueing for quota
+    monkeypatch.setattr(admission_queue, "max_wait", 0)
+    model = fake_model()
+    with patch("app.services.ai_service.get_model", return_value=model):
+        assert await break_down_goal("Learn Spanish") == BREAKDOWN
+
+        for _ in range(rate_limiter.burst - 1):
+            await rate_limiter.reserve()
+        with pytest.raises(RateLimitExceededError):
+            await break_down_goal("Learn French")
+
+        assert await break_down_goal("learn   spanish!") == BREAKDOWN
+
+    assert model.generate_content.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_regenerating_a_goal_skips_the_cache(client: AsyncClient):
+    model = fake_model()
+    with patch("app.services.ai_service.get_model", return_value=model):
+        created = await client.post("/api/goals/", json={"title": "Learn Spanish"})
+        regenerated = {**BREAKDOWN, "tasks": ["New 1", "New 2", "New 3", "New 4", "New 5"]}
+        model.generate_content.return_value = SimpleNamespace(text=json.dumps(regenerated))
+
+        response = await client.put(f"/api/goals/{created.json()['id']}", json={"title": "learn spanish"})
+
+        assert [t["description"] for t in response.json()["tasks"]] == regenerated["tasks"]
+        assert model.generate_content.call_count == 2
+        # The new steps replace the cached ones
+        assert await break_down_goal("Learn Spanish") == regenerated
+        assert model.generate_content.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_endpoint(client: AsyncClient):
+    with patch("app.services.ai_service.get_model", return_value=fake_model()):
+        await break_down_goal("Run a marathon")
+        await break_down_goal("Run a marathon")
+
+    response = await client.get("/api/goals/cache/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["hits"] == 1
+    assert data["misses"] == 1
+    assert data["size"] == 1
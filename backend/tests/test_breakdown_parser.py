@@ -0,0 +1,89 @@
+import json
+import random
+
+import pytest
+
+from app.services.breakdown_parser import extract_json, parse_breakdown
+
+TASKS = [
+    "Pick a beginner course",
+    "Install the toolchain",
+    "Write a small CLI project",
+    "Read a chapter on {generics} every week",
+    "Publish the project and ask for feedback",
+]
+VALID = json.dumps({"complexity_score": 6, "tasks": TASKS}, indent=2)
+
+
+@pytest.mark.parametrize("text", [
+    VALID,
+    f"```json\n{VALID}\n```",
+    f"Sure! Here is the {{plan}} you asked for:\n{VALID}\nGood luck!",
+    VALID.replace('feedback"\n', 'feedback",\n'),
+])
+def test_parses_chatty_fenced_and_trailing_comma_output(text):
+    assert parse_breakdown(text) == {"complexity_score": 6, "tasks": TASKS}
+
+
+def test_braces_inside_strings_do_not_end_the_object():
+    text = 'Answer: {"complexity_score": 2, "tasks": ["a}", "b{", "c\\"}", "d", "e"]} trailing {'
+    candidate, start = extract_json(text)
+    assert start == 8
+    assert json.loads(candidate)["tasks"][:3] == ["a}", "b{", 'c"}']
+
+
+def test_score_strings_are_read_and_clamped():
+    assert parse_breakdown(json.dumps({"complexity_score": "7/10", "tasks": TASKS}))["complexity_score"] == 7
+    assert parse_breakdown(json.dumps({"complexity_score": 42.5, "tasks": TASKS}))["complexity_score"] == 10
+    with pytest.raises(ValueError):
+        parse_breakdown(json.dumps({"complexity_score": True, "tasks": TASKS}))
+
+
+def test_six_tasks_merge_the_last_two():
+    result = parse_breakdown(json.dumps({"complexity_score": 3, "tasks": TASKS + ["Celebrate"]}))
+    assert result["tasks"][:4] == TASKS[:4]
+    assert result["tasks"][4] == "Publish the project and ask for feedback; then celebrate"
+
+
+def test_four_tasks_split_a_compound_step():
+    tasks = ["Pick a course", "Install the toolchain and then write hello world", "Build a CLI", "Publish it"]
+    result = parse_breakdown(json.dumps({"complexity_score": 3, "tasks": tasks}))
+    assert result["tasks"] == ["Pick a course", "Install the toolchain", "Write hello world", "Build a CLI", "Publish it"]
+
+
+def test_unrepairable_task_counts_are_rejected():
+    with pytest.raises(ValueError, match="exactly 5 tasks"):
+        parse_breakdown(json.dumps({"complexity_score": 3, "tasks": ["One", "Two", "Three", "Four"]}))
+    with pytest.raises(ValueError, match="exactly 5 tasks"):
+        parse_breakdown(json.dumps({"complexity_score": 3, "tasks": TASKS * 2}))
+
+
+def _mutate(text: str, rng: random.Random) -> str:
+    i = rng.randrange(len(text) + 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return text[:i] + text[i + 1:]
+    if kind == 1:
+        return text[:i] + rng.choice('{}[]",:\\ x7') + text[i:]
+    if kind == 2:
+        return text[:i]
+    return rng.choice(["Here you go: ", "```json\n", ""]) + text + rng.choice(["\n```", " Hope it helps!", ",", ""])
+
+
+def test_fuzzed_responses_parse_to_a_valid_breakdown_or_raise_value_error():
+    rng = random.Random(1234)
+    parsed = 0
+    for _ in range(2000):
+        text = VALID
+        for _ in range(rng.randint(1, 3)):
+            text = _mutate(text, rng)
+        try:
+            result = parse_breakdown(text)
+        except ValueError:
+            continue
+        parsed += 1
+        assert 1 <= result["complexity_score"] <= 10
+        assert len(result["tasks"]) == 5
+        assert all(isinstance(t, str) and t for t in result["tasks"])
+    # Most single-character damage outside the JSON syntax is survivable
+    assert parsed > 500
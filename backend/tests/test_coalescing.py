@@ -0,0 +1,71 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.ai_service import break_down_goal, breakdown_flights, RateLimitExceededError
+
+BREAKDOWN = {"complexity_score": 7, "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"]}
+
+
+def slow_model(side_effect):
+    model = MagicMock()
+    model.generate_content.side_effect = side_effect
+    return model
+
+
+def slow_success(prompt, **kwargs):
+    time.sleep(0.2)
+    return SimpleNamespace(text=json.dumps(BREAKDOWN))
+
+
+def slow_quota_error(prompt, **kwargs):
+    time.sleep(0.2)
+    raise Exception("429 Quota exceeded for this project")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_breakdowns_share_one_call():
+    model = slow_model(slow_success)
+    with patch("app.services.ai_service.get_model", return_value=model):
+        results = await asyncio.gather(*[break_down_goal("Go viral") for _ in range(5)])
+
+    assert all(result == BREAKDOWN for result in results)
+    assert model.generate_content.call_count == 1
+    assert breakdown_flights.get_stats() == {"originated": 1, "coalesced": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_failures_propagate_to_every_waiter():
+    model = slow_model(slow_quota_error)
+    with patch("app.services.ai_service.get_model", return_value=model):
+        results = await asyncio.gather(
+            *[break_down_goal("Go viral") for _ in range(3)], return_exceptions=True
+        )
+
+    assert all(isinstance(result, RateLimitExceededError) for result in results)
+    assert model.generate_content.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_originator_does_not_cancel_waiters():
+    model = slow_model(slow_success)
+    with patch("app.services.ai_service.get_model", return_value=model):
+        originator = asyncio.create_task(break_down_goal("Go viral"))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(break_down_goal("Go viral"))
+        await asyncio.sleep(0.05)
+        originator.cancel()
+
+        assert await waiter == BREAKDOWN
+
+
+@pytest.mark.asyncio
+async def test_coalescing_stats_endpoint(client: AsyncClient):
+    response = await client.get("/api/goals/coalescing/stats")
+    assert response.status_code == 200
+    assert response.json() == {"originated": 0, "coalesced": 0, "in_flight": 0}
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.ai_service import generation_executor, rate_limiter
+
+SLOW_CALL_SECONDS = 0.5
+CONCURRENT_CREATES = 8
+
+
+class SlowModel:
+    """Stands in for a GenerativeModel whose blocking call takes a while."""
+
+    def generate_content(self, prompt, **kwargs):
+        time.sleep(SLOW_CALL_SECONDS)
+        return SimpleNamespace(text=json.dumps({
+            "complexity_score": 4,
+            "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"],
+        }))
+
+
+def p99(samples: list[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+async def timed_get(client: AsyncClient, url: str) -> float:
+    start = time.perf_counter()
+    response = await client.get(url)
+    assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_reads_stay_fast_while_breakdowns_are_pending(client: AsyncClient, monkeypatch):
+    # Every create goes out back to back: the seed goal plus the concurrent ones
+    monkeypatch.setattr(rate_limiter, "burst", CONCURRENT_CREATES + 1)
+    await rate_limiter.reset()
+    with patch("app.services.ai_service.get_model", return_value=SlowModel()):
+        created = await client.post("/api/goals/", json={"title": "Seed goal"})
+        assert created.status_code == 200
+        url = f"/api/goals/{created.json()['id']}"
+
+        baseline = [await timed_get(client, url) for _ in range(20)]
+
+        creates = [
+            asyncio.create_task(client.post("/api/goals/", json={"title": f"Goal {i}"}))
+            for i in range(CONCURRENT_CREATES)
+        ]
+        await asyncio.sleep(0.1)
+        assert generation_executor.get_stats()["in_flight"] == CONCURRENT_CREATES
+
+        loaded = [await timed_get(client, url) for _ in range(20)]
+
+        responses = await asyncio.gather(*creates)
+
+    assert all(r.status_code == 200 for r in responses)
+    # A blocked event loop would push reads out to the full Gemini latency
+    assert p99(loaded) < SLOW_CALL_SECONDS / 2
+    assert p99(loaded) < p99(baseline) + 0.1
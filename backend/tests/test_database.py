@@ -0,0 +1,110 @@
+import re
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import app.models  # registers the tables on Base.metadata
+from app.config import get_settings
+from app.database import (
+    Base,
+    engine,
+    InstrumentedQueuePool,
+    SCHEMA_REVISION,
+    UNVERSIONED_SCHEMA_FIX,
+    check_schema_revision,
+    engine_options,
+    get_pool_status,
+    warm_up_pool,
+)
+
+
+def test_engine_options_follow_settings():
+    settings = get_settings()
+    options = engine_options("postgresql+asyncpg://u:p@db/goals", settings)
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert options["url"].query["prepared_statement_cache_size"] == str(settings.DB_STATEMENT_CACHE_SIZE)
+
+
+def test_engine_options_pgbouncer_compat(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "DB_PGBOUNCER_COMPAT", True)
+    options = engine_options("postgresql+asyncpg://u:p@db/goals", settings)
+
+    assert options["url"].query["prepared_statement_cache_size"] == "0"
+    assert options["connect_args"]["statement_cache_size"] == 0
+    name_func = options["connect_args"]["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_and_pool_metrics():
+    target = create_async_engine("sqlite+aiosqlite://", poolclass=InstrumentedQueuePool, pool_size=3)
+    try:
+        await warm_up_pool(10, target)
+        status = get_pool_status(target)
+        assert status["checked_in"] == 3
+        assert status["checkouts"] == 3
+
+        async with target.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert get_pool_status(target)["checked_out"] == 1
+    finally:
+        await target.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(engine.dialect.name == "sqlite", reason="app engine uses the default SQLite pool")
+async def test_pool_status_endpoint(client: AsyncClient):
+    response = await client.get("/health/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["size"] == get_settings().DB_POOL_SIZE
+    assert {"checked_in", "checked_out", "overflow", "wait_seconds_max"} <= data.keys()
+
+
+def test_schema_revision_is_the_alembic_head():
+    config = Config()
+    config.set_main_option("script_location", str(Path(__file__).parents[1] / "alembic"))
+    assert ScriptDirectory.from_config(config).get_current_head() == SCHEMA_REVISION
+
+
+@pytest.mark.asyncio
+async def test_check_schema_revision(caplog):
+    target = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    try:
+        with pytest.raises(RuntimeError, match="alembic upgrade head"):
+            await check_schema_revision(target)
+
+        async with target.begin() as conn:
+            await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+            await conn.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": SCHEMA_REVISION})
+        assert await check_schema_revision(target) == SCHEMA_REVISION
+        assert "expects" not in caplog.text
+
+        async with target.begin() as conn:
+            await conn.execute(text("UPDATE alembic_version SET version_num = '001'"))
+        assert await check_schema_revision(target) == "001"
+        assert f"expects {SCHEMA_REVISION}" in caplog.text
+    finally:
+        await target.dispose()
+
+
+@pytest.mark.asyncio
+async def test_check_schema_revision_spots_tables_created_without_alembic():
+    target = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    try:
+        async with target.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        with pytest.raises(RuntimeError, match=re.escape(UNVERSIONED_SCHEMA_FIX)):
+            await check_schema_revision(target)
+    finally:
+        await target.dispose()
@@ -1,6 +1,15 @@
+import asyncio
+import json
 import pytest
 from httpx import AsyncClient
 from unittest.mock import patch, AsyncMock
+from sqlalchemy import select, func
+
+from app.config import get_settings
+from app.database import count_statements
+from app.services.ai_service import RateLimitExceededError
+from app.models import Task
+from tests.conftest import engine, TestingSessionLocal
 
 
 @pytest.mark.asyncio
@@ -81,3 +90,204 @@ async def test_delete_goal(client: AsyncClient):
 async def test_delete_goal_not_found(client: AsyncClient):
     response = await client.delete("/api/goals/999")
     assert response.status_code == 404
+
+
+async def create_goals(client: AsyncClient, scores: list[int]) -> list[int]:
+    ids = []
+    with patch("app.routes.goals.break_down_goal", new_callable=AsyncMock) as mock_ai:
+        for i, score in enumerate(scores):
+            mock_ai.return_value = {
+                "complexity_score": score,
+                "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"]
+            }
+            response = await client.post("/api/goals/", json={"title": f"Goal {i}"})
+            ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_get_goals_keyset_pagination(client: AsyncClient):
+    ids = await create_goals(client, [1, 2, 3, 4, 5])
+
+    first = await client.get("/api/goals/", params={"limit": 2})
+    assert [g["id"] for g in first.json()] == ids[::-1][:2]
+    assert len(first.json()[0]["tasks"]) == 5
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = await client.get("/api/goals/", params={"limit": 2, "cursor": cursor})
+    third = await client.get("/api/goals/", params={"limit": 2, "cursor": second.headers["X-Next-Cursor"]})
+
+    assert [g["id"] for g in second.json()] == ids[::-1][2:4]
+    assert [g["id"] for g in third.json()] == ids[::-1][4:]
+    assert "X-Next-Cursor" not in third.headers
+
+
+@pytest.mark.asyncio
+async def test_get_goals_filters_and_summary_view(client: AsyncClient):
+    await create_goals(client, [2, 5, 8])
+
+    response = await client.get(
+        "/api/goals/", params={"min_complexity": 4, "max_complexity": 9, "view": "summary"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [g["complexity_score"] for g in data] == [8, 5]
+    assert all("tasks" not in g for g in data)
+
+    future = await client.get("/api/goals/", params={"created_after": "2999-01-01T00:00:00"})
+    assert future.json() == []
+
+
+@pytest.mark.asyncio
+async def test_get_goals_rejects_bad_cursor_and_limit(client: AsyncClient):
+    assert (await client.get("/api/goals/", params={"cursor": "not-a-cursor"})).status_code == 400
+    assert (await client.get("/api/goals/", params={"limit": 10_000})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_and_csv(client: AsyncClient):
+    ids = await create_goals(client, [3, 6])
+
+    response = await client.get("/api/goals/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    goals = [json.loads(line) for line in response.text.splitlines()]
+    assert [g["id"] for g in goals] == ids
+    assert [t["step_number"] for t in goals[0]["tasks"]] == [1, 2, 3, 4, 5]
+
+    since = goals[0]["created_at"]
+    incremental = await client.get("/api/goals/export", params={"since": since})
+    assert [json.loads(line)["id"] for line in incremental.text.splitlines()] == ids[1:]
+
+    csv_response = await client.get("/api/goals/export", params={"format": "csv"})
+    lines = csv_response.text.strip().splitlines()
+    assert lines[0] == "goal_id,title,complexity_score,created_at,step_number,description"
+    assert len(lines) == 1 + 2 * 5
+
+
+@pytest.mark.asyncio
+async def test_create_goals_batch_reports_per_item_results(client: AsyncClient):
+    async def fake_breakdown(title, model_name=None, **kwargs):
+        if title == "Too popular":
+            raise RateLimitExceededError("Rate limit exceeded. Please wait 30 seconds.")
+        return {"complexity_score": 4, "tasks": [f"{title} {n}" for n in range(1, 6)]}
+
+    with patch("app.routes.goals.break_down_goal", side_effect=fake_breakdown):
+        response = await client.post(
+            "/api/goals/batch",
+            json={"titles": ["Learn piano", "Too popular", "Write a book"]}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 1
+    assert [r["status"] for r in data["results"]] == ["created", "failed", "created"]
+    assert data["results"][1]["error"].startswith("Rate limit exceeded")
+
+    book = data["results"][2]["goal"]
+    assert [t["description"] for t in book["tasks"]][0] == "Write a book 1"
+    stored = (await client.get(f"/api/goals/{book['id']}")).json()
+    assert stored == book
+
+
+@pytest.mark.asyncio
+async def test_create_goals_batch_bounds_concurrency(client: AsyncClient):
+    running = 0
+    peak = 0
+
+    async def fake_breakdown(title, model_name=None, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"complexity_score": 2, "tasks": ["1", "2", "3", "4", "5"]}
+
+    with patch("app.routes.goals.break_down_goal", side_effect=fake_breakdown), \
+            patch.object(get_settings(), "BATCH_MAX_CONCURRENCY", 3):
+        response = await client.post(
+            "/api/goals/batch", json={"titles": [f"Goal {i}" for i in range(12)]}
+        )
+
+    assert response.json()["created"] == 12
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_create_goal_round_trips(client: AsyncClient):
+    with patch("app.routes.goals.break_down_goal", new_callable=AsyncMock) as mock_ai:
+        mock_ai.return_value = {"complexity_score": 5, "tasks": ["1", "2", "3", "4", "5"]}
+        with count_statements(engine) as counter:
+            response = await client.post("/api/goals/", json={"title": "Count my queries"})
+
+    assert response.status_code == 200
+    # One INSERT for the goal, one multi-row INSERT for its tasks, one COMMIT
+    assert len(counter.statements) == 2
+    assert counter.commits == 1
+    assert response.json() == (await client.get(f"/api/goals/{response.json()['id']}")).json()
+
+
+@pytest.mark.asyncio
+async def test_update_goal_replaces_tasks_in_bulk(client: AsyncClient):
+    [goal_id] = await create_goals(client, [3])
+
+    with patch("app.routes.goals.break_down_goal", new_callable=AsyncMock) as mock_ai:
+        mock_ai.return_value = {"complexity_score": 9, "tasks": ["a", "b", "c", "d", "e"]}
+        with count_statements(engine) as counter:
+            response = await client.put(f"/api/goals/{goal_id}", json={"title": "Renamed"})
+
+    assert response.status_code == 200
+    # Existence check, UPDATE goal, DELETE old tasks, multi-row INSERT new tasks, COMMIT
+    assert len(counter.statements) == 4
+    assert counter.commits == 1
+
+    data = response.json()
+    assert data["title"] == "Renamed"
+    assert [t["description"] for t in data["tasks"]] == ["a", "b", "c", "d", "e"]
+    assert data == (await client.get(f"/api/goals/{goal_id}")).json()
+
+
+@pytest.mark.asyncio
+async def test_update_goal_not_found(client: AsyncClient):
+    response = await client.put("/api/goals/999", json={"title": "Missing"})
+    assert response.status_code == 404
+
+
+async def count_tasks() -> int:
+    async with TestingSessionLocal() as session:
+        return (await session.execute(select(func.count()).select_from(Task))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_delete_goal_cascades_to_tasks_in_one_statement(client: AsyncClient):
+    goal_ids = await create_goals(client, [1, 2])
+
+    with count_statements(engine) as counter:
+        response = await client.delete(f"/api/goals/{goal_ids[0]}")
+
+    assert response.status_code == 200
+    assert len(counter.statements) == 1
+    assert await count_tasks() == 5
+
+
+@pytest.mark.asyncio
+async def test_delete_all_goals(client: AsyncClient):
+    await create_goals(client, [1, 2, 3])
+
+    response = await client.delete("/api/goals/")
+
+    assert response.status_code == 200
+    assert response.json()["deleted"] == 3
+    assert await count_tasks() == 0
+    assert (await client.get("/api/goals/")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_delete_all_goals_in_chunks(client: AsyncClient):
+    await create_goals(client, [1, 2, 3, 4, 5])
+
+    response = await client.delete("/api/goals/", params={"chunk_size": 2})
+
+    assert response.json() == {"message": "Deleted 5 goals successfully", "deleted": 5, "chunks": 3}
+    assert await count_tasks() == 0
@@ -0,0 +1,112 @@
+"""Index advisor: EXPLAIN every query the goal routes emit against a seeded database.
+
+Fails when a read, update or delete scans `goals` or `tasks` without an index.
+Routes that touch every row by design (export, delete-all) are not checked.
+"""
+import re
+from datetime import datetime, timedelta
+from unittest.mock import patch, AsyncMock
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database import count_statements
+from app.models import Goal, Task
+from tests.conftest import engine, TestingSessionLocal
+
+LARGE_TABLES = {"goals", "tasks"}
+SEEDED_GOALS = 2000
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+_POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+async def explain(conn: AsyncConnection, statement: str, parameters) -> list[str]:
+    """Return the plan lines for a statement on SQLite or Postgres."""
+    if conn.dialect.name == "sqlite":
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in result]
+    result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return [row[0] for row in result]
+
+
+def full_scans(plan: list[str]) -> set[str]:
+    """Tables from LARGE_TABLES that the plan reads sequentially."""
+    tables = set()
+    for line in plan:
+        match = _SQLITE_FULL_SCAN.match(line.strip()) or _POSTGRES_FULL_SCAN.search(line)
+        if match and match.group(1) in LARGE_TABLES:
+            tables.add(match.group(1))
+    return tables
+
+
+async def seed():
+    start = datetime(2024, 1, 1)
+    async with TestingSessionLocal() as session:
+        goal_ids = (await session.execute(
+            insert(Goal).returning(Goal.id),
+            [
+                {"title": f"Goal {i}", "complexity_score": i % 10 + 1, "created_at": start + timedelta(minutes=i)}
+                for i in range(SEEDED_GOALS)
+            ],
+        )).scalars().all()
+        await session.execute(
+            insert(Task),
+            [
+                {"goal_id": goal_id, "description": f"Step {step}", "step_number": step}
+                for goal_id in goal_ids
+                for step in range(1, 6)
+            ],
+        )
+        await session.commit()
+    async with engine.connect() as conn:
+        if conn.dialect.name == "sqlite":
+            await conn.exec_driver_sql("ANALYZE")
+        else:
+            await conn.exec_driver_sql("ANALYZE goals")
+            await conn.exec_driver_sql("ANALYZE tasks")
+    return goal_ids
+
+
+async def exercise_routes(client: AsyncClient, goal_ids: list[int]):
+    first_page = await client.get("/api/goals/", params={"limit": 20})
+    await client.get("/api/goals/", params={"limit": 20, "cursor": first_page.headers["X-Next-Cursor"]})
+    await client.get("/api/goals/", params={"view": "summary", "min_complexity": 3, "max_complexity": 7})
+    await client.get("/api/goals/", params={"created_after": "2024-01-02T00:00:00"})
+    await client.get(f"/api/goals/{goal_ids[10]}")
+
+    with patch("app.routes.goals.break_down_goal", new_callable=AsyncMock) as mock_ai:
+        mock_ai.return_value = {"complexity_score": 4, "tasks": ["1", "2", "3", "4", "5"]}
+        await client.put(f"/api/goals/{goal_ids[20]}", json={"title": "Updated"})
+        await client.post("/api/goals/", json={"title": "Created"})
+
+    await client.delete(f"/api/goals/{goal_ids[30]}")
+
+
+@pytest.mark.asyncio
+async def test_goal_routes_do_not_scan_large_tables(client: AsyncClient):
+    goal_ids = await seed()
+
+    with count_statements(engine) as counter:
+        await exercise_routes(client, goal_ids)
+
+    offenders = []
+    async with engine.connect() as conn:
+        for statement, parameters, executemany in counter.executions:
+            if executemany or statement.lstrip().upper().startswith("INSERT"):
+                continue
+            plan = await explain(conn, statement, parameters)
+            if full_scans(plan):
+                offenders.append(f"{statement}\n  -> {plan}")
+
+    assert not offenders, "Sequential scans found:\n" + "\n".join(offenders)
+
+
+def test_full_scan_detection():
+    assert full_scans(["SCAN tasks"]) == {"tasks"}
+    assert full_scans(["SCAN goals USING INDEX ix_goals_created_at_id"]) == set()
+    assert full_scans(["SEARCH tasks USING INDEX ix_tasks_goal_id_step_number (goal_id=?)"]) == set()
+    assert full_scans(["Seq Scan on goals  (cost=0.00..35.50 rows=2550 width=4)"]) == {"goals"}
+    assert full_scans(["Index Scan using goals_pkey on goals"]) == set()
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch, AsyncMock
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, select
+
+from app.models import Goal
+from app.services.jobs import JobRunner
+from tests.conftest import TestingSessionLocal, test_job_runner
+
+AI_RESULT = {"complexity_score": 6, "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"]}
+
+
+async def wait_for_job(client: AsyncClient, job_id: int, timeout: float = 2.0) -> dict:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = (await client.get(f"/api/goals/jobs/{job_id}")).json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        assert asyncio.get_running_loop().time() < deadline, f"job still {job['status']}"
+        await asyncio.sleep(0.01)
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_async_create_returns_job_and_completes_in_background(client: AsyncClient):
+    release = asyncio.Event()
+
+    async def slow_breakdown(goal, **kwargs):
+        await release.wait()
+        return AI_RESULT
+
+    with patch("app.services.jobs.break_down_goal", side_effect=slow_breakdown):
+        response = await client.post("/api/goals/?mode=async", json={"title": "Run a marathon"})
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "pending"
+        assert job["status_url"] == f"/api/goals/jobs/{job['job_id']}"
+
+        # The goal is visible right away, without a score or tasks
+        goal = (await client.get(f"/api/goals/{job['goal_id']}")).json()
+        assert goal["complexity_score"] is None
+        assert goal["tasks"] == []
+
+        release.set()
+        finished = await wait_for_job(client, job["job_id"])
+
+    assert finished["status"] == "completed"
+    goal = (await client.get(f"/api/goals/{job['goal_id']}")).json()
+    assert goal["status"] == "completed"
+    assert goal["complexity_score"] == 6
+    assert [t["step_number"] for t in goal["tasks"]] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_error(client: AsyncClient):
+    with patch("app.services.jobs.break_down_goal", new_callable=AsyncMock) as mock_ai:
+        mock_ai.side_effect = ValueError("AI returned invalid response")
+        response = await client.post("/api/goals/?mode=async", json={"title": "Learn piano"})
+        finished = await wait_for_job(client, response.json()["job_id"])
+
+    assert finished["status"] == "failed"
+    assert finished["error"] == "AI returned invalid response"
+    assert test_job_runner.get_stats()["failed"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_job_events_stream_status_changes_and_goal(client: AsyncClient):
+    with patch("app.services.jobs.break_down_goal", new_callable=AsyncMock) as mock_ai:
+        mock_ai.return_value = AI_RESULT
+        job = (await client.post("/api/goals/?mode=async", json={"title": "Write a book"})).json()
+        response = await client.get(job["events_url"])
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert events[-2][0] == "status" and events[-2][1]["status"] == "completed"
+    assert events[-1][0] == "goal"
+    assert len(events[-1][1]["tasks"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_returns_404(client: AsyncClient):
+    assert (await client.get("/api/goals/jobs/999")).status_code == 404
+    assert (await client.get("/api/goals/jobs/999/events")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_recover_requeues_unfinished_jobs():
+    async with TestingSessionLocal() as db:
+        await db.execute(insert(Goal), [
+            {"title": "Interrupted", "status": "running"},
+            {"title": "Never started", "status": "pending"},
+            {"title": "Done", "status": "completed", "complexity_score": 3},
+        ])
+        await db.commit()
+
+    runner = JobRunner(session_factory=TestingSessionLocal, workers=1)
+    try:
+        with patch("app.services.jobs.break_down_goal", new_callable=AsyncMock) as mock_ai:
+            mock_ai.return_value = AI_RESULT
+            assert await runner.recover() == 2
+            await runner._queue.join()
+    finally:
+        await runner.stop()
+
+    async with TestingSessionLocal() as db:
+        statuses = dict((await db.execute(select(Goal.title, Goal.status))).all())
+    assert statuses == {"Interrupted": "completed", "Never started": "completed", "Done": "completed"}
+    assert mock_ai.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_recover_leaves_jobs_of_live_runners_alone():
+    async with TestingSessionLocal() as db:
+        await db.execute(insert(Goal), [
+            {"title": "Abandoned", "status": "running", "claimed_at": datetime.utcnow() - timedelta(hours=1)},
+            {"title": "Live", "status": "pending"},
+        ])
+        await db.commit()
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def breakdown(goal, **kwargs):
+        if goal == "Live":
+            started.set()
+            await release.wait()
+        return AI_RESULT
+
+    # Two processes sharing one database; the lease is renewed every 0.1s
+    first = JobRunner(session_factory=TestingSessionLocal, workers=1, lease_seconds=0.3)
+    second = JobRunner(session_factory=TestingSessionLocal, workers=1, lease_seconds=0.3)
+    try:
+        with patch("app.services.jobs.break_down_goal", side_effect=breakdown) as mock_ai:
+            async with TestingSessionLocal() as db:
+                live_id = (await db.execute(select(Goal.id).where(Goal.title == "Live"))).scalar_one()
+            first.submit(live_id)
+            await started.wait()
+            # Longer than the lease: only the heartbeat keeps the claim fresh
+            await asyncio.sleep(0.5)
+
+            assert await second.recover() == 1
+            await second._queue.join()
+            release.set()
+            await first._queue.join()
+    finally:
+        await first.stop()
+        await second.stop()
+
+    async with TestingSessionLocal() as db:
+        statuses = dict((await db.execute(select(Goal.title, Goal.status))).all())
+    assert statuses == {"Abandoned": "completed", "Live": "completed"}
+    assert [call.args[0] for call in mock_ai.call_args_list] == ["Live", "Abandoned"]
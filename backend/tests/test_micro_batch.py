@@ -0,0 +1,137 @@
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.ai_service import RateLimitExceededError, break_down_goal, breakdown_batcher, model_health, rate_limiter
+from app.telemetry import LLM_CALL_DURATION
+from app.services.breakdown_parser import parse_batch_breakdowns
+
+TASKS = ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"]
+
+
+class BatchAwareModel:
+    """Answers single and numbered multi-goal prompts; can drop goals from batches."""
+
+    def __init__(self, drop: set[int] = frozenset(), fail_batches: bool = False, error: Exception | None = None):
+        self.drop = drop
+        self.fail_batches = fail_batches
+        self.error = error
+        self.prompts = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if self.error:
+            raise self.error
+        goals = re.findall(r'^\s+(\d+)\. (".*")$', prompt, re.MULTILINE)
+        if not goals:
+            return SimpleNamespace(text=json.dumps({"complexity_score": 1, "tasks": TASKS}))
+        if self.fail_batches:
+            raise ValueError("Response was blocked")
+        return SimpleNamespace(text=json.dumps([
+            {"goal": int(number), "complexity_score": len(json.loads(title)), "tasks": TASKS}
+            for number, title in goals
+            if json.loads(title) not in self.drop
+        ]))
+
+
+def llm_calls(outcome: str) -> int:
+    count = f'llm_call_duration_seconds_count{{model="gemini-2.5-flash",outcome="{outcome}"}} '
+    return next((int(line.removeprefix(count)) for line in LLM_CALL_DURATION.render() if line.startswith(count)), 0)
+
+
+@pytest.fixture
+def batching(monkeypatch):
+    monkeypatch.setattr(breakdown_batcher, "enabled", True)
+    monkeypatch.setattr(breakdown_batcher, "window", 0.05)
+
+
+def test_parse_batch_matches_goal_numbers_and_rejects_invalid_items():
+    text = json.dumps([
+        {"goal": 2, "complexity_score": 4, "tasks": TASKS},
+        {"goal": 1, "complexity_score": 15, "tasks": TASKS},
+        {"goal": 3, "complexity_score": 2, "tasks": TASKS[:3]},
+        {"goal": 9, "complexity_score": 2, "tasks": TASKS},
+    ])
+
+    results = parse_batch_breakdowns(text, 3)
+
+    assert results[0]["complexity_score"] == 10
+    assert results[1]["complexity_score"] == 4
+    assert results[2] is None
+
+
+def test_parse_batch_requires_an_array():
+    with pytest.raises(ValueError):
+        parse_batch_breakdowns('{"complexity_score": 3, "tasks": []}', 2)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_breakdowns_share_one_call(batching):
+    model = BatchAwareModel()
+    titles = ["Learn Go", "Read more", "Run a 5k", "Sleep earlier"]
+    ok_calls = llm_calls("ok")
+
+    with patch("app.services.ai_service.get_model", return_value=model):
+        results = await asyncio.gather(*(break_down_goal(title) for title in titles))
+
+    assert len(model.prompts) == 1
+    # Each goal gets its own answer back (scores encode the title length here)
+    assert [r["complexity_score"] for r in results] == [min(10, len(t)) for t in titles]
+    assert (await rate_limiter.get_usage())["requests_this_minute"] == 1
+    stats = breakdown_batcher.get_stats()
+    assert stats["goals_per_call"] == 4
+    assert stats["quota_saved"] == 3
+    # The batch call counts once towards the model's health and latency
+    model_stats = model_health.get_stats()["models"]["gemini-2.5-flash"]
+    assert model_stats["latency_seconds"]["count"] == 1
+    assert llm_calls("ok") == ok_calls + 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_items_fall_back_to_individual_calls(batching):
+    model = BatchAwareModel(drop={"Read more"})
+
+    with patch("app.services.ai_service.get_model", return_value=model):
+        results = await asyncio.gather(*(break_down_goal(t) for t in ["Learn Go", "Read more", "Run a 5k"]))
+
+    assert len(model.prompts) == 2
+    assert results[1]["complexity_score"] == 1  # from the single-goal prompt
+    assert breakdown_batcher.get_stats()["fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_call_retries_every_goal_alone(batching):
+    model = BatchAwareModel(fail_batches=True)
+
+    with patch("app.services.ai_service.get_model", return_value=model):
+        results = await asyncio.gather(*(break_down_goal(t) for t in ["Learn Go", "Read more"]))
+
+    assert all(r["complexity_score"] == 1 for r in results)
+    assert len(model.prompts) == 3
+    # The failed batch call's slot was refunded
+    assert (await rate_limiter.get_usage())["requests_this_minute"] == 2
+
+
+@pytest.mark.asyncio
+async def test_quota_error_fails_the_batch_without_individual_calls(batching):
+    model = BatchAwareModel(error=Exception("429 Resource has been exhausted (e.g. check quota)."))
+    titles = ["Learn Go", "Read more", "Run a 5k", "Sleep earlier", "Cook more"]
+
+    with patch("app.services.ai_service.get_model", return_value=model):
+        results = await asyncio.gather(*(break_down_goal(t) for t in titles), return_exceptions=True)
+
+    assert len(model.prompts) == 1
+    assert all(isinstance(r, RateLimitExceededError) for r in results)
+    assert (await rate_limiter.get_usage())["requests_this_minute"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batching_stats_endpoint(client: AsyncClient):
+    response = await client.get("/api/goals/batching/stats")
+    assert response.status_code == 200
+    assert response.json()["batch_calls"] == 0
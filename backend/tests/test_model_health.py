@@ -0,0 +1,139 @@
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.ai_service import PROMPT_VERSION, break_down_goal, breakdown_cache, model_health
+from app.services.breakdown_cache import make_cache_key, normalize_title
+from app.services.model_health import CircuitBreaker, LatencyHistogram, CLOSED, OPEN, HALF_OPEN
+
+PRIMARY = "gemini-2.5-flash"
+FALLBACK = "gemini-2.0-flash"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeModel:
+    """GenerativeModel stand-in with a fixed delay, answer or error."""
+
+    def __init__(self, delay: float = 0.0, error: Exception | None = None, score: int = 5):
+        self.delay = delay
+        self.error = error
+        self.score = score
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return SimpleNamespace(text=json.dumps({
+            "complexity_score": self.score,
+            "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"],
+        }))
+
+
+def models_by_id(models: dict):
+    return lambda model_id: models[model_id]
+
+
+async def cached_score(goal: str, model_id: str) -> int | None:
+    cached = await breakdown_cache.get(make_cache_key(normalize_title(goal), model_id, PROMPT_VERSION))
+    return cached and cached["complexity_score"]
+
+
+def test_histogram_percentile_interpolates_within_bucket():
+    histogram = LatencyHistogram(buckets=(1, 2, 4))
+    for seconds in [0.5] * 50 + [1.5] * 40 + [3] * 10:
+        histogram.observe(seconds)
+
+    assert histogram.percentile(50) == pytest.approx(1.0)
+    assert histogram.percentile(95) == pytest.approx(3.0)
+    assert histogram.get_stats()["buckets"] == {"1": 50, "2": 90, "4": 100, "+Inf": 100}
+
+
+def test_circuit_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.trips == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_to_fallback(monkeypatch):
+    monkeypatch.setattr(model_health, "default_hedge_delay", 0.05)
+    models = {PRIMARY: FakeModel(delay=1.0, score=2), FALLBACK: FakeModel(score=9)}
+
+    with patch("app.services.ai_service.get_model", side_effect=models_by_id(models)):
+        start = time.perf_counter()
+        result = await break_down_goal("Learn to juggle")
+        elapsed = time.perf_counter() - start
+
+    assert result["complexity_score"] == 9
+    assert elapsed < 0.5
+    stats = model_health.get_stats()
+    assert stats["hedges_fired"] == 1 and stats["hedges_won"] == 1
+    # Cached as the fallback's answer, not the requested model's
+    assert await cached_score("Learn to juggle", PRIMARY) is None
+    assert await cached_score("Learn to juggle", FALLBACK) == 9
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(monkeypatch):
+    monkeypatch.setattr(model_health, "default_hedge_delay", 0.5)
+    models = {PRIMARY: FakeModel(score=2), FALLBACK: FakeModel(score=9)}
+
+    with patch("app.services.ai_service.get_model", side_effect=models_by_id(models)):
+        result = await break_down_goal("Learn to juggle")
+
+    assert result["complexity_score"] == 2
+    assert models[FALLBACK].calls == 0
+    assert model_health.get_stats()["models"][PRIMARY]["latency_seconds"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unavailable_model_falls_back_and_trips_breaker():
+    models = {
+        PRIMARY: FakeModel(error=Exception("503 The model is overloaded")),
+        FALLBACK: FakeModel(score=7),
+    }
+
+    with patch("app.services.ai_service.get_model", side_effect=models_by_id(models)):
+        for i in range(model_health.failure_threshold + 2):
+            result = await break_down_goal(f"Goal {i}")
+            assert result["complexity_score"] == 7
+
+    # Once the breaker is open, the primary is no longer called at all
+    assert models[PRIMARY].calls == model_health.failure_threshold
+    assert model_health.breaker(PRIMARY).state == OPEN
+    assert await cached_score("Goal 0", PRIMARY) is None
+    assert await cached_score("Goal 0", FALLBACK) == 7
+
+
+@pytest.mark.asyncio
+async def test_model_health_endpoint(client: AsyncClient):
+    response = await client.get("/api/goals/models/health")
+    assert response.status_code == 200
+    assert response.json()["hedges_fired"] == 0
@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.model_registry import ModelRegistry, DEFAULT_MODEL, DEFAULT_MODELS, MODELS_FILE_CHECK_SECONDS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_registry(**kwargs) -> ModelRegistry:
+    return ModelRegistry(api_key="test", model_factory=MagicMock(side_effect=lambda model_id: MagicMock(id=model_id)), **kwargs)
+
+
+def test_get_reuses_one_client_per_model_and_configures_once():
+    registry = make_registry()
+    with patch("google.generativeai.configure") as configure:
+        first = registry.get("gemini-1.5-pro")
+        assert registry.get("gemini-1.5-pro") is first
+        assert registry.get("gemini-2.0-flash") is not first
+
+    configure.assert_called_once_with(api_key="test")
+    assert registry.model_factory.call_count == 2
+
+
+def test_api_endpoint_switches_the_sdk_to_rest():
+    registry = make_registry(api_endpoint="http://127.0.0.1:8090")
+    with patch("google.generativeai.configure") as configure:
+        registry.get()
+
+    configure.assert_called_once_with(
+        api_key="test", transport="rest", client_options={"api_endpoint": "http://127.0.0.1:8090"}
+    )
+
+
+def test_app_import_leaves_the_gemini_sdk_unloaded():
+    # A fresh interpreter, since this session may have imported the SDK already
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print('google.generativeai' in sys.modules)"],
+        cwd=Path(__file__).parents[1],
+        env={**os.environ, "GEMINI_API_KEY": "test"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_unknown_models_resolve_to_the_default():
+    registry = make_registry()
+    assert registry.resolve("no-such-model") == DEFAULT_MODEL
+    assert registry.resolve(None) == DEFAULT_MODEL
+    assert registry.resolve("gemini-1.5-flash") == "gemini-1.5-flash"
+
+
+def test_reload_keeps_clients_of_models_still_listed():
+    registry = make_registry()
+    with patch("google.generativeai.configure"):
+        kept = registry.get("gemini-2.0-flash")
+        registry.get("gemini-1.5-pro")
+
+        registry.reload([{"id": "gemini-2.0-flash", "name": "Flash", "description": ""}])
+
+        assert registry.get("gemini-2.0-flash") is kept
+    assert registry.resolve("gemini-1.5-pro") == "gemini-2.0-flash"
+    assert registry.get_stats()["clients"] == ["gemini-2.0-flash"]
+
+
+def test_models_file_changes_are_picked_up(tmp_path):
+    models_file = tmp_path / "models.json"
+    models_file.write_text(json.dumps(DEFAULT_MODELS))
+    clock = FakeClock()
+    registry = make_registry(models_file=str(models_file), clock=clock)
+    assert len(registry.list_models()) == len(DEFAULT_MODELS)
+
+    models_file.write_text(json.dumps([{"id": "gemini-3.0-pro", "name": "Gemini 3.0 Pro", "description": ""}]))
+    # Bump the mtime explicitly; some filesystems only have second resolution
+    stat = models_file.stat()
+    os.utime(models_file, (stat.st_atime, stat.st_mtime + 10))
+
+    assert len(registry.list_models()) == len(DEFAULT_MODELS)  # not checked again yet
+    clock.now += MODELS_FILE_CHECK_SECONDS
+    assert [m["id"] for m in registry.list_models()] == ["gemini-3.0-pro"]
+    assert registry.resolve(None) == "gemini-3.0-pro"
+
+
+def test_invalid_models_file_keeps_current_models(tmp_path):
+    models_file = tmp_path / "models.json"
+    models_file.write_text("not json")
+    registry = make_registry(models_file=str(models_file))
+
+    assert registry.list_models() == DEFAULT_MODELS
+
+
+@pytest.mark.asyncio
+async def test_models_endpoint_lists_registry_models(client: AsyncClient):
+    response = await client.get("/api/goals/models")
+    assert [m["id"] for m in response.json()] == [m["id"] for m in DEFAULT_MODELS]
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.rate_limiter import (
+    InMemoryRateLimiter,
+    DatabaseRateLimiter,
+    RateLimitExceededError,
+    RateLimiter,
+    quota_day,
+)
+from tests.conftest import TestingSessionLocal
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def greedy_client(limiter: RateLimiter, clock: FakeClock, seconds: float, step: float) -> list[float]:
+    """Request until refused, then again `step` seconds later; returns when requests were accepted."""
+    accepted = []
+    end = clock.now + seconds
+    while clock.now < end:
+        try:
+            while True:
+                await limiter.reserve()
+                accepted.append(clock.now)
+        except RateLimitExceededError:
+            pass
+        clock.now += step
+    return accepted
+
+
+def busiest_window(accepted: list[float], length: float) -> int:
+    return max(sum(start <= t < start + length for t in accepted) for start in accepted)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    limiter = InMemoryRateLimiter(max_requests_per_minute=4, max_requests_per_day=100, burst=2, clock=clock)
+    await limiter.reserve()
+    await limiter.reserve()
+
+    # 4 per minute minus the burst of 2, plus one: a token every 20 seconds
+    with pytest.raises(RateLimitExceededError) as excinfo:
+        await limiter.reserve()
+    assert excinfo.value.retry_after == pytest.approx(20)
+
+    clock.now += 20
+    await limiter.reserve()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("burst", [1, 5, 10])
+async def test_no_minute_admits_more_than_the_limit(burst):
+    clock = FakeClock()
+    limiter = InMemoryRateLimiter(max_requests_per_minute=10, max_requests_per_day=10_000, burst=burst, clock=clock)
+
+    accepted = await greedy_client(limiter, clock, seconds=300, step=0.25)
+
+    assert accepted[:burst] == [1000.0] * burst
+    assert busiest_window(accepted, 60) == 10
+
+
+@pytest.mark.asyncio
+async def test_database_backend_admits_at_most_the_limit_per_minute():
+    clock = FakeClock()
+    limiter = DatabaseRateLimiter(3, 10_000, session_factory=TestingSessionLocal, clock=clock)
+
+    accepted = await greedy_client(limiter, clock, seconds=130, step=0.5)
+
+    assert busiest_window(accepted, 60) == 3
+
+
+@pytest.mark.asyncio
+async def test_daily_count_resets_at_the_quota_boundary():
+    day_start, day_end = quota_day(1_750_000_000)
+    clock = FakeClock(day_start)
+    limiter = InMemoryRateLimiter(max_requests_per_minute=10, max_requests_per_day=5, clock=clock)
+
+    # Stops in the second quota day
+    accepted = await greedy_client(limiter, clock, seconds=2 * 86400 - 600, step=600)
+
+    assert len([t for t in accepted if t < day_end]) == 5
+    assert len([t for t in accepted if day_end <= t < day_end + 86400]) == 5
+    assert (await limiter.get_usage())["requests_today"] == 5
+
+
+@pytest.mark.asyncio
+async def test_daily_limit():
+    clock = FakeClock()
+    limiter = InMemoryRateLimiter(max_requests_per_minute=10, max_requests_per_day=1, clock=clock)
+    await limiter.reserve()
+
+    with pytest.raises(RateLimitExceededError, match="Daily limit reached") as excinfo:
+        await limiter.reserve()
+    assert excinfo.value.retry_after == pytest.approx(quota_day(clock.now)[1] - clock.now)
+
+
+@pytest.mark.asyncio
+async def test_refund_returns_quota_once():
+    limiter = InMemoryRateLimiter(max_requests_per_minute=1, max_requests_per_day=10, clock=FakeClock())
+    reservation = await limiter.reserve()
+    await limiter.refund(reservation)
+    await limiter.refund(reservation)
+
+    assert (await limiter.get_usage())["requests_this_minute"] == 0
+    await limiter.reserve()
+    with pytest.raises(RateLimitExceededError):
+        await limiter.reserve()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations_never_overspend():
+    limiter = InMemoryRateLimiter(max_requests_per_minute=10, max_requests_per_day=100, clock=FakeClock())
+    results = await asyncio.gather(*[limiter.reserve() for _ in range(25)], return_exceptions=True)
+
+    assert sum(not isinstance(r, Exception) for r in results) == limiter.burst == 5
+
+
+@pytest.mark.asyncio
+async def test_database_backend_shares_quota_between_workers():
+    clock = FakeClock()
+    workers = [
+        DatabaseRateLimiter(3, 100, burst=3, session_factory=TestingSessionLocal, clock=clock)
+        for _ in range(2)
+    ]
+    await workers[0].reserve()
+    await workers[1].reserve()
+    reservation = await workers[0].reserve()
+
+    with pytest.raises(RateLimitExceededError):
+        await workers[1].reserve()
+
+    await workers[0].refund(reservation)
+    await workers[1].reserve()
+
+    usage = await workers[1].get_usage()
+    assert usage["requests_this_minute"] == 3
+    assert usage["requests_today"] == 3
+    assert usage["backend"] == "database"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_status_endpoint(client: AsyncClient):
+    response = await client.get("/api/goals/rate-limit/status")
+    assert response.status_code == 200
+    assert response.json() == {
+        "requests_this_minute": 0,
+        "requests_today": 0,
+        "max_per_minute": 10,
+        "max_per_day": 500,
+        "backend": "memory",
+    }
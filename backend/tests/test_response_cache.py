@@ -0,0 +1,94 @@
+from unittest.mock import patch, AsyncMock
+
+import pytest
+from httpx import AsyncClient
+
+from app.database import count_statements
+from app.services.response_cache import ResponseCache, etag_matches, response_cache
+from tests.conftest import engine
+from tests.test_model_health import FakeClock
+
+AI_RESULT = {"complexity_score": 4, "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"]}
+
+
+async def create_goal(client: AsyncClient, title: str) -> int:
+    with patch("app.routes.goals.break_down_goal", new_callable=AsyncMock, return_value=AI_RESULT):
+        response = await client.post("/api/goals/", json={"title": title})
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_repeat_goal_reads_skip_the_database_and_revalidate_with_304(client: AsyncClient):
+    goal_id = await create_goal(client, "Learn Go")
+
+    first = await client.get(f"/api/goals/{goal_id}")
+    etag = first.headers["ETag"]
+
+    with count_statements(engine) as counter:
+        again = await client.get(f"/api/goals/{goal_id}")
+        not_modified = await client.get(f"/api/goals/{goal_id}", headers={"If-None-Match": etag})
+
+    assert counter.statements == []
+    assert again.json() == first.json()
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+    assert response_cache.get_stats()["not_modified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_goal_and_list_reads(client: AsyncClient):
+    goal_id = await create_goal(client, "Learn Go")
+    goal_etag = (await client.get(f"/api/goals/{goal_id}")).headers["ETag"]
+    list_etag = (await client.get("/api/goals/")).headers["ETag"]
+
+    with patch("app.routes.goals.break_down_goal", new_callable=AsyncMock, return_value=AI_RESULT):
+        await client.put(f"/api/goals/{goal_id}", json={"title": "Learn Rust"})
+
+    goal = await client.get(f"/api/goals/{goal_id}", headers={"If-None-Match": goal_etag})
+    assert goal.status_code == 200
+    assert goal.json()["title"] == "Learn Rust"
+
+    await create_goal(client, "Run a 5k")
+    goals = await client.get("/api/goals/", headers={"If-None-Match": list_etag})
+    assert goals.status_code == 200
+    assert [g["title"] for g in goals.json()] == ["Run a 5k", "Learn Rust"]
+
+    await client.delete(f"/api/goals/{goal_id}")
+    assert (await client.get(f"/api/goals/{goal_id}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_pages_keep_their_cursor_header_when_cached(client: AsyncClient):
+    for title in ["One", "Two", "Three"]:
+        await create_goal(client, title)
+
+    first = await client.get("/api/goals/", params={"limit": 2, "view": "summary"})
+    cached = await client.get("/api/goals/", params={"limit": 2, "view": "summary"})
+
+    assert cached.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert cached.json() == first.json()
+    assert response_cache.get_stats()["hits"] == 1
+
+
+def test_entries_read_before_a_write_are_never_served():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=10, ttl_seconds=5, enabled=True, clock=clock)
+
+    # A read starts, then a write lands before the read stores its result
+    version = cache.version(1)
+    cache.invalidate(1)
+    cache.set("goal/1", version, b"{}")
+    assert cache.get("goal/1", cache.version(1)) is None
+
+    entry = cache.set("goal/1", cache.version(1), b"{}")
+    assert cache.get("goal/1", cache.version(1)) is entry
+    clock.now += 5
+    assert cache.get("goal/1", cache.version(1)) is None
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
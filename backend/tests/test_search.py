@@ -0,0 +1,83 @@
+from unittest.mock import patch, AsyncMock
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+from app.models import Goal
+
+
+async def create_goal(client: AsyncClient, title: str, tasks: list[str]) -> int:
+    with patch("app.routes.goals.break_down_goal", new_callable=AsyncMock) as mock_ai:
+        mock_ai.return_value = {"complexity_score": 3, "tasks": tasks}
+        response = await client.post("/api/goals/", json={"title": title})
+    return response.json()["id"]
+
+
+def tasks(*extra: str) -> list[str]:
+    return [*extra, *(f"Step {i}" for i in range(len(extra) + 1, 6))]
+
+
+@pytest.mark.asyncio
+async def test_search_matches_titles_and_tasks_best_first(client: AsyncClient):
+    marathon = await create_goal(client, "Run a marathon", tasks("Buy running shoes", "Run three times a week"))
+    await create_goal(client, "Learn Spanish", tasks("Practice vocabulary daily"))
+    shoes = await create_goal(client, "Declutter the flat", tasks("Donate old shoes"))
+
+    response = await client.get("/api/goals/search", params={"q": "running"})
+    assert response.status_code == 200
+    # Stemming matches "Run", "running" and "Run" again in the marathon goal
+    assert [r["id"] for r in response.json()] == [marathon]
+
+    results = (await client.get("/api/goals/search", params={"q": "shoes"})).json()
+    assert {r["id"] for r in results} == {marathon, shoes}
+    assert results[0]["rank"] >= results[1]["rank"]
+
+
+@pytest.mark.asyncio
+async def test_search_pages_with_keyset_cursor(client: AsyncClient):
+    ids = [await create_goal(client, f"Read book {i}", tasks()) for i in range(5)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": "book", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/goals/search", params=params)
+        seen.extend(r["id"] for r in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(ids)
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_updates_and_deletes(client: AsyncClient):
+    goal_id = await create_goal(client, "Learn guitar", tasks("Buy a guitar"))
+
+    with patch("app.routes.goals.break_down_goal", new_callable=AsyncMock) as mock_ai:
+        mock_ai.return_value = {"complexity_score": 4, "tasks": tasks("Find a piano teacher")}
+        await client.put(f"/api/goals/{goal_id}", json={"title": "Learn piano"})
+
+    assert (await client.get("/api/goals/search", params={"q": "guitar"})).json() == []
+    assert [r["id"] for r in (await client.get("/api/goals/search", params={"q": "piano teacher"})).json()] == [goal_id]
+
+    await client.delete(f"/api/goals/{goal_id}")
+    assert (await client.get("/api/goals/search", params={"q": "piano"})).json() == []
+
+
+@pytest.mark.asyncio
+async def test_search_ignores_query_syntax_and_rejects_bad_cursor(client: AsyncClient):
+    await create_goal(client, "Save money", tasks())
+
+    response = await client.get("/api/goals/search", params={"q": '"money" OR -NEAR('})
+    assert response.status_code == 200
+    assert (await client.get("/api/goals/search", params={"q": "?!"})).json() == []
+    assert (await client.get("/api/goals/search", params={"q": "money", "cursor": "bogus"})).status_code == 400
+
+
+def test_search_vector_is_built_in_the_insert_on_postgres():
+    sql = str(insert(Goal).values(title="t", search_vector="t").compile(dialect=postgresql.dialect()))
+    assert "to_tsvector('english', CAST(" in sql
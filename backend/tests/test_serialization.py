@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+import app.serialization
+from app.models import Goal
+from app.schemas import GoalResponse
+from app.serialization import dumps, goal_dict, task_dict
+from tests.conftest import TestingSessionLocal
+from tests.test_goals import create_goals
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_dumps_matches_pydantic_output(monkeypatch, backend):
+    if backend == "json":
+        monkeypatch.setattr(app.serialization, "orjson", None)
+    elif app.serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    task = SimpleNamespace(id=7, description="Schritt eins — “quoted”", step_number=1)
+    goal = SimpleNamespace(
+        id=3, title="Learn Go", complexity_score=None, created_at=datetime(2026, 1, 2, 3, 4, 5, 678), status="pending"
+    )
+    expected = GoalResponse(**vars(goal), tasks=[vars(task)])
+
+    assert dumps(goal_dict(goal, [task_dict(task)])) == expected.model_dump_json().encode()
+
+
+@pytest.mark.asyncio
+async def test_goal_reads_match_the_response_models(client: AsyncClient):
+    await create_goals(client, [2, 7, 4])
+
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(Goal).options(selectinload(Goal.tasks)).order_by(Goal.created_at.desc(), Goal.id.desc())
+        )
+        expected = [GoalResponse.model_validate(goal).model_dump(mode="json") for goal in result.scalars()]
+
+    assert (await client.get("/api/goals/")).json() == expected
+    assert (await client.get(f"/api/goals/{expected[0]['id']}")).json() == expected[0]
+    summaries = (await client.get("/api/goals/", params={"view": "summary"})).json()
+    assert summaries == [{k: v for k, v in goal.items() if k != "tasks"} for goal in expected]
+    assert json.loads(dumps(expected)) == expected
@@ -0,0 +1,157 @@
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.ai_service import stream_breakdown, break_down_goal, model_health
+from app.services.breakdown_parser import IncrementalBreakdownParser
+
+BREAKDOWN = {
+    "complexity_score": 7,
+    "tasks": [
+        "Pick a \"couch to marathon\" training plan",
+        "Buy running shoes fitted at a specialist store",
+        "Build up to a comfortable 10k over eight weeks",
+        "Add one long run per week, growing to 30k",
+        "Taper for two weeks, then run the race",
+    ],
+}
+CHUNK_SIZE = 8
+CHUNK_DELAY = 0.01
+
+
+class StreamingModel:
+    """Fake GenerativeModel that writes its response a few characters at a time."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def _chunks(self):
+        for i in range(0, len(self.text), CHUNK_SIZE):
+            time.sleep(CHUNK_DELAY)
+            yield SimpleNamespace(text=self.text[i:i + CHUNK_SIZE])
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        if stream:
+            return self._chunks()
+        list(self._chunks())
+        return SimpleNamespace(text=self.text)
+
+
+class FailingStreamModel:
+    """Fake GenerativeModel whose stream fails before writing anything."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        raise self.error
+
+
+def feed_all(text: str, size: int) -> list:
+    parser = IncrementalBreakdownParser()
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return events
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_parser_emits_fields_as_they_complete(size):
+    events = feed_all("```json\n" + json.dumps(BREAKDOWN) + "\n```", size)
+
+    assert events[0] == ("complexity_score", {"complexity_score": 7})
+    assert [data["description"] for name, data in events[1:]] == BREAKDOWN["tasks"]
+    assert [data["step_number"] for _, data in events[1:]] == [1, 2, 3, 4, 5]
+
+
+def test_parser_waits_for_the_closing_quote():
+    parser = IncrementalBreakdownParser()
+    assert parser.feed('{"complexity_score": 4, "tasks": ["Half a ta') == [("complexity_score", {"complexity_score": 4})]
+    assert parser.feed('sk", "Next') == [("task", {"step_number": 1, "description": "Half a task"})]
+
+
+@pytest.mark.asyncio
+async def test_first_task_arrives_before_the_full_response():
+    model = StreamingModel(json.dumps(BREAKDOWN))
+    with patch("app.services.ai_service.get_model", return_value=model):
+        start = time.perf_counter()
+        first_task = None
+        async for name, data in stream_breakdown("Run a marathon"):
+            if name == "task" and first_task is None:
+                first_task = time.perf_counter() - start
+            if name == "result":
+                result = data
+        streamed_total = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await break_down_goal("Run a different marathon")
+        full_response = time.perf_counter() - start
+
+    assert result == BREAKDOWN
+    assert first_task < streamed_total / 2
+    assert first_task < full_response / 2
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_emits_tasks_and_saves_goal(client: AsyncClient):
+    with patch("app.services.ai_service.get_model", return_value=StreamingModel(json.dumps(BREAKDOWN))):
+        response = await client.post("/api/goals/stream", json={"title": "Run a marathon"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("\n")[1].removeprefix("data: ")))
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert [name for name, _ in events] == ["complexity_score", "task", "task", "task", "task", "task", "goal"]
+
+    goal = events[-1][1]
+    saved = (await client.get(f"/api/goals/{goal['id']}")).json()
+    assert saved["complexity_score"] == 7
+    assert [t["description"] for t in saved["tasks"]] == BREAKDOWN["tasks"]
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_reports_invalid_response_as_error_event(client: AsyncClient):
+    invalid = json.dumps({"complexity_score": 3, "tasks": ["Only", "three", "tasks"]})
+    with patch("app.services.ai_service.get_model", return_value=StreamingModel(invalid)):
+        response = await client.post("/api/goals/stream", json={"title": "Too short"})
+
+    assert response.status_code == 200
+    assert response.text.rstrip().endswith('"AI must return exactly 5 tasks"}')
+    assert (await client.get("/api/goals/")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_stream_replaces_steps_changed_by_validation(client: AsyncClient):
+    six_steps = json.dumps({"complexity_score": 7, "tasks": BREAKDOWN["tasks"] + ["Celebrate the finish"]})
+    with patch("app.services.ai_service.get_model", return_value=StreamingModel(six_steps)):
+        response = await client.post("/api/goals/stream", json={"title": "Run an ultra"})
+
+    events = [
+        (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("\n")[1].removeprefix("data: ")))
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert [name for name, _ in events] == ["complexity_score"] + ["task"] * 6 + ["replace", "goal"]
+    # The sixth step was merged into the fifth; `replace` carries what was saved
+    replace, goal = events[-2][1], events[-1][1]
+    assert [t["description"] for t in replace["tasks"]] == [t["description"] for t in goal["tasks"]]
+    assert len(goal["tasks"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_failing_streams_trip_the_circuit_breaker(monkeypatch):
+    monkeypatch.setattr(model_health, "fallback_models", [])
+    model = FailingStreamModel(Exception("503 The model is overloaded"))
+    with patch("app.services.ai_service.get_model", return_value=model), \
+            patch("app.services.ai_service.asyncio.sleep"):
+        for _ in range(model_health.failure_threshold):
+            with pytest.raises(Exception, match="overloaded"):
+                async for _ in stream_breakdown("Learn Go", max_retries=1):
+                    pass
+
+    assert model_health.breaker("gemini-2.5-flash").state == "open"
@@ -0,0 +1,67 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from google.generativeai.types import generation_types
+from httpx import AsyncClient
+
+from app.config import get_settings
+from app.schemas import AIBreakdownResponse
+from app.services.ai_service import break_down_goal, generation_kwargs
+
+MODEL = "gemini-2.5-flash"
+BREAKDOWN = {"complexity_score": 4, "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"]}
+
+
+def model_returning(*texts):
+    model = MagicMock()
+    model.generate_content.side_effect = [SimpleNamespace(text=text) for text in texts]
+    return model
+
+
+@pytest.fixture
+def structured_output():
+    with patch.object(get_settings(), "GEMINI_STRUCTURED_OUTPUT", True):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_structured_output_sends_json_schema(structured_output):
+    model = model_returning(json.dumps(BREAKDOWN))
+
+    with patch("app.services.ai_service.get_model", return_value=model):
+        result = await break_down_goal("Learn Go")
+
+    assert result == BREAKDOWN
+    config = model.generate_content.call_args.kwargs["generation_config"]
+    assert config == {"response_mime_type": "application/json", "response_schema": AIBreakdownResponse}
+    # The SDK accepts the schema derived from the pydantic model
+    schema = generation_types.to_generation_config_dict(config)["response_schema"]
+    assert set(schema.properties) == {"complexity_score", "tasks"}
+
+
+@pytest.mark.asyncio
+async def test_prompt_only_mode_sends_no_generation_config():
+    model = model_returning(json.dumps(BREAKDOWN))
+
+    with patch("app.services.ai_service.get_model", return_value=model):
+        await break_down_goal("Learn Go")
+
+    assert "generation_config" not in model.generate_content.call_args.kwargs
+    assert generation_kwargs(AIBreakdownResponse) == {}
+
+
+@pytest.mark.asyncio
+async def test_invalid_responses_and_retries_are_counted_per_model(client: AsyncClient):
+    model = model_returning("Sorry, I can't help with that.", json.dumps(BREAKDOWN))
+
+    with patch("app.services.ai_service.get_model", return_value=model):
+        await break_down_goal("Learn Go")
+
+    response = await client.get("/api/goals/models/health")
+    stats = response.json()["models"][MODEL]
+    assert stats["responses"] == 2
+    assert stats["invalid_responses"] == 1
+    assert stats["invalid_rate"] == 0.5
+    assert stats["retries"] == 1
@@ -0,0 +1,100 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+import app.main
+from app.telemetry import Histogram, TraceExporter
+
+BREAKDOWN = {"complexity_score": 3, "tasks": ["Step 1", "Step 2", "Step 3", "Step 4", "Step 5"]}
+
+
+def fake_model():
+    model = MagicMock()
+    model.generate_content.return_value = SimpleNamespace(text=json.dumps(BREAKDOWN))
+    return model
+
+
+def test_histogram_renders_prometheus_text():
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5)
+
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/a",le="0.1"} 1',
+        'demo_seconds_bucket{route="/a",le="1"} 2',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 3',
+        'demo_seconds_sum{route="/a"} 5.55',
+        'demo_seconds_count{route="/a"} 3',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_breaks_down_create_latency(client: AsyncClient):
+    with patch("app.services.ai_service.get_model", return_value=fake_model()):
+        created = await client.post("/api/goals/", json={"title": "Learn Go"})
+    await client.get(f"/api/goals/{created.json()['id']}")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/goals/",status="200"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/goals/{goal_id}",status="200"}' in body
+    assert 'llm_call_duration_seconds_count{model="gemini-2.5-flash",outcome="ok"}' in body
+    assert 'db_statement_duration_seconds_count{operation="INSERT"}' in body
+    for step in ("breakdown.cache_lookup", "breakdown.admission_wait", "llm.call", "llm.parse", "serialize"):
+        assert f'span_duration_seconds_count{{span="{step}"}}' in body
+    assert "# TYPE gemini_executor_in_flight gauge" in body
+
+
+@pytest.mark.asyncio
+async def test_traces_are_exported_as_otlp_json(client: AsyncClient, tmp_path, monkeypatch):
+    trace_file = tmp_path / "traces.jsonl"
+    exporter = TraceExporter(str(trace_file))
+    monkeypatch.setattr(app.main, "trace_exporter", exporter)
+
+    with patch("app.services.ai_service.get_model", return_value=fake_model()):
+        await client.post("/api/goals/", json={"title": "Learn Rust"})
+    exporter.flush()
+
+    [line] = trace_file.read_text().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_name = {s["name"]: s for s in spans}
+
+    root = by_name["http.request"]
+    assert root["parentSpanId"] == ""
+    assert {"key": "http.route", "value": {"stringValue": "/api/goals/"}} in root["attributes"]
+    assert len({s["traceId"] for s in spans}) == 1
+    assert by_name["llm.parse"]["parentSpanId"] == by_name["llm.attempt"]["spanId"]
+    db_inserts = [s for s in spans if s["name"] == "db.insert"]
+    assert len(db_inserts) == 2
+    assert all(s["parentSpanId"] == root["spanId"] for s in db_inserts)
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_trace_ends_with_its_body(client: AsyncClient, tmp_path, monkeypatch):
+    with patch("app.services.ai_service.get_model", return_value=fake_model()):
+        await client.post("/api/goals/", json={"title": "Learn Rust"})
+    trace_file = tmp_path / "traces.jsonl"
+    exporter = TraceExporter(str(trace_file))
+    monkeypatch.setattr(app.main, "trace_exporter", exporter)
+
+    response = await client.get("/api/goals/export")
+    assert "Learn Rust" in response.text
+    exporter.flush()
+
+    [line] = trace_file.read_text().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    [root] = [s for s in spans if s["name"] == "http.request"]
+    # The export queries run while the body streams, after the response started
+    body_spans = [s for s in spans if s["name"] == "db.select"]
+    assert body_spans
+    assert all(s["parentSpanId"] == root["spanId"] for s in body_spans)
+    assert int(root["endTimeUnixNano"]) >= max(int(s["endTimeUnixNano"]) for s in body_spans)
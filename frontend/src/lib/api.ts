@@ -45,13 +45,25 @@ export async function createGoal(title: string, model?: string): Promise<Goal> {
 }
 
 export async function getGoals(): Promise<Goal[]> {
-  const response = await fetch(`${API_URL}/api/goals/`);
+  const goals: Goal[] = [];
+  let cursor: string | null = null;
 
-  if (!response.ok) {
-    throw new Error("Failed to fetch goals");
-  }
+  // The list endpoint is paginated; follow the cursor until the last page
+  do {
+    const params = new URLSearchParams({ limit: "200" });
+    if (cursor) params.set("cursor", cursor);
 
-  return response.json();
+    const response = await fetch(`${API_URL}/api/goals/?${params}`);
+
+    if (!response.ok) {
+      throw new Error("Failed to fetch goals");
+    }
+
+    goals.push(...(await response.json()));
+    cursor = response.headers.get("X-Next-Cursor");
+  } while (cursor);
+
+  return goals;
 }
 
 export async function getGoal(id: number): Promise<Goal> {